@@ -0,0 +1,380 @@
+# coding: utf-8
+r"""
+Inputs
+-------
+command : str
+    'run' to run the benchmarks or 'compare' to compare two runs.
+
+run:
+
+--size : str
+    One of SIZES, defines the amount of synthetic data. Default: 'medium'
+--repeat : int
+    Number of times each benchmark is run. Default: 5
+--out : str
+    Path of the json file the timings are saved to.
+    Default: ``results/_benchmarks/data_processing_{size}.json``
+--save-baseline
+    Save the timings as baseline to ``benchmarks/baselines/data_processing_{size}.json``
+    instead.
+
+compare:
+
+baseline : str
+    Path of a json file written by 'run' to compare to.
+current : str
+    Path of a json file written by 'run'.
+--threshold : float
+    Relative slowdown above which a benchmark is flagged. Default: REGRESSION_THRESHOLD
+
+Outputs
+---------
+.json
+    Minimum and median run time in seconds of each benchmark, together with the data size
+    and the versions of python, numpy and pandas.
+
+Description
+-------------
+The script benchmarks the hot paths of :mod:`oemof_b3.tools.data_processing` on synthetic
+scalars and timeseries in oemof_b3 format. The size of the data is set by the named SIZES.
+
+Stored baselines of the sizes live in ``benchmarks/baselines``. 'compare' prints the change
+of each benchmark and exits with an error if a benchmark became slower than the baseline by
+more than the threshold, e.g.::
+
+    python benchmarks/data_processing.py run --size small
+    python benchmarks/data_processing.py compare \
+        benchmarks/baselines/data_processing_small.json \
+        results/_benchmarks/data_processing_small.json
+
+As timings depend on the machine, baselines should be updated (with ``--save-baseline``)
+on the machine the comparison runs on.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from oemof_b3.config import config
+from oemof_b3.tools import data_processing as dp
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASELINE_DIR = os.path.join(ROOT_DIR, "benchmarks", "baselines")
+
+OUT_DIR = os.path.join(ROOT_DIR, "results", "_benchmarks")
+
+REGRESSION_THRESHOLD = 0.2
+
+SIZES = {
+    "tiny": {"n_scalars": 100, "n_series": 4, "n_steps": 48},
+    "small": {"n_scalars": 2000, "n_series": 20, "n_steps": 8760},
+    "medium": {"n_scalars": 20000, "n_series": 100, "n_steps": 8760},
+    "large": {"n_scalars": 200000, "n_series": 500, "n_steps": 8760},
+}
+
+REGIONS = ["B", "BB", "LS", "MV", "SN", "ST", "TH", "HH"]
+
+CARRIERS = ["electricity", "ch4", "biomass", "heat_central", "heat_decentral", "h2"]
+
+TECHS = ["gt", "st", "ccgt", "bpchp", "extchp", "storage", "demand", "pv", "wind"]
+
+VAR_NAMES = [
+    "capacity",
+    "efficiency",
+    "capacity_cost",
+    "fixom_cost",
+    "marginal_cost",
+    "lifetime",
+]
+
+SCENARIOS = ["ALL", "base", "high", "low"]
+
+
+def make_scalars(n_scalars, seed=0):
+    r"""
+    Returns synthetic scalars in oemof_b3 format with ``n_scalars`` rows. A fifth of the rows
+    has region 'ALL' and an empty name, the others are named by convention.
+    """
+    rng = np.random.default_rng(seed)
+
+    scalars = pd.DataFrame(
+        {
+            "scenario_key": rng.choice(SCENARIOS, n_scalars),
+            "var_name": rng.choice(VAR_NAMES, n_scalars),
+            "carrier": rng.choice(CARRIERS, n_scalars),
+            "region": rng.choice(REGIONS, n_scalars),
+            "tech": rng.choice(TECHS, n_scalars),
+            "type": "conversion",
+            "var_value": rng.random(n_scalars),
+            "var_unit": "MW",
+        }
+    )
+
+    scalars["name"] = (
+        scalars["region"] + "-" + scalars["carrier"] + "-" + scalars["tech"]
+    )
+
+    region_all = rng.random(n_scalars) < 0.2
+    scalars.loc[region_all, "region"] = "ALL"
+    scalars.loc[region_all, "name"] = np.nan
+
+    return dp.format_header(
+        scalars, dp.HEADER_B3_SCAL, config.settings.general.scal_index_name
+    )
+
+
+def make_timeseries(n_series, n_steps, seed=0):
+    r"""
+    Returns ``n_series`` synthetic timeseries with ``n_steps`` hourly values as unstacked
+    DataFrame.
+    """
+    rng = np.random.default_rng(seed)
+
+    index = pd.date_range("2019-01-01", periods=n_steps, freq="H")
+
+    return pd.DataFrame(
+        rng.random((n_steps, n_series)),
+        index=index,
+        columns=[f"{CARRIERS[i % len(CARRIERS)]}-profile-{i}" for i in range(n_series)],
+    )
+
+
+def make_stacked_timeseries(timeseries):
+    r"""
+    Stacks synthetic timeseries and assigns scenarios and regions, so that several series
+    share the same var_name.
+    """
+    stacked = dp.stack_timeseries(timeseries)
+
+    n_series = len(stacked)
+    stacked["var_name"] = [f"var-{i // len(REGIONS)}" for i in range(n_series)]
+    stacked["region"] = [REGIONS[i % len(REGIONS)] for i in range(n_series)]
+    stacked["scenario_key"] = "base"
+    stacked["var_unit"] = "MW"
+
+    return dp.format_header(
+        stacked, dp.HEADER_B3_TS, config.settings.general.ts_index_name
+    )
+
+
+def make_oemof_results_ts(n_series, n_steps, seed=0):
+    r"""
+    Returns synthetic flow results in oemof-tabular/oemoflex format with ``n_series``
+    columns.
+    """
+    timeseries = make_timeseries(n_series, n_steps, seed)
+
+    columns = []
+    for i in range(n_series):
+        region = REGIONS[i % len(REGIONS)]
+        carrier = CARRIERS[(i // len(REGIONS)) % len(CARRIERS)]
+        component = f"{region}-{carrier}-{TECHS[i % len(TECHS)]}{i}"
+        bus = f"{region}-{carrier}"
+        columns.append((component, bus, "flow") if i % 2 else (bus, component, "flow"))
+
+    timeseries.columns = pd.MultiIndex.from_tuples(
+        columns, names=["from", "to", "type"]
+    )
+
+    return timeseries
+
+
+def get_benchmarks(size, tmp_dir):
+    r"""
+    Creates the synthetic data for ``size`` and returns the benchmarks.
+
+    Returns
+    -------
+    benchmarks : dict
+        Name of the benchmark and function without arguments that runs it
+    """
+    params = SIZES[size]
+
+    scalars = make_scalars(params["n_scalars"])
+    timeseries = make_timeseries(params["n_series"], params["n_steps"])
+    stacked = make_stacked_timeseries(timeseries)
+    results_ts = make_oemof_results_ts(params["n_series"], params["n_steps"])
+
+    path_stacked = os.path.join(tmp_dir, "timeseries.csv")
+    dp.save_df(stacked, path_stacked)
+
+    scalars_regional = scalars.loc[scalars["region"] != "ALL"]
+    scalars_update = scalars_regional.sample(frac=0.5, random_state=0).copy()
+    scalars_update["var_value"] += 1
+
+    on = ["scenario_key", "name", "region", "carrier", "tech", "var_name"]
+    # merge_a_into_b requires unique keys
+    scalars_regional = scalars_regional.drop_duplicates(on)
+    scalars_update = scalars_update.drop_duplicates(on)
+
+    filters = {
+        0: {"scenario_key": "ALL"},
+        1: {"scenario_key": "base"},
+    }
+
+    return {
+        "load_b3_timeseries": lambda: dp.load_b3_timeseries(path_stacked),
+        "stack_timeseries": lambda: dp.stack_timeseries(timeseries),
+        "unstack_timeseries": lambda: dp.unstack_timeseries(stacked),
+        "aggregate_scalars": lambda: dp.aggregate_scalars(scalars_regional, "region"),
+        "aggregate_timeseries": lambda: dp.aggregate_timeseries(stacked, "region"),
+        "merge_a_into_b": lambda: dp.merge_a_into_b(
+            scalars_update, scalars_regional, on=on, verbose=False
+        ),
+        "update_filtered_df": lambda: dp.update_filtered_df(
+            scalars_regional.drop_duplicates(
+                ["name", "region", "carrier", "tech", "var_name", "scenario_key"]
+            ),
+            filters,
+        ),
+        "expand_regions": lambda: dp.expand_regions(scalars, REGIONS),
+        "prepare_attr_name": lambda: dp.prepare_attr_name(scalars_regional, False),
+        "oemof_results_ts_to_oemof_b3": lambda: dp.oemof_results_ts_to_oemof_b3(
+            results_ts
+        ),
+    }
+
+
+def run_benchmarks(size, repeat=5, names=None):
+    r"""
+    Runs the benchmarks on synthetic data of the given size.
+
+    Parameters
+    ----------
+    size : str
+        One of SIZES
+    repeat : int
+        Number of runs of each benchmark
+    names : list
+        Names of the benchmarks to run. All if None.
+
+    Returns
+    -------
+    timings : dict
+        Data size, versions and minimum and median run time of each benchmark in seconds
+    """
+    if size not in SIZES:
+        raise ValueError(f"size '{size}' is not one of {list(SIZES)}.")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        benchmarks = get_benchmarks(size, tmp_dir)
+
+        for name, func in benchmarks.items():
+            if names is not None and name not in names:
+                continue
+
+            # Untimed first run, which includes lazy imports and caching
+            func()
+
+            times = timeit.repeat(func, number=1, repeat=repeat)
+            results[name] = {"min": min(times), "median": float(np.median(times))}
+
+            print(f"{name:<30} {results[name]['min']:.4f} s")
+
+    return {
+        "size": size,
+        "params": SIZES[size],
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+
+
+def compare_timings(baseline, current, threshold=REGRESSION_THRESHOLD):
+    r"""
+    Compares the minimum run times of two benchmark runs.
+
+    Returns
+    -------
+    comparison : pd.DataFrame
+        Run times of baseline and current run, their relative change and whether the change
+        exceeds the threshold.
+    """
+    if baseline["params"] != current["params"]:
+        raise ValueError(
+            f"Cannot compare runs with different sizes: {baseline['params']} and "
+            f"{current['params']}."
+        )
+
+    comparison = pd.DataFrame(
+        {
+            "baseline": {k: v["min"] for k, v in baseline["results"].items()},
+            "current": {k: v["min"] for k, v in current["results"].items()},
+        }
+    )
+    comparison["change"] = comparison["current"] / comparison["baseline"] - 1
+    comparison["regression"] = comparison["change"] > threshold
+
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of data_processing.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--size", default="medium", choices=list(SIZES))
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--out")
+    run_parser.add_argument("--save-baseline", action="store_true")
+    run_parser.add_argument("--benchmarks", nargs="*")
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    args = parser.parse_args(argv)
+
+    # Keep the output readable, data_processing logs on info level in most functions
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.command == "run":
+        timings = run_benchmarks(args.size, args.repeat, args.benchmarks)
+
+        out = args.out or os.path.join(
+            BASELINE_DIR if args.save_baseline else OUT_DIR,
+            f"data_processing_{args.size}.json",
+        )
+        if not os.path.exists(os.path.dirname(out)):
+            os.makedirs(os.path.dirname(out))
+
+        with open(out, "w") as file:
+            json.dump(timings, file, indent=2)
+
+        print(f"Saved timings to '{out}'.")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    comparison = compare_timings(baseline, current, args.threshold)
+
+    print(comparison.to_string(float_format="{:.4f}".format))
+
+    regressions = comparison.loc[comparison["regression"]]
+    if not regressions.empty:
+        print(
+            f"\nSlower than baseline by more than {args.threshold:.0%}: "
+            f"{', '.join(regressions.index)}"
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
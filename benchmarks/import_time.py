@@ -0,0 +1,245 @@
+# coding: utf-8
+r"""
+Inputs
+-------
+out_path : str
+    Optional path of the csv file the import times are saved to.
+    Default: ``results/_benchmarks/import_time.csv``
+baseline : str
+    Optional path of a csv file with import times of an earlier run to compare to.
+
+Outputs
+---------
+pandas.DataFrame
+    Import time of each script entry point in ``scripts/`` with the modules that take longest
+    to import.
+
+Description
+-------------
+The script measures the time it takes to import each script in ``scripts/`` (i.e. the startup
+cost of each snakemake rule before any data is processed) with ``python -X importtime``. Each
+script is imported several times in a fresh interpreter and the fastest run is kept. Scripts
+that cannot be imported, e.g. because of missing dependencies, are reported with their error.
+
+If a baseline is passed, the change of the import times is printed and scripts that became
+slower by more than REGRESSION_THRESHOLD are listed.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS_DIR = os.path.join(ROOT_DIR, "scripts")
+
+DEFAULT_OUT_PATH = os.path.join(ROOT_DIR, "results", "_benchmarks", "import_time.csv")
+
+REPEAT = 3
+
+N_TOP_MODULES = 5
+
+REGRESSION_THRESHOLD = 0.2
+
+
+def parse_importtime(stderr):
+    r"""
+    Parses the output of ``python -X importtime``.
+
+    Parameters
+    ----------
+    stderr : str
+        Output written to stderr by ``python -X importtime``
+
+    Returns
+    -------
+    modules : pd.DataFrame
+        Self and cumulative import time in microseconds and nesting level of each module
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        records.append(
+            {
+                "module": name.strip(),
+                "level": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+
+    return pd.DataFrame(
+        records, columns=["module", "level", "self_us", "cumulative_us"]
+    )
+
+
+def get_direct_imports(modules, module):
+    r"""
+    Returns the modules imported directly by ``module``. As ``python -X importtime`` lists
+    modules after all modules they import, these are the modules one level deeper listed
+    between ``module`` and the previous module on its level.
+    """
+    position = modules.index[modules["module"] == module][-1]
+    level = modules.loc[position, "level"]
+
+    direct_imports = []
+    for i in reversed(range(position)):
+        if modules.loc[i, "level"] <= level:
+            break
+        # Skip the parent packages, which are imported before the module itself
+        if modules.loc[i, "level"] == level + 1 and not module.startswith(
+            modules.loc[i, "module"] + "."
+        ):
+            direct_imports.append(i)
+
+    return modules.loc[direct_imports]
+
+
+def measure_import_time(module, repeat=REPEAT):
+    r"""
+    Imports a module in a fresh interpreter with ``python -X importtime``.
+
+    Parameters
+    ----------
+    module : str
+        Name of the module, e.g. 'scripts.build_datapackage'
+    repeat : int
+        Number of runs. The run with the shortest total import time is returned.
+
+    Returns
+    -------
+    modules : pd.DataFrame
+        Import times of the fastest run as returned by :func:`parse_importtime`
+
+    Raises
+    ------
+    ImportError
+        If the module cannot be imported
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+
+    fastest = None
+    # Run in a temporary directory so that the logfiles created on import do not end up in
+    # the repository
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(repeat):
+            process = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=tmp_dir,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+
+            if process.returncode != 0:
+                raise ImportError(process.stderr.strip().splitlines()[-1])
+
+            modules = parse_importtime(process.stderr)
+            total = modules.loc[modules["level"] == 0, "cumulative_us"].sum()
+
+            if fastest is None or total < fastest[0]:
+                fastest = (total, modules)
+
+    return fastest[1]
+
+
+def benchmark_scripts(scripts_dir=SCRIPTS_DIR, repeat=REPEAT):
+    r"""
+    Measures the import time of all scripts in ``scripts_dir``.
+
+    Returns
+    -------
+    results : pd.DataFrame
+        Total import time in seconds, the slowest modules imported by each script and the
+        error if a script could not be imported.
+    """
+    scripts = sorted(
+        os.path.splitext(file_name)[0]
+        for file_name in os.listdir(scripts_dir)
+        if file_name.endswith(".py")
+    )
+
+    results = []
+    for script in scripts:
+        result = {"script": script, "import_time": None, "top_modules": "", "error": ""}
+        try:
+            modules = measure_import_time(f"scripts.{script}", repeat=repeat)
+        except ImportError as error:
+            result["error"] = str(error)
+        else:
+            result["import_time"] = (
+                modules.loc[modules["level"] == 0, "cumulative_us"].sum() * 1e-6
+            )
+            top_level = get_direct_imports(modules, f"scripts.{script}")
+            top = top_level.nlargest(N_TOP_MODULES, "cumulative_us")
+            result["top_modules"] = ", ".join(
+                f"{module} ({time * 1e-6:.2f} s)"
+                for module, time in zip(top["module"], top["cumulative_us"])
+            )
+
+        results.append(result)
+
+    return pd.DataFrame(results).set_index("script")
+
+
+def compare_to_baseline(results, baseline, threshold=REGRESSION_THRESHOLD):
+    r"""
+    Compares the import times to those of a baseline.
+
+    Returns
+    -------
+    comparison : pd.DataFrame
+        Import times of baseline and current run, their relative change and whether the change
+        exceeds the threshold.
+    """
+    comparison = pd.DataFrame(
+        {
+            "baseline": baseline["import_time"],
+            "current": results["import_time"],
+        }
+    )
+    comparison["change"] = comparison["current"] / comparison["baseline"] - 1
+    comparison["regression"] = comparison["change"] > threshold
+
+    return comparison
+
+
+if __name__ == "__main__":
+    out_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUT_PATH
+
+    baseline_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    results = benchmark_scripts()
+
+    out_dir = os.path.dirname(out_path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    results.to_csv(out_path)
+
+    print(results[["import_time", "top_modules"]].to_string())
+
+    failed = results.loc[results["error"] != ""]
+    if not failed.empty:
+        print(f"\nCould not import {len(failed)} scripts:")
+        print(failed["error"].to_string())
+
+    if baseline_path is not None:
+        baseline = pd.read_csv(baseline_path, index_col="script")
+        comparison = compare_to_baseline(results, baseline)
+
+        print("\nComparison to baseline:")
+        print(comparison.to_string(float_format="{:.3f}".format))
+
+        regressions = comparison.loc[comparison["regression"]]
+        if not regressions.empty:
+            print(
+                f"\nImport time increased by more than {REGRESSION_THRESHOLD:.0%} for: "
+                f"{', '.join(regressions.index)}"
+            )
+            sys.exit(1)
@@ -1,3 +1,4 @@
+import functools
 import logging
 import pathlib
 import sys
@@ -66,12 +67,48 @@ def load_yaml(file_path):
     return yaml_data
 
 
-LABELS = load_yaml(CONFIG_PATH / "labels" / f"{settings.labels}.yml")
-raw_colors = load_yaml(CONFIG_PATH / "colors.yml")
-COLORS = {}
-for label, color in raw_colors.items():
-    if label not in LABELS:
-        continue
-    COLORS[LABELS[label]] = color
-    COLORS[f"{LABELS[label]} in"] = color
-    COLORS[f"{LABELS[label]} out"] = color
+def _get_raw_colors():
+    return load_yaml(CONFIG_PATH / "colors.yml")
+
+
+@functools.lru_cache(maxsize=None)
+def get_labels():
+    r"""
+    Returns the labels defined by *labels* in settings.yaml. The file is read on first access
+    only.
+    """
+    return load_yaml(CONFIG_PATH / "labels" / f"{settings.labels}.yml")
+
+
+@functools.lru_cache(maxsize=None)
+def get_colors():
+    r"""
+    Returns the colors of all labels, including the labels of inputs ('<label> in') and
+    outputs ('<label> out'). The files are read on first access only.
+    """
+    labels = get_labels()
+    colors = {}
+    for label, color in _get_raw_colors().items():
+        if label not in labels:
+            continue
+        colors[labels[label]] = color
+        colors[f"{labels[label]} in"] = color
+        colors[f"{labels[label]} out"] = color
+
+    return colors
+
+
+_LAZY_ATTRIBUTES = {
+    "LABELS": get_labels,
+    "COLORS": get_colors,
+    "raw_colors": _get_raw_colors,
+}
+
+
+def __getattr__(name):
+    # LABELS and COLORS are loaded on first access instead of at import time, which keeps the
+    # startup of scripts that do not need them short.
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,88 @@
+import functools
 import os
+from collections.abc import Mapping
 
 from oemof_b3.config.config import load_yaml
 
 
 here = os.path.dirname(os.path.abspath(__file__))
 
-component_attrs_update = load_yaml(os.path.join(here, "component_attrs_update.yml"))
+MODEL_STRUCTURE_DIR = os.path.join(here, "model_structure")
 
-bus_attrs_update = load_yaml(os.path.join(here, "bus_attrs_update.yml"))
 
-foreign_keys_update = load_yaml(os.path.join(here, "foreign_keys_update.yml"))
+class ModelStructures(Mapping):
+    r"""
+    Read-only mapping of the names of the model structures in MODEL_STRUCTURE_DIR to their
+    content. A model structure is read from its yaml file on first access only.
+    """
 
-MODEL_STRUCTURE_DIR = os.path.join(here, "model_structure")
+    def __init__(self, directory):
+        self.directory = directory
+        self._file_names = {
+            os.path.splitext(f_name)[0]: f_name
+            for f_name in sorted(os.listdir(directory))
+        }
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            file_name = self._file_names[name]
+            self._loaded[name] = load_yaml(os.path.join(self.directory, file_name))
+
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(self._file_names)
+
+    def __len__(self):
+        return len(self._file_names)
+
+
+model_structures = ModelStructures(MODEL_STRUCTURE_DIR)
+
+
+def get_model_structure(model_structure):
+    r"""
+    Returns the model structure with the given name from MODEL_STRUCTURE_DIR or, if there is
+    none, loads it from the yaml file at the given path.
 
-model_structures = {
-    os.path.splitext(f_name)[0]: load_yaml(os.path.join(MODEL_STRUCTURE_DIR, f_name))
-    for f_name in os.listdir(MODEL_STRUCTURE_DIR)
+    Parameters
+    ----------
+    model_structure : str
+        Name of a model structure in MODEL_STRUCTURE_DIR or path of a yaml file
+
+    Returns
+    -------
+    model_structure : dict
+        Regions, links, busses and components of the model
+    """
+    if model_structure in model_structures:
+        return model_structures[model_structure]
+
+    if os.path.isfile(model_structure):
+        return load_yaml(model_structure)
+
+    raise KeyError(
+        f"'{model_structure}' is neither one of the model structures "
+        f"{list(model_structures)} nor a file."
+    )
+
+
+_LAZY_YAML_FILES = {
+    "component_attrs_update": "component_attrs_update.yml",
+    "bus_attrs_update": "bus_attrs_update.yml",
+    "foreign_keys_update": "foreign_keys_update.yml",
 }
+
+
+@functools.lru_cache(maxsize=None)
+def _load_model_yaml(file_name):
+    return load_yaml(os.path.join(here, file_name))
+
+
+def __getattr__(name):
+    # The attribute updates are loaded on first access instead of at import time.
+    if name in _LAZY_YAML_FILES:
+        return _load_model_yaml(_LAZY_YAML_FILES[name])
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
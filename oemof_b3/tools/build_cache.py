@@ -0,0 +1,312 @@
+# coding: utf-8
+r"""
+This module contains the BuildCache, which keeps the files of the last build of a
+datapackage together with hashes of the inputs they were built from, so that unchanged files
+can be restored instead of being built and written again, and the FileStore, in which builds
+of several scenarios share files with the same content.
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+
+import pandas as pd
+
+from oemof_b3.config import config
+from oemof_b3.tools.hashing import hash_file, hash_object
+
+
+logger = config.add_snake_logger("build_cache")
+
+# Increase to invalidate all existing caches, e.g. if the format of the files changes
+CACHE_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+
+FILES_DIR = "files"
+
+
+def hash_frame(df):
+    r"""
+    Returns the sha1 hash of a DataFrame including its index, columns and dtypes.
+    """
+    sha1 = hashlib.sha1()
+    sha1.update(
+        hash_object([df.index.name, list(df.columns), list(df.dtypes)]).encode()
+    )
+
+    try:
+        sha1.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    except TypeError:
+        # Unhashable values, e.g. dicts in object columns
+        sha1.update(df.to_csv().encode())
+
+    return sha1.hexdigest()
+
+
+def remove_file(path):
+    r"""Removes a file if it exists, also if it is a read-only link into a FileStore"""
+    if os.path.lexists(path):
+        os.remove(path)
+
+
+class FileStore:
+    r"""
+    Content-addressed store of files that is shared by the builds of several scenarios. Each
+    file is kept once under the hash of its content (see :func:`hash_file`) and hard linked
+    into the builds that contain it, or copied if the file system does not support hard links.
+
+    Stored files are read-only (except on Windows), so that a linked file cannot be changed
+    in place, which would change it in all builds. Writing to a path in a build therefore
+    requires to remove the link first.
+
+    Parameters
+    ----------
+    store_dir : str
+        Directory of the store, e.g. ``results/_file_store``
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+    def get_path(self, hash):
+        r"""Returns the path of the stored file with the given hash"""
+        return os.path.join(self.store_dir, hash[:2], hash)
+
+    def has(self, hash):
+        r"""Returns True if a file with the given hash is in the store"""
+        return hash is not None and os.path.exists(self.get_path(hash))
+
+    def add(self, path):
+        r"""
+        Adds the file at ``path`` to the store and replaces it by a link to the stored file.
+
+        Returns
+        -------
+        hash : str
+            Hash of the file's content, under which it is stored
+        """
+        hash = hash_file(path)
+        stored = self.get_path(hash)
+
+        if not os.path.exists(stored):
+            if not os.path.exists(os.path.dirname(stored)):
+                os.makedirs(os.path.dirname(stored))
+
+            # Copy to a temporary file first, so that an interrupted copy is not stored
+            tmp = f"{stored}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp)
+            if os.name != "nt":
+                # Read-only files cannot be removed by shutil.rmtree on Windows
+                os.chmod(tmp, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp, stored)
+
+        self.link(hash, path)
+
+        return hash
+
+    def link(self, hash, path):
+        r"""
+        Links the stored file with the given hash to ``path``, replacing an existing file.
+        """
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        remove_file(path)
+
+        try:
+            os.link(self.get_path(hash), path)
+        except OSError:
+            shutil.copyfile(self.get_path(hash), path)
+
+
+class BuildCache:
+    r"""
+    Stores files of a build together with a manifest of
+
+    * keys, i.e. hashes of the inputs of groups of files and
+    * the hash of the data, the columns and, with a FileStore, the hash of the content of each
+      stored file.
+
+    A build compares the keys of its inputs to the stored keys with :meth:`is_valid` and
+    restores the files of valid groups with :meth:`restore`. New files are added with
+    :meth:`store`, the manifest is written with :meth:`save`.
+
+    Without a FileStore, files are copied to ``cache_dir``, not linked, so that editing a
+    built file does not alter the cache. With a FileStore, files are kept in the store and
+    hard linked into the build. Files with the same content, e.g. the sequences of scenarios
+    that share their timeseries, are then stored only once.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory of the cache, e.g. ``results/{scenario}/build_cache``
+    file_store : FileStore
+        Store shared with the caches of other scenarios. Optional.
+    """
+
+    def __init__(self, cache_dir, file_store=None):
+        self.cache_dir = cache_dir
+
+        self.files_dir = os.path.join(cache_dir, FILES_DIR)
+
+        self.file_store = file_store
+
+        self.manifest = self._load_manifest()
+
+        self.new_manifest = {"version": CACHE_VERSION, "keys": {}, "files": {}}
+
+    def _load_manifest(self):
+        path = os.path.join(self.cache_dir, MANIFEST_FILE)
+
+        if not os.path.exists(path):
+            return {"keys": {}, "files": {}}
+
+        with open(path) as file:
+            manifest = json.load(file)
+
+        if manifest.get("version") != CACHE_VERSION:
+            logger.info(f"Ignoring cache of other version in '{self.cache_dir}'.")
+            return {"keys": {}, "files": {}}
+
+        return manifest
+
+    def set_key(self, name, key):
+        r"""
+        Sets the key (hash of the inputs) of the group of files ``name``.
+        """
+        self.new_manifest["keys"][name] = key
+
+    def is_valid(self, name, key):
+        r"""
+        Returns True if the stored key of the group of files ``name`` equals ``key`` and all
+        stored files are present.
+        """
+        return self.manifest["keys"].get(name) == key and all(
+            self.has_file(rel_path) for rel_path in self.manifest["files"]
+        )
+
+    def get_hash(self, rel_path):
+        r"""
+        Returns the stored hash of a file, None if it is not in the cache.
+        """
+        return self.manifest["files"].get(rel_path, {}).get("hash")
+
+    def get_columns(self, rel_path):
+        r"""
+        Returns the stored columns of a file, None if it is not in the cache.
+        """
+        return self.manifest["files"].get(rel_path, {}).get("columns")
+
+    def has_file(self, rel_path):
+        r"""
+        Returns True if the file is in the manifest and in the cache directory or store.
+        """
+        if rel_path not in self.manifest["files"]:
+            return False
+
+        if self.file_store is not None:
+            return self.file_store.has(
+                self.manifest["files"][rel_path].get("file_hash")
+            )
+
+        return os.path.exists(os.path.join(self.files_dir, rel_path))
+
+    def restore(self, rel_path, destination):
+        r"""
+        Copies (or links) a file from the cache to ``destination`` and keeps it in the new
+        manifest.
+
+        Returns
+        -------
+        restored : bool
+            False if the file is not in the cache
+        """
+        if not self.has_file(rel_path):
+            return False
+
+        path = os.path.join(destination, rel_path)
+
+        if self.file_store is not None:
+            self.file_store.link(self.manifest["files"][rel_path]["file_hash"], path)
+        else:
+            if not os.path.exists(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            remove_file(path)
+            shutil.copyfile(os.path.join(self.files_dir, rel_path), path)
+
+        self.new_manifest["files"][rel_path] = self.manifest["files"][rel_path]
+
+        return True
+
+    def store(self, rel_path, destination, hash=None, columns=None):
+        r"""
+        Copies a built file from ``destination`` to the cache, or adds it to the FileStore.
+
+        Parameters
+        ----------
+        rel_path : str
+            Path of the file relative to ``destination``
+        destination : str
+            Directory of the build
+        hash : str
+            Hash of the file's data, e.g. by :func:`hash_frame`. Hash of the file if None.
+        columns : list
+            Columns of the file, used to detect changes of the schema
+        """
+        built = os.path.join(destination, rel_path)
+
+        file = {"hash": hash, "columns": columns}
+
+        if self.file_store is not None:
+            file["file_hash"] = self.file_store.add(built)
+        else:
+            path = os.path.join(self.files_dir, rel_path)
+            if not os.path.exists(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+
+            shutil.copyfile(built, path)
+
+        if file["hash"] is None:
+            file["hash"] = file.get("file_hash") or hash_file(built)
+
+        self.new_manifest["files"][rel_path] = file
+
+    def schema_changed(self):
+        r"""
+        Returns True if files with columns were added or removed or their columns changed
+        compared to the last build.
+        """
+
+        def get_schema(manifest):
+            return {
+                rel_path: file["columns"]
+                for rel_path, file in manifest["files"].items()
+                if file["columns"] is not None
+            }
+
+        return get_schema(self.new_manifest) != get_schema(self.manifest)
+
+    def save(self):
+        r"""
+        Writes the new manifest and removes files from the cache directory that are not part
+        of it. Files in the FileStore are kept, as other builds may use them.
+        """
+        for root, _, files in os.walk(self.files_dir):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                rel_path = os.path.relpath(path, self.files_dir).replace(os.sep, "/")
+                if (
+                    self.file_store is not None
+                    or rel_path not in self.new_manifest["files"]
+                ):
+                    os.remove(path)
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        with open(os.path.join(self.cache_dir, MANIFEST_FILE), "w") as file:
+            json.dump(self.new_manifest, file, indent=2)
+
+        self.manifest = self.new_manifest
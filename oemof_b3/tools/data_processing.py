@@ -9,7 +9,6 @@ import os
 import warnings
 
 import numpy as np
-import oemof.tabular.facades
 import pandas as pd
 
 from oemof_b3.config import config
@@ -27,6 +26,8 @@ HEADER_B3_SCAL = schema.SCHEMA_SCAL.columns.columns
 
 HEADER_B3_TS = schema.SCHEMA_TS.columns.columns
 
+TIMEINDEX_COLUMNS = ["timeindex_start", "timeindex_stop", "timeindex_resolution"]
+
 
 def sort_values(df, reset_index=True):
     _df = df.copy()
@@ -554,7 +555,8 @@ def aggregate_timeseries(df, columns_to_aggregate, agg_method=None):
     columns_to_aggregate : string or list
         The columns to sum together ('region', 'carrier', 'tech' or 'type).
     agg_method : dict
-        Dictionary to specify aggregation method.
+        Dictionary to specify aggregation method. By default, the series are summed up and
+        the units have to be the same, see :meth:`StackedTimeseries.aggregate`.
 
     Returns
     -------
@@ -564,6 +566,17 @@ def aggregate_timeseries(df, columns_to_aggregate, agg_method=None):
     _df = df.copy()
 
     _df = format_header(_df, HEADER_B3_TS, config.settings.general.ts_index_name)
+
+    if not agg_method:
+        # Sum up the series of all groups at once
+        df_aggregated = (
+            StackedTimeseries.from_frame(_df).aggregate(columns_to_aggregate).to_frame()
+        )
+
+        return format_header(
+            df_aggregated, HEADER_B3_TS, config.settings.general.ts_index_name
+        )
+
     _df.series = _df.series.apply(lambda x: np.array(x))
 
     if not isinstance(columns_to_aggregate, list):
@@ -581,13 +594,6 @@ def aggregate_timeseries(df, columns_to_aggregate, agg_method=None):
 
     groupby = list(set(groupby).difference(set(columns_to_aggregate)))
 
-    # Define how to aggregate if
-    if not agg_method:
-        agg_method = {
-            "series": sum_series,
-            "var_unit": aggregate_units,
-        }
-
     df_aggregated = aggregate_data(_df, groupby, agg_method)
 
     # Assign "ALL" to the columns that where aggregated.
@@ -625,153 +631,58 @@ def prepare_attr_name(sc, overwrite):
     Returns
     -------
     scalars_set_name : pd.DataFrame
-        DataFrame made of concatenated DataFrames with formatted names.
+        DataFrame with formatted names. Rows that had a name come first, followed by the rows
+        whose name has been set.
 
     """
+    # Check if carrier, region and tech exist as columns
+    if not {"carrier", "region", "tech"}.issubset(sc.columns):
+        raise KeyError(
+            "Please provide a DataFrame that conforms to oemof-B3-resources-format."
+        )
 
-    def get_name(region, carrier, tech):
-        r"""
-        This function gets name according to oemof-b3's-naming convention:
-        <region>-<carrier>-<tech>.
-
-        Parameters
-        ----------
-        region : str
-            region
-        carrier : str
-            carrier
-        tech : str
-            technology
-
-        Returns
-        -------
-        String containing name according to convention eg. B-ch4-gt.
-
-        """
-        return f"{region}-{carrier}-{tech}"
-
-    def get_name_for_df(df):
-        r"""
-        This function returns a series of names generated from the convention.
-
-        Parameters
-        ----------
-        df : pd.DataFrame
-            DataFrame in oemof-B3-resources format.
-
-        Returns
-        -------
-        pd.Series with names set according to convention in get_name.
-
-        """
-        # Check if carrier, region and tech exist as columns
-        if {"carrier", "region", "tech"}.issubset(df.columns):
-            return df.apply(lambda x: get_name(x["region"], x["carrier"], x["tech"]), 1)
-        else:
-            raise KeyError(
-                "Please provide a DataFrame that conforms to "
-                "oemof-B3-resources-format."
-            )
-
-    def check_name(df):
-        r"""
-        This function checks whether a name given by the user matches the one from the
-        oemof-B3 naming convention. It prints a warning if expected differs from given names and
-        prints a list with expected names.
-
-        Parameters
-        ----------
-        df : pd.DataFrame
-            DataFrame in oemof-B3-resources format.
-
-        """
-        # Get name of Dataframe
-        name_as_given = df["name"]
-
-        # Get name according to convention
-        name_generated = get_name_for_df(df)
-
-        # Get diff of names
-        diff_in_name = compare_scalar_data(name_as_given, name_generated)
-
-        # Save unique values of diff to a list and print as warning
-        expected_names = list(diff_in_name.unique())
-        if expected_names:
-            logger.warning(
-                "The name you have set for some of your scalar data differs "
-                "from the convention (<region>-<carrier>-<tech>). \n"
-                "We expected but could not find the following name(s): "
-                f"{expected_names}."
-            )
-        if overwrite:
-            logger.warning(
-                "The names will be overwritten with names following the convention"
-            )
-
-    def set_name(df, overwrite):
-        r"""
-        This function
-            1. checks the name if the name is not empty and
-            2. overwrites the name with the generated name if overwrite is true or the name is
-            empty
-
-        Parameters
-        ----------
-        df : pd.DataFrame
-            DataFrame in oemof-B3-resources format.
-
-        Returns
-        -------
-        df : pd.DataFrame
-            DataFrame in oemof-B3-resources format and formatted name.
-
-        """
-        all_empty = df["name"].isnull().values.all()
-        if not all_empty:
-            check_name(df)
-
-        elif all_empty or overwrite:
-            name_generated = get_name_for_df(df)
-            _df = df.copy()  # To avoid SettingWithCopyWarning
-            _df.loc[:, "name"] = name_generated
-            df = _df
-
-        return df
-
-    def compare_scalar_data(sc_1, sc_2):
-        r"""
-        This functions compares the column of two DataFrames
-        It returns a DataFrame with scalars that diverge in name convention.
-
-        Parameters
-        ----------
-        sc_1 : pd.Series
-            Series with given values
-        sc_2 : pd.Series
-            Series with expected values
-
-        Returns
-        -------
-        diff_name_sc : pd.Series
-            Series where expected values not found
-        """
-        diff_name_sc = sc_1.compare(sc_2)
+    # Get names according to the naming convention <region>-<carrier>-<tech>, e.g. B-ch4-gt
+    name_generated = (
+        sc["region"].astype(str)
+        + "-"
+        + sc["carrier"].astype(str)
+        + "-"
+        + sc["tech"].astype(str)
+    )
 
-        return diff_name_sc["other"]
+    has_name = sc["name"].notnull()
+
+    # Check names given by the user against the convention and report all conflicts at once
+    conflicting = has_name & (sc["name"] != name_generated)
+
+    if conflicting.any():
+        conflicts = pd.DataFrame(
+            {
+                "given": sc.loc[conflicting, "name"],
+                "expected": name_generated.loc[conflicting],
+            }
+        ).drop_duplicates()
+
+        logger.warning(
+            "The name you have set for some of your scalar data differs "
+            "from the convention (<region>-<carrier>-<tech>). \n"
+            "We expected but could not find the following name(s): "
+            f"{list(conflicts['expected'].unique())}. Given and expected names: "
+            f"{list(zip(conflicts['given'], conflicts['expected']))}."
+        )
 
-    # PART 1: Ensure name is set (according to convention) where name is empty and region is fixed
-    # Save values where name is None and region is not "ALL" in new DataFrame
-    sc_wo_name = sc[sc["name"].isnull()]
-    sc_add_name = set_name(sc_wo_name, overwrite)
+    if overwrite and has_name.any():
+        logger.warning(
+            "The names will be overwritten with names following the convention"
+        )
 
-    # PART 2: Ensure name is checked for all values that are not None and where region is fixed
-    sc_with_name = sc[sc["name"].notnull()]
-    sc_with_name = set_name(sc_with_name, overwrite)
+    # Set names where they are empty or should be overwritten
+    set_name = ~has_name | overwrite
 
-    # PART 3: Concatenate DataFrame with corrected name and DataFrame with set name
-    scalars_set_name = pd.concat([sc_with_name, sc_add_name])
+    scalars_set_name = sc.copy()
+    scalars_set_name.loc[set_name, "name"] = name_generated.loc[set_name]
 
-    return scalars_set_name
+    return pd.concat([scalars_set_name.loc[has_name], scalars_set_name.loc[~has_name]])
 
 
 def expand_regions(scalars, regions, where="ALL"):
@@ -1032,6 +943,20 @@ def stack_timeseries(df):
     return df_stacked
 
 
+def _warn_lost_columns(df):
+    r"""
+    Warns if there are remarks in columns "source" or "comment" of stacked timeseries. These
+    two columns will be lost once unstacked.
+    """
+    lost_columns = ["source", "comment"]
+    for col in lost_columns:
+        if col in list(df.columns):
+            if not df[col].isna().all() or df[col].values.all() == "None":
+                logger.warning(
+                    f"Caution any remarks in column '{col}' are lost after unstacking."
+                )
+
+
 def unstack_timeseries(df):
     """
     This function unstacks a Dataframe so that there is a row for each value.
@@ -1054,14 +979,7 @@ def unstack_timeseries(df):
     timeindex_stop = check_consistency_timeindex(_df, "timeindex_stop")
 
     # Warn user if "source" or "comment" in columns of stacked DataFrame
-    # These two columns will be lost once unstacked
-    lost_columns = ["source", "comment"]
-    for col in lost_columns:
-        if col in list(df.columns):
-            if not _df[col].isna().all() or _df[col].values.all() == "None":
-                logger.warning(
-                    f"Caution any remarks in column '{col}' are lost after unstacking."
-                )
+    _warn_lost_columns(_df)
 
     # Process values of series
     values_series = []
@@ -1258,6 +1176,8 @@ def _get_direction(oemof_tuple):
 
 
 def _get_region_carrier_tech_from_component(component, delimiter="-"):
+    # oemof.tabular is imported here as it is slow to import and only needed in this function
+    import oemof.tabular.facades
 
     typemap_facades = oemof.tabular.facades.TYPEMAP
     typemap_values = list(typemap_facades.values())
@@ -1400,3 +1320,304 @@ class ScalarProcessor:
         _df = stack_var_name(_df)
 
         self.scalars = pd.concat([self.scalars, _df])
+
+
+class StackedTimeseries:
+    r"""
+    Stacked timeseries in oemof_b3 format stored as arrays instead of a column of lists.
+
+    The metadata (all columns but 'series') is kept in a DataFrame, the values in one float
+    array of shape (number of timeseries, number of time steps) per time index, i.e. per
+    combination of 'timeindex_start', 'timeindex_stop' and 'timeindex_resolution'. Filtering,
+    grouping, aggregating and unstacking operate on these arrays at once.
+
+    Use :meth:`from_frame` and :meth:`to_frame` to convert from and to stacked timeseries in
+    DataFrames, e.g. as loaded by :func:`load_b3_timeseries`.
+
+    Parameters
+    ----------
+    meta : pd.DataFrame
+        Metadata with one row per timeseries
+    block : np.ndarray
+        Number of the array of each timeseries
+    row : np.ndarray
+        Row of each timeseries in its array
+    values : list of np.ndarray
+        Arrays of the values, one per time index
+    columns : list
+        Order of the columns of the DataFrame returned by :meth:`to_frame`
+    """
+
+    def __init__(self, meta, block, row, values, columns=None):
+        self.meta = meta
+        self._block = np.asarray(block, dtype=int)
+        self._row = np.asarray(row, dtype=int)
+        self._values = list(values)
+        self._columns = columns
+
+    @classmethod
+    def from_frame(cls, df):
+        r"""
+        Creates StackedTimeseries from stacked timeseries in a DataFrame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Stacked timeseries with column 'series' holding lists or arrays
+
+        Returns
+        -------
+        StackedTimeseries
+        """
+        meta = df.drop(columns="series")
+
+        block = (
+            meta.groupby(TIMEINDEX_COLUMNS, sort=False, dropna=False).ngroup().values
+        )
+        row = np.empty(len(df), dtype=int)
+        series = df["series"].values
+
+        values = []
+        for number in range(block.max() + 1 if len(block) else 0):
+            positions = np.flatnonzero(block == number)
+            row[positions] = np.arange(len(positions))
+
+            array = np.array(list(series[positions]), dtype=float)
+            if array.ndim != 2:
+                raise ValueError(
+                    f"The series of time index "
+                    f"{tuple(meta.iloc[positions[0]][TIMEINDEX_COLUMNS])} differ in length."
+                )
+            values.append(array)
+
+        return cls(meta, block, row, values, columns=list(df.columns))
+
+    @classmethod
+    def from_wide(cls, df, **kwargs):
+        r"""
+        Stacks the columns of a DataFrame with a time index at once, like
+        :func:`stack_timeseries`.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Timeseries with DatetimeIndex of given or inferable frequency, one per column
+        kwargs : Additional keyword arguments
+            Values of additional columns, e.g. region or scenario_key
+
+        Returns
+        -------
+        StackedTimeseries
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError(
+                "Your data should have a time series as an index of the format "
+                "'%Y-%m-%d %H:%M:%S'."
+            )
+
+        frequency = df.index.freqstr or pd.infer_freq(df.index)
+        if frequency is None:
+            raise TypeError(
+                "No frequency of your provided data could be detected."
+                "Please provide a DataFrame with a specific frequency (eg. 'H' or 'T')."
+            )
+
+        meta = pd.DataFrame(
+            {
+                "var_name": df.columns,
+                "timeindex_start": df.index[0],
+                "timeindex_stop": df.index[-1],
+                "timeindex_resolution": frequency,
+                **kwargs,
+            }
+        )
+
+        return cls(
+            meta,
+            np.zeros(len(meta), dtype=int),
+            np.arange(len(meta)),
+            [df.values.T.astype(float)],
+        )
+
+    def to_frame(self):
+        r"""
+        Returns the stacked timeseries as DataFrame with lists in column 'series'.
+        """
+        series = np.empty(len(self), dtype=object)
+        for number, values in enumerate(self._values):
+            positions = np.flatnonzero(self._block == number)
+            for position, values_row in zip(
+                positions, values[self._row[positions]].tolist()
+            ):
+                series[position] = values_row
+
+        df = self.meta.copy()
+        df["series"] = series
+
+        if self._columns is not None and set(self._columns) == set(df.columns):
+            df = df[self._columns]
+
+        return df
+
+    def __len__(self):
+        return len(self.meta)
+
+    @property
+    def shape(self):
+        return (len(self), len(self.meta.columns) + 1)
+
+    @property
+    def ndim(self):
+        return 2
+
+    def _take(self, positions):
+        r"""
+        Returns the timeseries at the given positions.
+        """
+        positions = np.asarray(positions, dtype=int)
+        block = self._block[positions]
+        row = self._row[positions]
+
+        new_block = np.empty(len(positions), dtype=int)
+        new_row = np.empty(len(positions), dtype=int)
+        values = []
+        for number in pd.unique(block):
+            where = block == number
+            new_block[where] = len(values)
+            new_row[where] = np.arange(where.sum())
+            values.append(self._values[number][row[where]])
+
+        return StackedTimeseries(
+            self.meta.iloc[positions], new_block, new_row, values, self._columns
+        )
+
+    def filter(self, column_name, values, inverse=False):
+        r"""
+        Filters the timeseries like :func:`filter_df`.
+        """
+        if isinstance(values, list):
+            where = self.meta[column_name].isin(values)
+        else:
+            where = self.meta[column_name] == values
+
+        if inverse:
+            where = ~where
+
+        return self._take(np.flatnonzero(where.values))
+
+    def multi_filter(self, **kwargs):
+        r"""
+        Applies several filters in a row like :func:`multi_filter_df`.
+        """
+        filtered = self
+        for key, value in kwargs.items():
+            filtered = filtered.filter(key, value)
+
+        return filtered
+
+    def groupby(self, by):
+        r"""
+        Groups the timeseries by the values of columns.
+
+        Yields
+        ------
+        name :
+            Value(s) of the group
+        group : StackedTimeseries
+            Timeseries of the group
+        """
+        meta = self.meta.reset_index(drop=True)
+        for name, group in meta.groupby(by):
+            yield name, self._take(group.index.values)
+
+    def aggregate(self, columns_to_aggregate):
+        r"""
+        Sums up the series by region, carrier, tech or type like :func:`aggregate_timeseries`.
+
+        Parameters
+        ----------
+        columns_to_aggregate : string or list
+            The columns to sum together ('region', 'carrier', 'tech' or 'type).
+
+        Returns
+        -------
+        StackedTimeseries
+            Aggregated timeseries with 'All' in the aggregated columns
+        """
+        if not isinstance(columns_to_aggregate, list):
+            columns_to_aggregate = [columns_to_aggregate]
+
+        if set(columns_to_aggregate).intersection(TIMEINDEX_COLUMNS):
+            raise ValueError("Timeseries cannot be aggregated over their time index.")
+
+        # Define the columns that are split and thus not aggregated
+        groupby = [
+            "scenario_key",
+            "region",
+            "var_name",
+            "timeindex_start",
+            "timeindex_stop",
+            "timeindex_resolution",
+        ]
+        groupby = [column for column in groupby if column not in columns_to_aggregate]
+
+        grouped = self.meta.groupby(groupby, sort=False, dropna=False)
+        codes = grouped.ngroup().values
+        _, first = np.unique(codes, return_index=True)
+
+        meta = self.meta.iloc[first][groupby].reset_index(drop=True)
+        meta["var_unit"] = grouped["var_unit"].agg(aggregate_units).values
+
+        # Assign "All" to the columns that where aggregated.
+        for col in columns_to_aggregate:
+            meta[col] = "All"
+
+        # Each group lies in the array of its time index
+        group_block = self._block[first]
+        block = np.empty(len(meta), dtype=int)
+        row = np.empty(len(meta), dtype=int)
+        values = []
+        for number in pd.unique(group_block):
+            groups = np.flatnonzero(group_block == number)
+            local = np.empty(len(meta), dtype=int)
+            local[groups] = np.arange(len(groups))
+
+            positions = np.flatnonzero(self._block == number)
+            summed = np.zeros((len(groups), self._values[number].shape[1]))
+            np.add.at(
+                summed,
+                local[codes[positions]],
+                self._values[number][self._row[positions]],
+            )
+
+            block[groups] = len(values)
+            row[groups] = np.arange(len(groups))
+            values.append(summed)
+
+        return StackedTimeseries(meta, block, row, values)
+
+    def unstack(self):
+        r"""
+        Unstacks the timeseries like :func:`unstack_timeseries`. All timeseries need to have
+        the same time index.
+
+        Returns
+        -------
+        df_unstacked : pandas.DataFrame
+            Unstacked DataFrame with one column per 'var_name'
+        """
+        frequency = check_consistency_timeindex(self.meta, "timeindex_resolution")
+        timeindex_start = check_consistency_timeindex(self.meta, "timeindex_start")
+        timeindex_stop = check_consistency_timeindex(self.meta, "timeindex_stop")
+
+        _warn_lost_columns(self.meta)
+
+        df_unstacked = pd.DataFrame(
+            self._values[0][self._row].T,
+            columns=list(self.meta["var_name"]),
+            index=pd.date_range(timeindex_start, timeindex_stop, freq=frequency),
+        )
+
+        df_unstacked.index.name = self.meta.index.name
+
+        return df_unstacked
@@ -0,0 +1,725 @@
+# coding: utf-8
+r"""
+This module contains the functions that build the datapackage of a scenario, used by
+``scripts/build_datapackage.py``, and the functions that build the datapackages of several
+scenarios with shared inputs, used by ``scripts/build_datapackages.py`` and
+``scripts/build_sweep.py``.
+"""
+import copy
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import oemoflex
+import pandas as pd
+from oemoflex.model.datapackage import EnergyDataPackage
+from oemoflex import config as oemoflex_config
+
+from oemof_b3.model import (
+    get_model_structure,
+    bus_attrs_update,
+    component_attrs_update,
+    foreign_keys_update,
+)
+from oemof_b3.tools.data_processing import (
+    update_filtered_df,
+    multi_load_b3_scalars,
+    multi_load_b3_timeseries,
+    StackedTimeseries,
+    expand_regions,
+    prepare_attr_name,
+    save_df,
+)
+from oemof_b3.tools.build_cache import BuildCache, FileStore, hash_frame, remove_file
+from oemof_b3.tools.hashing import hash_file, hash_object
+from oemof_b3.tools.sweep import apply_scalar_overrides
+from oemof_b3.tools.timing import Profiler
+from oemof_b3.config import config
+
+logger = logging.getLogger("build_datapackage")
+
+# Inputs shared by all builds in a process, set by _init_worker
+_shared = None
+
+
+def get_component_tables(edp):
+    r"""
+    Returns the component tables of an unstacked oemoflex.EnergyDatapackage, i.e. the
+    DataFrames of the components in ``edp.components``, indexed by component name.
+    Busses and sequences are not returned.
+    """
+    return {name: edp.data[name] for name in edp.components if name in edp.data}
+
+
+def update_component_tables(tables, new):
+    r"""
+    Writes new values into the component tables in place, aligned on component name and
+    var_name. Only the cells given in ``new`` are touched. Raises a warning listing all new
+    data that is not in any of the tables and all existing values that are overwritten.
+
+    Parameters
+    ----------
+    tables : dict
+        Component tables, DataFrames indexed by component name with var_names as columns
+    new : pd.Series
+        New values with MultiIndex (name, var_name)
+
+    Returns
+    -------
+    None
+    """
+    names = new.index.get_level_values("name")
+    found = pd.Series(False, index=new.index)
+    overwritten = []
+
+    for df in tables.values():
+        in_table = names.isin(df.index) & new.index.get_level_values("var_name").isin(
+            df.columns
+        )
+        if not in_table.any():
+            continue
+
+        found |= in_table
+
+        values = new.loc[in_table].unstack("var_name")
+
+        for var_name, column in values.items():
+            column = column.dropna().infer_objects()
+
+            existing = df.loc[column.index, var_name]
+            overwritten.extend(
+                (name, var_name) for name in existing.index[existing.notna()]
+            )
+
+            if df[var_name].dtype != object and column.dtype == object:
+                df[var_name] = df[var_name].astype(object)
+
+            df.loc[column.index, var_name] = column
+
+    if not found.all():
+        logger.warning(
+            "Index of new data is not in the index of old data: "
+            f"{list(new.index[~found.values])}"
+        )
+
+    if overwritten:
+        logger.warning(f"Update overwrites existing data: {overwritten}")
+
+
+def parametrize_scalars(edp, scalars, filters):
+    r"""
+    Parametrizes an oemoflex.EnergyDataPackage with scalars. Accepts an OrderedDict of filters
+    that is used to filter the scalars and subsequently update the EnergyDatapackage.
+
+    Parameters
+    ----------
+    edp : oemoflex.EnergyDatapackage
+        EnergyDatapackage to parametrize
+    scalars : pd.DataFrame in oemof_B3-Resources format.
+        Scalar data
+    filters : OrderedDict
+        Filters for the scalar data
+
+    Returns
+    -------
+    edp : oemoflex.EnergyDatapackage
+        Parametrized EnergyDatapackage
+    """
+    # apply filters subsequently
+    filtered = update_filtered_df(scalars, filters)
+
+    # set index to component name and var_name
+    filtered = filtered.set_index(["name", "var_name"]).loc[:, "var_value"]
+
+    # check if there are duplicates after setting index
+    duplicated = filtered.loc[filtered.index.duplicated()]
+
+    if duplicated.any():
+        raise ValueError(f"There are duplicates in the scalar data: {duplicated}")
+
+    # write the values directly into the component tables, without stacking them
+    update_component_tables(get_component_tables(edp), filtered)
+
+    return edp
+
+
+def parametrize_sequences(edp, ts, filters):
+    r"""
+    Parametrizes an oemoflex.EnergyDataPackage with timeseries.
+
+    Parameters
+    ----------
+    edp : oemoflex.EnergyDatapackage
+        EnergyDatapackage to parametrize
+    ts : oemof_b3.tools.data_processing.StackedTimeseries or pd.DataFrame
+        Timeseries data in oemof_B3-Resources format
+    filters : dict
+        Filters for timeseries data
+
+    Returns
+    -------
+    edp : oemoflex.EnergyDatapackage
+        Parametrized EnergyDatapackage
+    """
+    if not isinstance(ts, StackedTimeseries):
+        ts = StackedTimeseries.from_frame(ts)
+
+    # Filter timeseries
+    _ts = ts.multi_filter(**filters)
+
+    # Group timeseries and parametrize EnergyDatapackage
+    ts_groups = _ts.groupby("var_name")
+
+    for name, group in ts_groups:
+
+        group.meta = group.meta.assign(
+            var_name=group.meta["region"] + "-" + group.meta["var_name"]
+        )
+
+        data_unstacked = group.unstack()
+
+        edp.data[name] = data_unstacked
+
+        edp.data[name].index.name = "timeindex"
+
+    return edp
+
+
+def get_format_key():
+    r"""
+    Returns a hash of the settings that determine how the data of a datapackage is written to
+    files, i.e. the separator and the version of oemoflex.
+    """
+    return hash_object(
+        {
+            "separator": config.settings.general.separator,
+            "oemoflex": getattr(oemoflex, "__version__", None),
+        }
+    )
+
+
+def get_input_keys(scenario_specs, model_structure):
+    r"""
+    Returns keys, i.e. hashes of the inputs, of the element files ('scalars') and the
+    sequence files ('timeseries') of a datapackage. Both include the structure of the
+    datapackage, so that a change of the structure invalidates all files.
+    """
+
+    def hash_files(paths):
+        if isinstance(paths, str):
+            paths = [paths]
+        return {path: hash_file(path) for path in paths}
+
+    structure = hash_object(
+        {
+            "name": scenario_specs["name"],
+            "datetimeindex": scenario_specs["datetimeindex"],
+            "model_structure": model_structure,
+            "bus_attrs_update": bus_attrs_update,
+            "component_attrs_update": component_attrs_update,
+            "format": get_format_key(),
+        }
+    )
+
+    return {
+        "scalars": hash_object(
+            [
+                structure,
+                hash_files(scenario_specs["paths_scalars"]),
+                scenario_specs["filter_scalars"],
+                scenario_specs.get("scalar_overrides"),
+                dict(config.settings.build_datapackage),
+            ]
+        ),
+        "timeseries": hash_object(
+            [
+                structure,
+                hash_files(scenario_specs["paths_timeseries"]),
+                scenario_specs["filter_timeseries"],
+            ]
+        ),
+    }
+
+
+def get_resource_group(rel_path):
+    r"""
+    Returns the group of inputs a file of the datapackage is built from.
+    """
+    return "timeseries" if "sequences" in rel_path.split("/") else "scalars"
+
+
+def get_columns(df):
+    r"""Returns the columns of a resource as written to csv, including its index"""
+    return [df.index.name] + list(df.columns)
+
+
+def write_resources(edp, destination, names):
+    r"""
+    Writes the resources ``names`` of an oemoflex.EnergyDatapackage to csv files in
+    destination.
+    """
+    # Existing files may be read-only links into a FileStore
+    for name in names:
+        remove_file(os.path.join(destination, edp.rel_paths[name]))
+
+    data = edp.data
+    edp.data = {name: data[name] for name in names}
+    try:
+        edp.to_csv_dir(destination)
+    finally:
+        edp.data = data
+
+
+def save_datapackage(edp, destination, cache=None, valid=()):
+    r"""
+    Saves an oemoflex.EnergyDatapackage to csv files in destination. If a cache is given,
+    the files of the groups in ``valid`` and all other files whose data and format (see
+    :func:`get_format_key`) have not changed since the last build are restored from the cache.
+    Only the remaining files are written. If the cache has a FileStore, the written files are
+    added to it, so that files with the same content as a file of another build share it.
+
+    Parameters
+    ----------
+    edp : oemoflex.EnergyDatapackage
+        EnergyDatapackage to save
+    destination : str
+        Path of output directory
+    cache : oemof_b3.tools.build_cache.BuildCache
+        Cache of the last build
+    valid : list
+        Groups of files ('scalars', 'timeseries') whose inputs have not changed
+
+    Returns
+    -------
+    written : list
+        Relative paths of the written files
+    """
+    if cache is None:
+        edp.to_csv_dir(destination)
+        return [edp.rel_paths[name] for name in edp.data]
+
+    format_key = get_format_key()
+
+    hashes = {}
+    for name, data in edp.data.items():
+        rel_path = edp.rel_paths[name]
+
+        if get_resource_group(rel_path) in valid and cache.restore(
+            rel_path, destination
+        ):
+            continue
+
+        # The same data is written differently, e.g. with another separator
+        hashes[name] = hash_object([format_key, hash_frame(data)])
+
+        if hashes[name] == cache.get_hash(rel_path) and cache.restore(
+            rel_path, destination
+        ):
+            del hashes[name]
+
+    write_resources(edp, destination, list(hashes))
+
+    for name, hash in hashes.items():
+        data = edp.data[name]
+        cache.store(
+            edp.rel_paths[name],
+            destination,
+            hash=hash,
+            columns=get_columns(data),
+        )
+
+    logger.info(
+        f"Wrote {len(hashes)} of {len(edp.data)} files of the datapackage, restored the "
+        "others from the build cache."
+    )
+
+    return [edp.rel_paths[name] for name in hashes]
+
+
+def load_additional_scalars(scalars, filters):
+    """Loads additional scalars like the emission limit and filters by 'scenario_key'"""
+    # get electricity/gas relations and parameters for the calculation of emission_limit
+    el_gas_rel = scalars.loc[
+        scalars.var_name == config.settings.build_datapackage.el_gas_relation
+    ]
+    emissions = scalars.loc[
+        scalars.carrier == config.settings.build_datapackage.emission
+    ]
+
+    # get `output_parameters` of backpressure components as they are not taken into
+    # consideration in oemof.tabular so far. They are added to the components' output flow towards
+    # the heat bus in script `optimize.py`.
+    bpchp_out = scalars.loc[
+        (scalars.tech == "bpchp") & (scalars.var_name == "output_parameters")
+    ]
+
+    # concatenate data for filtering
+    df = pd.concat([el_gas_rel, emissions, bpchp_out])
+
+    # subsequently apply filters
+    filtered_df = update_filtered_df(df, filters)
+
+    # calculate emission limit and prepare data frame in case all necessary data is available
+    _filtered_df = filtered_df.copy().set_index("var_name")
+    try:
+        emission_limit = calculate_emission_limit(
+            _filtered_df.at["emissions_1990", "var_value"],
+            _filtered_df.at["emissions_not_modeled", "var_value"],
+            _filtered_df.at["emission_reduction_factor", "var_value"],
+        )
+    except KeyError:
+        emission_limit = None
+
+    emission_limit_df = pd.DataFrame(
+        {
+            "var_name": "emission_limit",
+            "var_value": emission_limit,
+            "carrier": "emission",
+            "var_unit": "kg_CO2_eq",
+            "scenario_key": "ALL",
+        },
+        index=[0],
+    )
+
+    # add emission limit to filtered additional scalars and adapt format of data frame
+    add_scalars = pd.concat([filtered_df, emission_limit_df], sort=False)
+    add_scalars.reset_index(inplace=True, drop=True)
+    add_scalars.index.name = "id_scal"
+
+    return add_scalars
+
+
+def save_additional_scalars(additional_scalars, destination):
+    """Saves `additional_scalars` to additional_scalar_file in `destination`"""
+    filename = os.path.join(
+        destination, config.settings.build_datapackage.additional_scalars_file
+    )
+    save_df(additional_scalars, filename)
+
+    logger.info(f"Saved additional scalars to '{filename}'.")
+
+
+def calculate_emission_limit(
+    emissions_1990, emissions_not_modeled, emission_reduction_factor
+):
+    """Calculates the emission limit.
+    Emission limit is calculated by
+    emissions_1990 * (1 - emission_reduction_factor) - emissions_not_modeled"""
+
+    return emissions_1990 * (1 - emission_reduction_factor) - emissions_not_modeled
+
+
+class SharedInputs:
+    r"""
+    Loads the inputs of datapackages on first request and shares them between the builds of
+    several scenarios:
+
+    * scalars, with expanded regions and names, per set of files and regions,
+    * timeseries per set of files and
+    * the default structure of the EnergyDataPackage per model structure and timeindex.
+
+    Scenarios that differ only in their filters thus load and prepare their inputs once.
+    """
+
+    def __init__(self):
+        self._scalars = {}
+        self._timeseries = {}
+        self._datapackages = {}
+
+    @staticmethod
+    def _get_key(paths):
+        return (paths,) if isinstance(paths, str) else tuple(paths)
+
+    def get_scalars(self, paths, regions, profiler):
+        r"""
+        Returns the scalars in the files ``paths`` with 'ALL' replaced by ``regions`` and
+        checked names.
+        """
+        key = (self._get_key(paths), tuple(regions))
+
+        if key not in self._scalars:
+            with profiler.span("load scalars") as span:
+                scalars = multi_load_b3_scalars(paths)
+                span.add_shape(scalars)
+
+            with profiler.span("prepare scalars") as span:
+                # Replace 'ALL' in the column regions by the actual regions
+                scalars = expand_regions(scalars, regions)
+
+                # Check and set attribute 'name'
+                scalars = prepare_attr_name(
+                    scalars,
+                    config.settings.build_datapackage.overwrite_name,
+                )
+                span.add_shape(scalars)
+
+            self._scalars[key] = scalars
+
+        return self._scalars[key]
+
+    def get_timeseries(self, paths, profiler):
+        r"""
+        Returns the timeseries in the files ``paths`` as StackedTimeseries.
+        """
+        key = self._get_key(paths)
+
+        if key not in self._timeseries:
+            with profiler.span("load timeseries") as span:
+                ts = multi_load_b3_timeseries(paths)
+                span.add_shape(ts)
+
+            self._timeseries[key] = StackedTimeseries.from_frame(ts)
+
+        return self._timeseries[key]
+
+    def get_datapackage(self, scenario_specs, model_structure, destination, profiler):
+        r"""
+        Returns an empty EnergyDataPackage with the default structure for the model structure
+        and timeindex of the scenario.
+        """
+        key = hash_object(
+            [scenario_specs["datetimeindex"], model_structure],
+        )
+
+        if key not in self._datapackages:
+            with profiler.span("setup datapackage"):
+                datetimeindex = pd.date_range(
+                    start=scenario_specs["datetimeindex"]["start"],
+                    freq=scenario_specs["datetimeindex"]["freq"],
+                    periods=scenario_specs["datetimeindex"]["periods"],
+                )
+
+                self._datapackages[key] = EnergyDataPackage.setup_default(
+                    basepath=destination,
+                    datetimeindex=datetimeindex,
+                    bus_attrs_update=bus_attrs_update,
+                    component_attrs_update=component_attrs_update,
+                    name=scenario_specs["name"],
+                    regions=model_structure["regions"],
+                    links=model_structure["links"],
+                    busses=model_structure["busses"],
+                    components=model_structure["components"],
+                )
+
+        # Each scenario parametrizes its own copy
+        edp = copy.deepcopy(self._datapackages[key])
+        edp.basepath = destination
+        edp.name = scenario_specs["name"]
+
+        return edp
+
+
+def build_datapackage(scenario_specs, destination, profiler, shared=None):
+    r"""
+    Builds the datapackage of a scenario and saves it to destination.
+
+    Parameters
+    ----------
+    scenario_specs : dict
+        Scenario specifications
+    destination : str
+        Path of output directory
+    profiler : oemof_b3.tools.timing.Profiler
+        Profiler that records the steps of the build
+    shared : SharedInputs
+        Inputs shared with the builds of other scenarios. Inputs are loaded for this build
+        only if None.
+
+    Returns
+    -------
+    None
+    """
+    if shared is None:
+        shared = SharedInputs()
+
+    model_structure = get_model_structure(scenario_specs["model_structure"])
+
+    oemoflex_config.config.settings.SEPARATOR = config.settings.general.separator
+
+    additional_scalars_file = config.settings.build_datapackage.additional_scalars_file
+
+    # compare the inputs to those of the last build
+    if config.settings.build_datapackage.incremental:
+        file_store = config.settings.build_datapackage.file_store
+        cache = BuildCache(
+            os.path.join(
+                os.path.dirname(os.path.normpath(destination)),
+                config.settings.build_datapackage.cache_dir_name,
+            ),
+            file_store=FileStore(file_store) if file_store else None,
+        )
+        keys = get_input_keys(scenario_specs, model_structure)
+        for group, key in keys.items():
+            cache.set_key(group, key)
+        valid = [group for group, key in keys.items() if cache.is_valid(group, key)]
+
+        # The additional scalars are built from the scalars, build both if the file is missing
+        if not cache.has_file(additional_scalars_file):
+            valid = [group for group in valid if group != "scalars"]
+
+        logger.info(f"Inputs unchanged since the last build: {valid}.")
+    else:
+        if config.settings.build_datapackage.file_store:
+            logger.warning(
+                "The file store set in 'build_datapackage.file_store' is only used if "
+                "'build_datapackage.incremental' is true. The files are written without it."
+            )
+        cache = None
+        valid = []
+
+    # setup default structure
+    edp = shared.get_datapackage(scenario_specs, model_structure, destination, profiler)
+
+    # parametrize scalars
+    paths_scalars = scenario_specs["paths_scalars"]
+
+    if "scalars" not in valid:
+        scalars = shared.get_scalars(
+            paths_scalars, model_structure["regions"], profiler
+        )
+
+        # change scalars as defined by the variant of a sweep
+        scalars = apply_scalar_overrides(
+            scalars, scenario_specs.get("scalar_overrides")
+        )
+
+        # get filters for scalars
+        filters = OrderedDict(sorted(scenario_specs["filter_scalars"].items()))
+
+        # load additional scalars like "emission_limit" and filter by `filters` in
+        # 'scenario_key'
+        additional_scalars = load_additional_scalars(scalars=scalars, filters=filters)
+
+        # Drop those scalars that do not belong to a specific component
+        scalars = scalars.loc[~scalars["name"].isna()]
+
+        # filter and parametrize scalars
+        with profiler.span("parametrize scalars"):
+            edp = parametrize_scalars(edp, scalars, filters)
+
+        logger.info(f"Updated DataPackage with scalars from '{paths_scalars}'.")
+
+    # parametrize timeseries
+    paths_timeseries = scenario_specs["paths_timeseries"]
+
+    if "timeseries" not in valid:
+        ts = shared.get_timeseries(paths_timeseries, profiler)
+
+        filters = scenario_specs["filter_timeseries"]
+
+        with profiler.span("parametrize timeseries"):
+            edp = parametrize_sequences(edp, ts, filters)
+
+        logger.info(f"Updated DataPackage with timeseries from '{paths_timeseries}'.")
+
+    # save to csv
+    with profiler.span("save datapackage"):
+        save_datapackage(edp, destination, cache, valid)
+
+        logger.info(f"Saved datapackage to '{destination}'.")
+
+        if "scalars" in valid:
+            cache.restore(additional_scalars_file, destination)
+        else:
+            remove_file(os.path.join(destination, additional_scalars_file))
+            save_additional_scalars(
+                additional_scalars=additional_scalars, destination=destination
+            )
+            if cache is not None:
+                cache.store(additional_scalars_file, destination)
+
+        logger.info(f"Saved additional_scalars to '{destination}'.")
+
+    # add metadata, unless the columns of all files are the same as in the last build
+    filename_metadata = config.settings.optimize.filename_metadata
+    if (
+        cache is None
+        or cache.schema_changed()
+        or not cache.restore(filename_metadata, destination)
+    ):
+        remove_file(os.path.join(destination, filename_metadata))
+
+        with profiler.span("infer metadata"):
+            edp.infer_metadata(foreign_keys_update=foreign_keys_update)
+
+        if cache is not None:
+            cache.store(filename_metadata, destination)
+
+    if cache is not None:
+        cache.save()
+
+
+def load_shared_inputs(all_scenario_specs, profiler):
+    r"""
+    Loads the inputs of all scenarios once.
+
+    Parameters
+    ----------
+    all_scenario_specs : list
+        Scenario specifications
+    profiler : oemof_b3.tools.timing.Profiler
+        Profiler that records the loading
+
+    Returns
+    -------
+    shared : SharedInputs
+    """
+    shared = SharedInputs()
+
+    for scenario_specs in all_scenario_specs:
+        regions = get_model_structure(scenario_specs["model_structure"])["regions"]
+
+        shared.get_scalars(scenario_specs["paths_scalars"], regions, profiler)
+        shared.get_timeseries(scenario_specs["paths_timeseries"], profiler)
+
+    return shared
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = shared
+
+
+def _build(args):
+    r"""
+    Builds the datapackage of one scenario with the shared inputs of the process.
+    """
+    scenario_specs, destination = args
+
+    with Profiler(
+        "build_datapackage",
+        os.path.dirname(os.path.normpath(destination)),
+        logger=logger.info,
+    ) as profiler:
+        build_datapackage(scenario_specs, destination, profiler, shared=_shared)
+
+    return destination
+
+
+def build_all(builds, shared, jobs=1):
+    r"""
+    Builds datapackages with shared inputs.
+
+    Parameters
+    ----------
+    builds : iterable
+        Tuples of scenario specifications and destination, e.g. a generator
+    shared : SharedInputs
+        Inputs shared by all builds
+    jobs : int
+        Number of processes
+
+    Returns
+    -------
+    destinations : list
+        Destinations of the built datapackages
+    """
+    if jobs > 1:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(shared,)
+        ) as executor:
+            return list(executor.map(_build, builds))
+
+    _init_worker(shared)
+    return [_build(build) for build in builds]
@@ -1,8 +1,12 @@
+import os
+
+import numpy as np
 import pandas as pd
 
+from oemof_b3.tools.hashing import hash_file, hash_object
+
 try:
     import geopandas as gpd
-    from shapely.geometry import Point
 
 except ImportError:
     raise ImportError(
@@ -53,6 +57,164 @@ def filter_regions_file(de, regions):
     return de_regions
 
 
+def get_cache_path(file_path, regions, cache_dir):
+    r"""
+    Returns the path of the cached regions of `file_path` filtered by `regions`. The path
+    changes with the content of `file_path`, the regions and the version of geopandas.
+    """
+    key = hash_object(
+        [hash_file(file_path), sorted(regions) if regions else None, gpd.__version__]
+    )
+
+    return os.path.join(cache_dir, f"regions_{key}.parquet")
+
+
+def load_regions(file_path, regions=None, cache_dir=None):
+    r"""
+    Loads a geopackage containing all regions of Germany, optionally filtered by `regions`.
+    If `cache_dir` is given, the (filtered) regions are cached there as GeoParquet file and
+    reused as long as the geopackage and the regions do not change. Caching requires pyarrow.
+
+    Parameters
+    ---------------
+    'file_path' : string
+        Path to geopackage containing geoinformation for all regions in Germany
+    'regions': list
+        List with the names of the regions by which the GeoDataFrame shall be filtered
+    'cache_dir' : string
+        Directory of the cache
+
+    Returns
+    ----------
+    geopandas.GeoDataFrame
+        Geoinformation of (desired) regions in Germany
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = get_cache_path(file_path, regions, cache_dir)
+
+        if os.path.exists(cache_path):
+            return gpd.read_parquet(cache_path)
+
+    regions_file = load_regions_file(file_path)
+
+    if regions is not None:
+        regions_file = filter_regions_file(regions_file, regions)
+
+    if cache_path is not None:
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        regions_file.to_parquet(cache_path)
+
+    return regions_file
+
+
+def get_points(register, crs=None):
+    r"""
+    Returns the coordinates of a register as points.
+
+    Parameters
+    ---------------
+    'register': pandas.DataFrame
+        DataFrame with columns lat, lon
+    'crs':
+        Coordinate reference system the points are transformed to. Default: None (EPSG:4326)
+
+    Returns
+    --------------
+    geopandas.GeoSeries
+        Points with the index of `register`
+    """
+    points = gpd.GeoSeries(
+        gpd.points_from_xy(register.lon, register.lat),
+        index=register.index,
+        crs=4326,
+    )
+
+    if crs is not None and not points.crs.equals(crs):
+        points = points.to_crs(crs)
+
+    return points
+
+
+class RegionIndex:
+    r"""
+    Regions with a spatial index (STRtree), that is built once and reused to assign points to
+    the regions they lie in, e.g. for several registers.
+
+    Parameters
+    ---------------
+    'regions': geopandas.GeoDataFrame
+        GeoDataFrame with rows for the specific regions
+    """
+
+    def __init__(self, regions):
+        self.regions = regions
+        self.sindex = regions.sindex
+
+    def locate(self, points):
+        r"""
+        Finds the regions the points lie in.
+
+        Parameters
+        ---------------
+        'points': geopandas.GeoSeries
+            Points, see :func:`get_points`
+
+        Returns
+        --------------
+        tuple of numpy.ndarray
+            Positions of points and of the regions they lie in, ordered by point
+        """
+        if hasattr(self.sindex, "query_bulk"):
+            query = self.sindex.query_bulk
+        else:
+            query = self.sindex.query
+
+        point_pos, region_pos = query(points.values, predicate="within")
+
+        order = np.argsort(point_pos, kind="stable")
+
+        return point_pos[order], region_pos[order]
+
+    def add_region_to_register(self, register):
+        r"""
+        Adds the region to a power plant. Points outside all regions are dropped.
+
+        Parameters
+        ---------------
+        'register': pandas.DataFrame
+            DataFrame with columns lat, lon
+
+        Returns
+        --------------
+        pandas.DataFrame
+            DataFrame with new column 'name' containing the region name, the other columns of
+            the regions, the index of the region in column 'index_right' and the points in
+            column 'coordinates' (EPSG:4326)
+        """
+        points = get_points(register)
+
+        # The points are located in the coordinate reference system of the regions, but
+        # returned in EPSG:4326
+        located = points
+        if self.regions.crs is not None and not points.crs.equals(self.regions.crs):
+            located = points.to_crs(self.regions.crs)
+
+        point_pos, region_pos = self.locate(located)
+
+        new_register = register.iloc[point_pos].copy()
+        new_register["coordinates"] = points.iloc[point_pos].values
+
+        region_data = pd.DataFrame(
+            self.regions.drop(columns=self.regions.geometry.name)
+        ).iloc[region_pos]
+        region_data.index = new_register.index
+        region_data.insert(0, "index_right", self.regions.index[region_pos])
+
+        return new_register.join(region_data, lsuffix="_left", rsuffix="_right")
+
+
 def add_region_to_register(register, regions):
     r"""
     Adds the region to a power plant.
@@ -61,20 +223,16 @@ def add_region_to_register(register, regions):
     ---------------
     'register': pandas.DataFrame
         DataFrame with columns lat, lon
-    'region': geopandas.GeoDataFrame
-        GeoDataFrame with rows for the specific regions
+    'region': geopandas.GeoDataFrame or RegionIndex
+        GeoDataFrame with rows for the specific regions. Pass a :class:`RegionIndex` to reuse
+        its spatial index for several registers.
 
     Returns
     --------------
     pandas.DataFrame
         DataFrame with new column 'name' containing the region name
     """
-    # transform the lat/lon coordinates into a shapely point coordinates and
-    # add column named "coordinates"
-    register["coordinates"] = list(zip(register.lon, register.lat))
-    register["coordinates"] = register["coordinates"].apply(Point)
-    register_gdf = gpd.GeoDataFrame(register, geometry="coordinates", crs=4326)
-    new_register_gdf = gpd.sjoin(register_gdf, regions, predicate="within")
-    new_register = pd.DataFrame(new_register_gdf)
-
-    return new_register
+    if not isinstance(regions, RegionIndex):
+        regions = RegionIndex(regions)
+
+    return regions.add_region_to_register(register)
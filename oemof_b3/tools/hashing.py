@@ -0,0 +1,29 @@
+# coding: utf-8
+r"""
+This module contains functions that hash files and objects, e.g. to detect changed inputs of
+cached results.
+"""
+import hashlib
+import json
+
+
+def hash_file(path, chunk_size=2**20):
+    r"""
+    Returns the sha1 hash of the content of a file.
+    """
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            sha1.update(chunk)
+
+    return sha1.hexdigest()
+
+
+def hash_object(obj):
+    r"""
+    Returns the sha1 hash of a json serializable object, e.g. a dict of settings. Objects
+    that cannot be serialized are hashed by their string representation.
+    """
+    return hashlib.sha1(
+        json.dumps(obj, sort_keys=True, default=str).encode()
+    ).hexdigest()
@@ -1,4 +1,5 @@
 import json
+import time
 
 import pandas as pd
 
@@ -71,10 +72,94 @@ def get_suitable_metadata_template(data):
     return metadata
 
 
+def get_n_rows(name, con, schema=None):
+    r"""
+    Returns the number of rows in a table, 0 if it does not exist.
+
+    Parameters
+    ----------
+    name : str
+        Name of the table
+    con : sqlalchemy.engine.(Engine or Connection) or sqlite3.Connection
+    schema : str
+        Database schema
+
+    Returns
+    -------
+    n_rows : int
+    """
+    if not pd.io.sql.has_table(name, con, schema=schema):
+        return 0
+
+    table = f'"{schema}"."{name}"' if schema else f'"{name}"'
+
+    return int(pd.read_sql(f"SELECT COUNT(*) AS n_rows FROM {table}", con).iloc[0, 0])
+
+
+def get_uploaded_ids(name, con, id_column, schema=None):
+    r"""
+    Returns the ids of the rows in a table, None if it does not exist.
+
+    Parameters
+    ----------
+    name : str
+        Name of the table
+    con : sqlalchemy.engine.(Engine or Connection) or sqlite3.Connection
+    id_column : str
+        Name of the id column
+    schema : str
+        Database schema
+
+    Returns
+    -------
+    ids : pd.Series
+    """
+    if not pd.io.sql.has_table(name, con, schema=schema):
+        return None
+
+    table = f'"{schema}"."{name}"' if schema else f'"{name}"'
+
+    return pd.read_sql(f'SELECT "{id_column}" FROM {table}', con)[id_column]
+
+
+def get_n_resumable_rows(df, uploaded_ids, id_column):
+    r"""
+    Returns the number of rows of an earlier upload of df, i.e. of the ids in the table, if
+    these are exactly the ids of the first rows of df. Returns None otherwise.
+    """
+    if uploaded_ids is None:
+        return 0
+
+    n_rows = len(uploaded_ids)
+
+    if n_rows > len(df):
+        return None
+
+    uploaded = sorted(str(id) for id in uploaded_ids)
+    expected = sorted(str(id) for id in df[id_column].iloc[:n_rows])
+
+    return n_rows if uploaded == expected else None
+
+
 def upload_df_to_oep_table(
-    df, name, con, schema, logger, if_exists="append", index=False
+    df,
+    name,
+    con,
+    schema,
+    logger,
+    if_exists="append",
+    index=False,
+    chunksize=None,
+    retries=None,
+    retry_wait=None,
+    resume=False,
+    id_column=None,
 ):
     r"""
+    Uploads data to a table in chunks. Each chunk is written with a single multi-row insert
+    in its own transaction, so that a failed chunk leaves no partial rows and an interrupted
+    upload can be resumed from the last committed chunk.
+
     Parameters
     ----------
     df : pd.DataFrame
@@ -87,35 +172,108 @@ def upload_df_to_oep_table(
     logger : logger
         Logger
     if_exists : str, default=append
+        Applies to the first chunk, the following chunks are appended.
     index: boolean, default=False
+    chunksize : int
+        Number of rows per chunk. Default: *upload_results_to_oep.chunksize* in settings.yaml
+    retries : int
+        Number of retries of a failed chunk. Default: *upload_results_to_oep.retries*
+    retry_wait : float
+        Seconds to wait before the first retry, doubled with each retry.
+        Default: *upload_results_to_oep.retry_wait*
+    resume : bool
+        If True and the ids in the table are the ids of the first rows of df, e.g. from an
+        earlier, interrupted upload, these rows are skipped. Otherwise nothing is uploaded.
+    id_column : str
+        Column of df with a unique id of each row, used to resume. Default: the id column of
+        b3 scalars or timeseries ('id_scal' or 'id_ts').
 
     Returns
     -------
-    None
+    n_uploaded : int
+        Number of rows in the table that stem from df
     """
-    try:
-        df.to_sql(
-            name=name,
-            con=con,
-            schema=schema,
-            if_exists=if_exists,
-            index=index,
-        )
+    settings = config.settings.upload_results_to_oep
 
-        logger.info("Inserted data to " + schema + "." + name)
+    chunksize = chunksize or settings.chunksize
+    retries = settings.retries if retries is None else retries
+    retry_wait = settings.retry_wait if retry_wait is None else retry_wait
 
-    except Exception as e:
-        logger.error(e)
-        logger.error("Writing to " + name + " failed!")
-        logger.error(
-            "Note that you cannot load the same data into the table twice."
-            " There will be an id conflict."
-        )
-        logger.error(
-            "Delete and recreate with the commands above, if you want to test your"
-            " upload again."
+    n_uploaded = 0
+
+    if resume:
+        if id_column is None:
+            id_columns = [
+                config.settings.general.scal_index_name,
+                config.settings.general.ts_index_name,
+            ]
+            id_column = next((col for col in id_columns if col in df.columns), None)
+
+        if id_column is None:
+            logger.error(f"Cannot resume upload to {name}, the data has no id column.")
+            return 0
+
+        n_uploaded = get_n_resumable_rows(
+            df, get_uploaded_ids(name, con, id_column, schema), id_column
         )
 
+        if n_uploaded is None:
+            logger.error(
+                f"Cannot resume upload to {name}, the ids in the table are not those of the "
+                f"first rows of the data ({len(df)} rows). Delete and recreate the table to "
+                "upload the data again."
+            )
+            return 0
+
+    if n_uploaded > 0:
+        logger.info(f"Resuming upload to {name} after {n_uploaded} rows.")
+
+    while n_uploaded < len(df):
+        chunk = df.iloc[n_uploaded : n_uploaded + chunksize]
+
+        for attempt in range(retries + 1):
+            try:
+                chunk.to_sql(
+                    name=name,
+                    con=con,
+                    schema=schema,
+                    if_exists=if_exists if n_uploaded == 0 else "append",
+                    index=index,
+                    method="multi",
+                )
+                break
+
+            except Exception as e:
+                if attempt < retries:
+                    wait = retry_wait * 2**attempt
+                    logger.warning(
+                        f"Writing rows {n_uploaded} to {n_uploaded + len(chunk)} to {name} "
+                        f"failed: {e}. Retrying in {wait} s."
+                    )
+                    time.sleep(wait)
+                    continue
+
+                logger.error(e)
+                logger.error(
+                    f"Writing to {name} failed after {n_uploaded} of {len(df)} rows!"
+                )
+                logger.error(
+                    "Note that you cannot load the same data into the table twice."
+                    " There will be an id conflict."
+                )
+                logger.error(
+                    "Resume the upload with 'resume=True' or delete and recreate the"
+                    " table with the commands above, if you want to test your upload"
+                    " again."
+                )
+                return n_uploaded
+
+        n_uploaded += len(chunk)
+
+        logger.info(f"Inserted {n_uploaded} of {len(df)} rows to {schema}.{name}")
+
+    return n_uploaded
+
 
 def download_table_from_OEP(output_filename, table, schema):
     table_url = f"{OEP_HOST}/api/v0/schema/{schema}/tables/{table}/rows?form=csv"
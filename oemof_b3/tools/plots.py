@@ -1,5 +1,12 @@
+import hashlib
+import json
 import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import oemoflex.tools.plots as plots
@@ -7,8 +14,9 @@ import pandas as pd
 from oemoflex.tools.plots import plot_grouped_bar
 
 from oemof_b3.config import config
-from oemof_b3.config.config import COLORS, LABELS, load_yaml
+from oemof_b3.config.config import COLORS, LABELS
 from oemof_b3.tools import data_processing as dp
+from oemof_b3.tools.scenarios import scenario_registry
 
 logger = config.add_snake_logger("data_processing")
 
@@ -16,6 +24,442 @@ MW_TO_W = 1e6
 IGNORE_DROP_LEVEL = config.settings.plot_scalar_results.ignore_drop_level
 
 
+def get_n_jobs(argv=None):
+    r"""
+    Returns the number of processes for rendering plots. Reads the command line argument
+    ``--jobs <n>`` if given, otherwise ``config.settings.plot_jobs.jobs``.
+    """
+    argv = sys.argv if argv is None else argv
+
+    if "--jobs" in argv:
+        return int(argv[argv.index("--jobs") + 1])
+
+    return config.settings.plot_jobs.jobs
+
+
+def _update_hash(hash_obj, obj, hashed_frames):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        # Hashing frames is the expensive part, so it is done once per object
+        if id(obj) not in hashed_frames:
+            frame_hash = hashlib.sha1(
+                pd.util.hash_pandas_object(obj, index=True).values.tobytes()
+            )
+            columns = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+            frame_hash.update(repr(list(columns)).encode())
+            hashed_frames[id(obj)] = frame_hash.digest()
+        hash_obj.update(hashed_frames[id(obj)])
+
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _update_hash(hash_obj, item, hashed_frames)
+
+    elif isinstance(obj, dict):
+        for key, value in sorted(obj.items()):
+            hash_obj.update(repr(key).encode())
+            _update_hash(hash_obj, value, hashed_frames)
+
+    else:
+        hash_obj.update(repr(obj).encode())
+
+
+def _init_plot_worker():
+    matplotlib.use("Agg")
+
+
+def _render_plot_job(job):
+    r"""
+    Renders a plot job and closes all figures afterwards. Returns the paths of the files written
+    by the job.
+    """
+    func, args, kwargs = job
+
+    outputs = func(*args, **kwargs)
+
+    plt.close("all")
+
+    if outputs is None:
+        return []
+    if isinstance(outputs, str):
+        return [outputs]
+    return list(outputs)
+
+
+class PlotScheduler:
+    r"""
+    Collects plot jobs and renders them with the non-interactive Agg backend, in a process pool
+    if more than one job is allowed.
+
+    A plot job is a function that gets all data it needs as arguments and returns the path(s)
+    of the file(s) it has written. Snakemake removes directory outputs before running a rule, so
+    the hashes of the arguments and copies of the rendered files are kept outside the target
+    directory. Jobs whose arguments have not changed since the last run are not rendered again,
+    their files are copied back to the target directory instead.
+
+    Parameters
+    ----------
+    target : str
+        Directory the plots are saved to
+    hash_dir : str
+        Directory of the results the plots belong to, e.g. ``results/{scenario}``. The hashes
+        are saved to ``<hash_dir>/<plot_jobs.hash_dir_name>/<name of target>.json``, the
+        copies of the files to the directory ``<name of target>`` next to it.
+    n_jobs : int
+        Number of processes. Default: :func:`get_n_jobs`
+    """
+
+    def __init__(self, target, hash_dir, n_jobs=None):
+        self.target = target
+        self.n_jobs = n_jobs or get_n_jobs()
+        self.files_dir = os.path.join(
+            hash_dir,
+            config.settings.plot_jobs.hash_dir_name,
+            os.path.basename(os.path.normpath(target)),
+        )
+        self.hash_file = self.files_dir + ".json"
+        self.jobs = {}
+
+    def add(self, name, func, *args, **kwargs):
+        r"""
+        Adds a job with a unique name that calls func(*args, **kwargs).
+        """
+        if name in self.jobs:
+            raise ValueError(f"There is already a plot job named '{name}'.")
+
+        self.jobs[name] = (func, args, kwargs)
+
+    def _load_hashes(self):
+        if not os.path.exists(self.hash_file):
+            return {}
+
+        with open(self.hash_file, "r") as f:
+            return json.load(f)
+
+    def _save_hashes(self, hashes):
+        os.makedirs(os.path.dirname(self.hash_file), exist_ok=True)
+
+        with open(self.hash_file, "w") as f:
+            json.dump(hashes, f, indent=2)
+
+    def _get_copies(self, name, outputs):
+        r"""Returns the paths of the copies of the files of job ``name``"""
+        return [
+            os.path.join(self.files_dir, name, os.path.relpath(path, self.target))
+            for path in outputs
+        ]
+
+    def _keep(self, name, outputs):
+        r"""Replaces the copies of the files of job ``name`` by the files ``outputs``"""
+        job_dir = os.path.join(self.files_dir, name)
+        if os.path.exists(job_dir):
+            shutil.rmtree(job_dir)
+
+        for path, copy in zip(outputs, self._get_copies(name, outputs)):
+            os.makedirs(os.path.dirname(copy), exist_ok=True)
+            shutil.copyfile(path, copy)
+
+    def _restore(self, name, outputs):
+        r"""
+        Copies the kept files of job ``name`` to ``outputs``. Returns False if a copy is missing.
+        """
+        copies = self._get_copies(name, outputs)
+        if not all(os.path.exists(copy) for copy in copies):
+            return False
+
+        for copy, path in zip(copies, outputs):
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                shutil.copyfile(copy, path)
+
+        return True
+
+    def run(self):
+        r"""
+        Renders all jobs that are not up to date.
+        """
+        matplotlib.use("Agg")
+
+        hashes = self._load_hashes()
+        hashed_frames = {}
+
+        to_render = {}
+        for name, (func, args, kwargs) in self.jobs.items():
+            job_hash = hashlib.sha1(f"{func.__module__}.{func.__qualname__}".encode())
+            _update_hash(job_hash, [args, kwargs], hashed_frames)
+            job_hash = job_hash.hexdigest()
+
+            recorded = hashes.get(name, {})
+            if (
+                recorded.get("hash") == job_hash
+                and recorded.get("outputs")
+                and self._restore(name, recorded["outputs"])
+            ):
+                logger.info(f"Skipping plot job '{name}', its data has not changed.")
+                continue
+
+            to_render[name] = job_hash
+
+        jobs = [self.jobs[name] for name in to_render]
+
+        if self.n_jobs > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.n_jobs, initializer=_init_plot_worker
+            ) as executor:
+                all_outputs = list(executor.map(_render_plot_job, jobs))
+        else:
+            all_outputs = [_render_plot_job(job) for job in jobs]
+
+        for (name, job_hash), outputs in zip(to_render.items(), all_outputs):
+            # Jobs that did not write anything are rendered again next time
+            if outputs:
+                self._keep(name, outputs)
+                hashes[name] = {"hash": job_hash, "outputs": outputs}
+            else:
+                hashes.pop(name, None)
+
+        self._save_hashes(hashes)
+
+        logger.info(
+            f"Rendered {len(jobs)} plot jobs, skipped {len(self.jobs) - len(jobs)}."
+        )
+
+
+def _get_minmax_indices(values, n_buckets):
+    r"""
+    Returns the positions of the minimum and maximum of each column in each of n_buckets
+    buckets of equal length, together with the first and last position.
+    """
+    n_rows, n_cols = values.shape
+    bucket_size = int(np.ceil(n_rows / n_buckets))
+    n_buckets = int(np.ceil(n_rows / bucket_size))
+
+    # Repeat the last row so that all buckets have the same length
+    padded = np.pad(
+        values, ((0, n_buckets * bucket_size - n_rows), (0, 0)), mode="edge"
+    )
+    buckets = padded.reshape(n_buckets, bucket_size, n_cols)
+
+    offset = (np.arange(n_buckets) * bucket_size)[:, np.newaxis]
+    indices = np.concatenate(
+        [
+            (buckets.argmin(axis=1) + offset).ravel(),
+            (buckets.argmax(axis=1) + offset).ravel(),
+            [0, n_rows - 1],
+        ]
+    )
+
+    return np.unique(np.clip(indices, 0, n_rows - 1))
+
+
+def _get_lttb_indices(y, n_out):
+    r"""
+    Returns the positions of the points selected by the Largest-Triangle-Three-Buckets
+    algorithm (Steinarsson 2013) to represent y with n_out points.
+    """
+    n = len(y)
+
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last point are kept, the points in between are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+
+        # Average point of the next bucket, which is the last point for the last bucket
+        next_start, next_stop = (
+            (edges[i + 1], edges[i + 2]) if i < n_out - 3 else (n - 1, n)
+        )
+        avg_x = (next_start + next_stop - 1) / 2
+        avg_y = y[next_start:next_stop].mean()
+
+        x = np.arange(start, stop)
+        area = np.abs(
+            (selected - avg_x) * (y[start:stop] - y[selected])
+            - (selected - x) * (avg_y - y[selected])
+        )
+
+        selected = start + area.argmax()
+        indices[i + 1] = selected
+
+    return indices
+
+
+def downsample_timeseries(df, method=None, n_points=None, rule=None):
+    r"""
+    Reduces the number of time steps of a DataFrame with one time series per column before
+    plotting.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Time series with DatetimeIndex
+    method : str or None
+        * None: No downsampling.
+        * 'minmax': Keeps the time steps with the minimum and maximum of each column in
+          buckets of equal length, with as many buckets as fit into n_points.
+        * 'lttb': Keeps n_points time steps selected by Largest-Triangle-Three-Buckets based
+          on the sum of the absolute values of all columns.
+        * 'mean': Aggregates to periods of length ``rule`` by their mean.
+    n_points : int
+        Maximum number of time steps to reduce to. Not used by 'mean'.
+    rule : str
+        Offset alias of the periods, e.g. 'D' or '6H'. Only used by 'mean'.
+
+    Returns
+    -------
+    df_downsampled : pd.DataFrame
+    """
+    if method is None or df.empty:
+        return df
+
+    if method == "mean":
+        return df.resample(rule).mean()
+
+    if method not in ["minmax", "lttb"]:
+        raise ValueError(
+            f"Method '{method}' is not one of None, 'minmax', 'lttb' or 'mean'."
+        )
+
+    if len(df) <= n_points:
+        return df
+
+    values = np.nan_to_num(df.to_numpy(dtype=float))
+
+    if method == "minmax":
+        # Each bucket contributes up to two time steps per column
+        indices = _get_minmax_indices(
+            values, max((n_points - 2) // (2 * values.shape[1]), 1)
+        )
+    else:
+        indices = _get_lttb_indices(np.abs(values).sum(axis=1), n_points)
+
+    return df.iloc[indices]
+
+
+def downsample_dispatch_data(df, df_demand, **kwargs):
+    r"""
+    Downsamples dispatch data and demand with the same time steps, see
+    :func:`downsample_timeseries`. Defaults to the settings in
+    ``config.settings.plot_dispatch.downsample``.
+    """
+    kwargs = {**config.settings.plot_dispatch.downsample, **kwargs}
+
+    if kwargs.get("method") == "mean":
+        return downsample_timeseries(df, **kwargs), downsample_timeseries(
+            df_demand, **kwargs
+        )
+
+    index = downsample_timeseries(pd.concat([df, df_demand], axis=1), **kwargs).index
+
+    return df.loc[index], df_demand.loc[index]
+
+
+def _get_trace_data(trace):
+    x = pd.DatetimeIndex(trace.x).strftime("%Y-%m-%d %H:%M:%S").tolist()
+    y = [None if pd.isna(value) else float(value) for value in trace.y]
+    return {"x": x, "y": y}
+
+
+# Fetches the full resolution data on the first zoom and swaps in the data of the visible
+# range, scaled down to n_points by taking every n-th point. Restores the coarse data on
+# autoscale.
+MULTI_RESOLUTION_SCRIPT = """
+var gd = document.getElementById('{plot_id}');
+var full = null;
+var coarse = gd.data.map(function(trace) {
+    return {x: trace.x, y: trace.y};
+});
+var nPoints = N_POINTS;
+function getFull() {
+    if (full === null) {
+        full = fetch(FULL_DATA_URL).then(function(response) {return response.json();});
+    }
+    return full;
+}
+function restyle(traces) {
+    Plotly.restyle(
+        gd,
+        {x: traces.map(function(t) {return t.x;}), y: traces.map(function(t) {return t.y;})}
+    );
+}
+gd.on('plotly_relayout', function(event) {
+    var start = event['xaxis.range[0]'];
+    var stop = event['xaxis.range[1]'];
+    if (start !== undefined && stop !== undefined) {
+        getFull().then(function(data) {
+            restyle(data.map(function(trace) {
+                var x = [], y = [];
+                for (var i = 0; i < trace.x.length; i++) {
+                    if (trace.x[i] >= start && trace.x[i] <= stop) {
+                        x.push(trace.x[i]);
+                        y.push(trace.y[i]);
+                    }
+                }
+                var step = Math.max(1, Math.ceil(x.length / nPoints));
+                return {
+                    x: x.filter(function(_, i) {return i % step === 0;}),
+                    y: y.filter(function(_, i) {return i % step === 0;})
+                };
+            }));
+        });
+    } else if (event['xaxis.autorange']) {
+        restyle(coarse);
+    }
+});
+"""
+
+
+def write_multi_resolution_html(fig_coarse, fig_full, file, n_points, **kwargs):
+    r"""
+    Writes a plotly figure to html that initially shows the downsampled data of fig_coarse.
+    The data of fig_full is written to a json file next to the html file, which is fetched
+    and shown when zooming in. Both figures have to be created by the same function to have
+    the same traces.
+
+    Browsers only fetch the json file if the html file is served over http(s). If it is
+    opened as a local file, the request is blocked and the downsampled data is shown.
+
+    Parameters
+    ----------
+    fig_coarse : plotly.graph_objects.Figure
+        Figure with downsampled data
+    fig_full : plotly.graph_objects.Figure
+        Figure with full resolution data
+    file : str
+        Path of the html file
+    n_points : int
+        Maximum number of points per trace shown when zooming in
+    kwargs : Additional keyword arguments
+        Passed to ``write_html``
+
+    Returns
+    -------
+    data_file : str
+        Path of the json file with the full resolution data
+    """
+    if len(fig_coarse.data) != len(fig_full.data):
+        raise ValueError("The coarse and the full figure must have the same traces.")
+
+    data_file = os.path.splitext(file)[0] + "_full.json"
+
+    with open(data_file, "w") as f:
+        json.dump([_get_trace_data(trace) for trace in fig_full.data], f)
+
+    post_script = MULTI_RESOLUTION_SCRIPT.replace("N_POINTS", str(n_points)).replace(
+        "FULL_DATA_URL", json.dumps(os.path.basename(data_file))
+    )
+
+    fig_coarse.write_html(file=file, post_script=post_script, **kwargs)
+
+    return data_file
+
+
 def aggregate_regions(df):
     # This function is here only to set the "name" after aggregation
     # With further refactoring, it could be dropped and the
@@ -31,15 +475,12 @@ def aggregate_regions(df):
 
 def set_scenario_labels(df):
     """Replaces scenario name with scenario label if possible"""
+    labels = {
+        scenario: scenario_registry.get_label(scenario)
+        for scenario in df.index.unique()
+    }
 
-    def get_scenario_label(scenario):
-        try:
-            scenario_settings = load_yaml(f"scenarios/{scenario}.yml")
-        except FileNotFoundError:
-            return scenario
-        return scenario_settings.get("label", scenario)
-
-    df.index = df.index.map(get_scenario_label)
+    df.index = df.index.map(labels)
     return df
 
 
@@ -0,0 +1,288 @@
+# coding: utf-8
+r"""
+This module contains a presolve that removes components from an oemof.solph.EnergySystem
+which provably have no flows, e.g. technologies with zero capacity that are not expandable,
+before an oemof.solph.Model is built from it. Buses without any remaining flows are removed
+as well.
+
+After solving, the removed flows are restored in the EnergySystem and added to the results
+with zero values, so that the results have the same shape as without presolve.
+"""
+import pandas as pd
+from oemof.solph import EnergySystem
+from oemof.solph.buses import Bus
+from oemof.solph.components import (
+    Converter,
+    ExtractionTurbineCHP,
+    GenericStorage,
+    Link,
+    Sink,
+    Source,
+)
+
+from oemof_b3.config import config
+
+logger = config.add_snake_logger("presolve")
+
+
+def _is_zero(values, n_timesteps):
+    r"""Checks if a scalar or sequence is zero in all timesteps"""
+    return all(values[t] == 0 for t in range(n_timesteps))
+
+
+def _is_positive(values, n_timesteps):
+    r"""Checks if a scalar or sequence is positive in all timesteps"""
+    return all(values[t] > 0 for t in range(n_timesteps))
+
+
+def is_zero_flow(flow, n_timesteps):
+    r"""
+    Checks if a flow is bounded to zero, i.e. if it has a nominal value of zero, a maximum or
+    fixed value of zero in all timesteps and no investment.
+
+    Parameters
+    ----------
+    flow : oemof.solph.Flow
+        Flow to check
+    n_timesteps : int
+        Number of timesteps
+
+    Returns
+    -------
+    bool
+    """
+    if flow.investment is not None or flow.nominal_value is None:
+        return False
+
+    if flow.nominal_value == 0 or _is_zero(flow.max, n_timesteps):
+        return True
+
+    return flow.fix[0] is not None and _is_zero(flow.fix, n_timesteps)
+
+
+def _get_zero_flows_of_converter(node, zero_flows, n_timesteps):
+    r"""
+    Returns the flows of a Converter that are zero. Each input and output are linked by
+    positive conversion factors, so that one zero flow forces all flows to be zero.
+    """
+    flows = [(i, node) for i in node.inputs] + [(node, o) for o in node.outputs]
+
+    if not any(flow in zero_flows for flow in flows):
+        return set()
+
+    if not all(
+        _is_positive(node.conversion_factors[bus], n_timesteps)
+        for bus in list(node.inputs) + list(node.outputs)
+    ):
+        return set()
+
+    return set(flows)
+
+
+def _get_zero_flows_of_link(node, zero_flows, n_timesteps):
+    r"""
+    Returns the input flows of a Link whose output flow is zero and linked by a positive
+    conversion factor.
+    """
+    return {
+        (i, node)
+        for (i, o), conversion_factor in node.conversion_factors.items()
+        if (node, o) in zero_flows and _is_positive(conversion_factor, n_timesteps)
+    }
+
+
+def is_inactive(node, zero_flows, n_timesteps):
+    r"""
+    Checks if all flows of a node are zero. Storages need to have a storage capacity of zero
+    and no investment in addition. Only sources, sinks, converters (except extraction
+    turbines), links and storages are considered, other nodes are never inactive.
+
+    Parameters
+    ----------
+    node : oemof.network.Node
+        Node to check
+    zero_flows : set
+        Tuples (input, output) of the flows that are zero
+    n_timesteps : int
+        Number of timesteps
+
+    Returns
+    -------
+    bool
+    """
+    if isinstance(node, ExtractionTurbineCHP) or not isinstance(
+        node, (Source, Sink, Converter, Link, GenericStorage)
+    ):
+        return False
+
+    zero_flows = set(zero_flows)
+
+    if isinstance(node, Converter):
+        zero_flows |= _get_zero_flows_of_converter(node, zero_flows, n_timesteps)
+
+    elif isinstance(node, Link):
+        zero_flows |= _get_zero_flows_of_link(node, zero_flows, n_timesteps)
+
+    elif isinstance(node, GenericStorage):
+        if node.investment is not None or node.nominal_storage_capacity != 0:
+            return False
+
+    flows = [(i, node) for i in node.inputs] + [(node, o) for o in node.outputs]
+
+    return bool(flows) and all(flow in zero_flows for flow in flows)
+
+
+def get_inactive_nodes(es):
+    r"""
+    Returns the components of an EnergySystem that provably have no flows and the buses that
+    are only connected to them.
+
+    Parameters
+    ----------
+    es : oemof.solph.EnergySystem
+        Energy system
+
+    Returns
+    -------
+    inactive : list
+        Inactive nodes
+    """
+    n_timesteps = len(es.timeincrement)
+
+    zero_flows = {
+        flow for flow, values in es.flows().items() if is_zero_flow(values, n_timesteps)
+    }
+
+    inactive = [node for node in es.nodes if is_inactive(node, zero_flows, n_timesteps)]
+    removed = set(inactive)
+
+    for node in es.nodes:
+        if not isinstance(node, Bus):
+            continue
+
+        neighbours = set(node.inputs) | set(node.outputs)
+        if neighbours and neighbours.issubset(removed):
+            inactive.append(node)
+
+    return inactive
+
+
+def prune_energysystem(es):
+    r"""
+    Removes inactive components and unused buses from an EnergySystem, see
+    :func:`get_inactive_nodes`. The nodes of ``es`` are disconnected from the removed nodes, call
+    :func:`restore_energysystem` to reconnect them.
+
+    Parameters
+    ----------
+    es : oemof.solph.EnergySystem
+        Energy system
+
+    Returns
+    -------
+    pruned : oemof.solph.EnergySystem
+        Energy system with the active nodes of ``es``
+    removed_nodes : list
+        Removed nodes
+    removed_flows : dict
+        Removed flows by (input, output)
+    """
+    removed_nodes = get_inactive_nodes(es)
+
+    removed_flows = {}
+    for node in removed_nodes:
+        for i in list(node.inputs):
+            removed_flows[(i, node)] = node.inputs[i]
+            del i.outputs[node]
+        for o in list(node.outputs):
+            removed_flows[(node, o)] = node.outputs[o]
+            del node.outputs[o]
+
+    removed = set(removed_nodes)
+
+    pruned = EnergySystem(
+        timeindex=es.timeindex,
+        infer_last_interval=False,
+        periods=es.periods,
+        temporal=es.temporal,
+    )
+    pruned.timeincrement = es.timeincrement
+    pruned.add(*[node for node in es.nodes if node not in removed])
+
+    if removed_nodes:
+        logger.info(
+            f"Removed {len(removed_nodes)} inactive nodes and {len(removed_flows)} flows "
+            f"before building the model: {[str(node) for node in removed_nodes]}."
+        )
+
+    return pruned, removed_nodes, removed_flows
+
+
+def restore_energysystem(removed_flows):
+    r"""
+    Reconnects the nodes that were disconnected by :func:`prune_energysystem`.
+
+    Parameters
+    ----------
+    removed_flows : dict
+        Removed flows by (input, output)
+    """
+    for (i, o), flow in removed_flows.items():
+        i.outputs[o] = flow
+
+
+def _get_zero_sequences(results, column, index):
+    r"""
+    Returns sequences with zeros in ``column`` shaped like those in the results, or with
+    ``index`` if no result has the column. Rows without values in the results, e.g. the last
+    timestep of flows, stay empty.
+    """
+    for result in results.values():
+        if column in result["sequences"].columns:
+            template = result["sequences"][[column]]
+            return template.where(template.isna(), 0.0)
+
+    return pd.DataFrame({column: 0.0}, index=index)
+
+
+def add_zero_results(results, removed_nodes, removed_flows, timeindex):
+    r"""
+    Adds zero flows of the removed flows and zero storage content of the removed storages to
+    results as given by :func:`oemof.solph.processing.results`.
+
+    Parameters
+    ----------
+    results : dict
+        Results of the pruned model
+    removed_nodes : list
+        Removed nodes
+    removed_flows : dict
+        Removed flows by (input, output)
+    timeindex : pd.DatetimeIndex
+        Time index of the energy system. Used if the results do not contain a flow.
+
+    Returns
+    -------
+    results : dict
+        Results with zero values of the removed flows and storages
+    """
+    flow = _get_zero_sequences(results, "flow", timeindex)
+
+    # The storage content has a value in each timestep, including the last one
+    storage_content = pd.DataFrame(
+        0.0,
+        index=flow.index,
+        columns=pd.Index(["storage_content"], name=flow.columns.name),
+    )
+
+    for key in removed_flows:
+        results[key] = {"scalars": pd.Series(dtype=float), "sequences": flow.copy()}
+
+    for node in removed_nodes:
+        if isinstance(node, GenericStorage):
+            results[(node, None)] = {
+                "scalars": pd.Series(dtype=float),
+                "sequences": storage_content.copy(),
+            }
+
+    return results
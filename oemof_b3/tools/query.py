@@ -0,0 +1,406 @@
+# coding: utf-8
+r"""
+This module contains the QueryEngine, which registers scalars and stacked timeseries in
+oemof_b3 format (csv or parquet files) as views of an in-process DuckDB database. Filters,
+aggregations and the selection of columns are executed by DuckDB on the files, so that only
+the result is loaded into memory and returned as pandas DataFrame.
+
+DuckDB is an optional dependency. Install it with ``poetry install -E query`` to use this module.
+"""
+import ast
+import numbers
+
+import pandas as pd
+
+from oemof_b3.config import config
+from oemof_b3.tools import data_processing as dp
+
+try:
+    import duckdb
+
+except ImportError:
+    raise ImportError(
+        "No module named 'duckdb'. You need to install 'duckdb' in order to use the query "
+        "engine. Please execute 'poetry install -E query' to install it. \nCheck also "
+        "our documentation if you are running into problems on "
+        "[`How to install duckdb`](https://oemof-b3.readthedocs.io/en/latest/getting_started.html#how-to-install-duckdb)"  # noqa: E501
+    )
+
+
+SCALARS = "scalars"
+
+TIMESERIES = "timeseries"
+
+KINDS = [SCALARS, TIMESERIES]
+
+# Columns that are kept when scalars are aggregated
+GROUPBY_SCAL = ["scenario_key", "carrier", "region", "tech", "type", "var_name"]
+
+
+def _quote(name):
+    r"""Quotes the name of a table or column for use in SQL"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _to_literal(value):
+    r"""Formats a string or list of strings as SQL literal"""
+    if isinstance(value, list):
+        return "[" + ", ".join(_to_literal(item) for item in value) + "]"
+
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _is_number(value):
+    r"""Checks if a filter value is a number, which is compared numerically"""
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def get_where(filters, inverse=False):
+    r"""
+    Formats filters given as keyword arguments like in
+    :func:`oemof_b3.tools.data_processing.multi_filter_df` to a SQL condition.
+
+    Like for the data loaded with :func:`oemof_b3.tools.data_processing.load_b3_scalars`,
+    numbers are compared numerically, e.g. 1 matches '1.0', and other values as text.
+
+    Parameters
+    ----------
+    filters : dict
+        Column names and value (or list of values) to select
+    inverse : bool
+        If True, the rows matching any filter are dropped.
+
+    Returns
+    -------
+    where : str
+        Condition with placeholders, empty if there are no filters
+    parameters : list
+        Values of the placeholders
+    """
+    conditions = []
+    parameters = []
+    for column, values in filters.items():
+        if not isinstance(values, list):
+            values = [values]
+
+        if not values:
+            conditions.append("false")
+            continue
+
+        numeric = [float(value) for value in values if _is_number(value)]
+        texts = [str(value) for value in values if not _is_number(value)]
+
+        condition = []
+        if texts:
+            placeholders = ", ".join("?" for _ in texts)
+            condition.append(f"{_quote(column)} IN ({placeholders})")
+            parameters.extend(texts)
+
+        if numeric:
+            placeholders = ", ".join("?" for _ in numeric)
+            condition.append(
+                f"TRY_CAST({_quote(column)} AS DOUBLE) IN ({placeholders})"
+            )
+            parameters.extend(numeric)
+
+        conditions.append(" OR ".join(condition))
+
+    if not conditions:
+        return "", parameters
+
+    where = " AND ".join(f"({condition})" for condition in conditions)
+
+    if inverse:
+        # Like filter_df, rows with missing values are not matched and thus kept
+        where = " AND ".join(f"({condition}) IS NOT TRUE" for condition in conditions)
+
+    return f"WHERE {where}", parameters
+
+
+class QueryEngine:
+    r"""
+    Queries scalars and stacked timeseries in oemof_b3 format without loading them into
+    memory first.
+
+    Files are registered as views under a name, e.g. all scalar results of several scenarios.
+    All columns are read as text, values are converted like in
+    :func:`oemof_b3.tools.data_processing.load_b3_scalars` and
+    :func:`oemof_b3.tools.data_processing.load_b3_timeseries` after querying. The index of
+    the results is the id column of the files ('id_scal' or 'id_ts') if they have one.
+
+    Parameters
+    ----------
+    database : str
+        Path of the DuckDB database. In memory by default, which only holds the views.
+    sep : str
+        Column separator of csv files. Default: ``config.settings.general.separator``
+    """
+
+    def __init__(self, database=":memory:", sep=None):
+        self.con = duckdb.connect(database)
+        self.sep = sep or config.settings.general.separator
+        self.tables = {}
+
+    def _read_files(self, paths):
+        r"""
+        Returns the table function reading the files ``paths``.
+        """
+        if any(path.endswith(".parquet") for path in paths):
+            if not all(path.endswith(".parquet") for path in paths):
+                raise ValueError(
+                    f"Files of one table are either all csv or all parquet: {paths}."
+                )
+            return f"read_parquet({_to_literal(paths)}, union_by_name = true)"
+
+        return (
+            f"read_csv({_to_literal(paths)}, delim = {_to_literal(self.sep)}, "
+            "header = true, all_varchar = true, union_by_name = true)"
+        )
+
+    def register(self, name, paths, kind=SCALARS):
+        r"""
+        Registers the files ``paths`` as view ``name``. Scalar results as written by
+        oemoflex can be registered as well, their column 'scenario' is renamed to
+        'scenario_key'.
+
+        Parameters
+        ----------
+        name : str
+            Name of the view
+        paths : str or list of str
+            Paths of csv or parquet files with the same kind of data
+        kind : str
+            Kind of data, 'scalars' or 'timeseries'. Default: 'scalars'
+        """
+        if kind not in KINDS:
+            raise ValueError(f"kind '{kind}' is not one of {KINDS}.")
+
+        if isinstance(paths, str):
+            paths = [paths]
+
+        read_files = self._read_files(list(paths))
+
+        columns = [
+            row[0]
+            for row in self.con.execute(
+                f"DESCRIBE SELECT * FROM {read_files}"
+            ).fetchall()
+        ]
+
+        select = "*"
+        if "scenario" in columns and "scenario_key" not in columns:
+            select = "* RENAME (scenario AS scenario_key)"
+
+        self.con.execute(
+            f"CREATE OR REPLACE VIEW {_quote(name)} AS SELECT {select} FROM {read_files}"
+        )
+
+        self.tables[name] = kind
+
+    def _get_kind(self, name):
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise KeyError(
+                f"There is no table '{name}'. Registered tables: {list(self.tables)}."
+            )
+
+    def _format(self, df, kind):
+        r"""
+        Formats the result of a query like the load functions of data_processing.
+        """
+        if kind == TIMESERIES:
+            header = dp.HEADER_B3_TS
+            index_name = config.settings.general.ts_index_name
+        else:
+            header = dp.HEADER_B3_SCAL
+            index_name = config.settings.general.scal_index_name
+
+            df["var_value"] = pd.to_numeric(df["var_value"], errors="coerce").fillna(
+                df["var_value"]
+            )
+
+        if index_name in df.columns:
+            df[index_name] = pd.to_numeric(df[index_name])
+
+        df = dp.format_header(df, header, index_name)
+
+        if kind == TIMESERIES:
+            df.loc[:, "series"] = df.loc[:, "series"].apply(
+                lambda x: ast.literal_eval(x) if isinstance(x, str) else x
+            )
+
+        return df
+
+    def sql(self, query, parameters=None):
+        r"""
+        Executes a query on the registered views and returns the result as DataFrame.
+        """
+        return self.con.execute(query, parameters).df()
+
+    def columns(self, name):
+        r"""Returns the columns of table ``name``"""
+        self._get_kind(name)
+        return [
+            row[0] for row in self.con.execute(f"DESCRIBE {_quote(name)}").fetchall()
+        ]
+
+    def filter_df(self, name, column_name, values, inverse=False):
+        r"""
+        Filters table ``name`` like :func:`oemof_b3.tools.data_processing.filter_df`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the table
+        column_name : string
+            The column's name to filter.
+        values : str/numeric/list
+            String, number or list of strings or numbers to filter by.
+        inverse : Boolean
+            If True, the entries for `column_name` and `values` are dropped.
+
+        Returns
+        -------
+        df_filtered : pd.DataFrame
+            Filtered data in oemof_b3 format
+        """
+        kind = self._get_kind(name)
+
+        where, parameters = get_where({column_name: values}, inverse=inverse)
+
+        return self._format(
+            self.sql(f"SELECT * FROM {_quote(name)} {where}", parameters), kind
+        )
+
+    def multi_filter_df(self, name, **kwargs):
+        r"""
+        Applies several filters to table ``name`` like
+        :func:`oemof_b3.tools.data_processing.multi_filter_df`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the table
+        kwargs : Additional keyword arguments
+            Filters to apply
+
+        Returns
+        -------
+        filtered_df : pd.DataFrame
+            Filtered data in oemof_b3 format
+        """
+        kind = self._get_kind(name)
+
+        where, parameters = get_where(kwargs)
+
+        return self._format(
+            self.sql(f"SELECT * FROM {_quote(name)} {where}", parameters), kind
+        )
+
+    def aggregate_scalars(self, name, columns_to_aggregate, **filters):
+        r"""
+        Sums up the scalars of table ``name`` by region, carrier, tech or type like
+        :func:`oemof_b3.tools.data_processing.aggregate_scalars`. The result is sorted by the
+        columns that are not aggregated.
+
+        Like in pandas, missing values are skipped and groups without values sum up to zero.
+        Values that are not numeric raise a TypeError.
+
+        Parameters
+        ----------
+        name : str
+            Name of the table
+        columns_to_aggregate : string or list
+            The columns to sum together ('region', 'carrier', 'tech' or 'type).
+        filters : Additional keyword arguments
+            Filters applied before aggregating
+
+        Returns
+        -------
+        df_aggregated : pd.DataFrame
+            Aggregated data in oemof_b3 scalars format
+        """
+        if self._get_kind(name) != SCALARS:
+            raise ValueError(f"Table '{name}' does not contain scalars.")
+
+        if not isinstance(columns_to_aggregate, list):
+            columns_to_aggregate = [columns_to_aggregate]
+
+        # Like format_header, columns missing in the files are empty
+        columns = self.columns(name)
+        groupby = [
+            _quote(column) if column in columns else f"NULL AS {_quote(column)}"
+            for column in GROUPBY_SCAL
+            if column not in columns_to_aggregate
+        ]
+        var_unit = "var_unit" if "var_unit" in columns else "NULL::VARCHAR"
+
+        where, parameters = get_where(filters)
+
+        df_aggregated = self.sql(
+            f"""
+            SELECT
+                {", ".join(groupby)},
+                coalesce(sum(TRY_CAST(var_value AS DOUBLE)), 0) AS var_value,
+                count(var_value) - count(TRY_CAST(var_value AS DOUBLE)) AS n_invalid,
+                any_value({var_unit}) AS var_unit,
+                count(DISTINCT {var_unit})
+                    + (count(*) > count({var_unit}) AND count({var_unit}) > 0)::INTEGER
+                    AS n_units
+            FROM {_quote(name)}
+            {where}
+            GROUP BY ALL
+            ORDER BY ALL
+            """,
+            parameters,
+        )
+
+        if (df_aggregated.pop("n_invalid") > 0).any():
+            raise TypeError(
+                f"Table '{name}' contains values of 'var_value' that are not numeric and "
+                "cannot be summed up."
+            )
+
+        if (df_aggregated.pop("n_units") > 1).any():
+            raise ValueError("Units are not consistent!")
+
+        # Assign "All" to the columns that where aggregated.
+        for col in columns_to_aggregate:
+            df_aggregated[col] = "All"
+
+        return dp.format_header(
+            df_aggregated, dp.HEADER_B3_SCAL, config.settings.general.scal_index_name
+        )
+
+    def unstack_var_name(self, name, **filters):
+        r"""
+        Unstacks the variables of the scalars of table ``name`` like
+        :func:`oemof_b3.tools.data_processing.unstack_var_name`. Only the filtered scalars are
+        loaded.
+
+        Parameters
+        ----------
+        name : str
+            Name of the table
+        filters : Additional keyword arguments
+            Filters applied before unstacking
+
+        Returns
+        -------
+        unstacked : pd.DataFrame
+            Unstacked scalar data.
+        """
+        if self._get_kind(name) != SCALARS:
+            raise ValueError(f"Table '{name}' does not contain scalars.")
+
+        return dp.unstack_var_name(self.multi_filter_df(name, **filters))
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,315 @@
+# coding: utf-8
+r"""
+This module contains the ResultsStore, which gives shared access to the postprocessed results
+of one or several scenarios.
+"""
+import hashlib
+import os
+
+import pandas as pd
+
+from oemof_b3.config import config
+from oemof_b3.tools import data_processing as dp
+
+
+logger = config.add_snake_logger("results")
+
+SCALARS_FILE = "scalars.csv"
+
+SEQUENCES_DIR = "sequences"
+
+CACHE_FORMATS = ["parquet", "pickle"]
+
+
+def _get_filters_as_tuples(filters):
+    r"""
+    Formats filters given as keyword arguments like in
+    :func:`oemof_b3.tools.data_processing.multi_filter_df` to the list of tuples expected by
+    :func:`pandas.read_parquet`.
+    """
+    return [
+        (key, "in", value if isinstance(value, list) else [value])
+        for key, value in filters.items()
+    ]
+
+
+def format_scalar_results(df):
+    r"""
+    Formats scalar results as given by oemof.tabular/oemoflex to oemof_b3 scalars format.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Scalar results as written by oemoflex.ResultsDataPackage
+
+    Returns
+    -------
+    df : pd.DataFrame
+        Scalar results in oemof_b3 scalars format
+    """
+    df = df.rename(columns={"scenario": "scenario_key"})
+
+    df["var_value"] = pd.to_numeric(df["var_value"], errors="coerce").fillna(
+        df["var_value"]
+    )
+
+    df = dp.format_header(
+        df, dp.HEADER_B3_SCAL, config.settings.general.scal_index_name
+    )
+
+    return df
+
+
+class ResultsStore:
+    r"""
+    Gives access to the scalars and sequences in one or several ``postprocessed`` directories
+    (or the ``joined`` directory of a scenario group), so that all postprocessing and
+    visualization scripts read results the same way.
+
+    Data is loaded lazily on first access and kept in memory. Optionally, loaded data is
+    also written to a binary cache (parquet or pickle) that is read instead of the csv files in
+    later runs. With parquet, filters passed to :meth:`get_scalars` are pushed down to the
+    reader if the scalars have not been loaded yet.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        Path(s) to ``results/{scenario}/postprocessed`` or
+        ``results/joined_scenarios/{scenario_group}/joined``
+    cache_format : str or None
+        Binary format of the cache, one of 'parquet' or 'pickle'. No binary cache if None.
+        Default: ``config.settings.results_store.cache_format``
+    cache_dir : str
+        Directory of the binary cache. Default: ``config.settings.results_store.cache_dir``
+    """
+
+    def __init__(self, paths, cache_format=None, cache_dir=None):
+        if isinstance(paths, str):
+            paths = [paths]
+
+        self.paths = {self._get_scenario_name(path): path for path in paths}
+
+        if cache_format is None:
+            cache_format = config.settings.results_store.cache_format
+
+        if cache_format is not None and cache_format not in CACHE_FORMATS:
+            raise ValueError(
+                f"cache_format '{cache_format}' is not one of {CACHE_FORMATS}."
+            )
+
+        self.cache_format = cache_format
+
+        self.cache_dir = cache_dir or config.settings.results_store.cache_dir
+
+        self._scalars = None
+
+        self._sequences = {}
+
+    @staticmethod
+    def _get_scenario_name(path):
+        r"""
+        Returns the name of the scenario (or scenario group) that ``path`` belongs to.
+        """
+        return os.path.basename(os.path.dirname(os.path.normpath(path)))
+
+    @property
+    def scenarios(self):
+        r"""Names of the scenarios (or scenario groups) in the store"""
+        return list(self.paths.keys())
+
+    @property
+    def scalars(self):
+        r"""All scalar results in oemof_b3 scalars format"""
+        return self.get_scalars()
+
+    def _get_cache_path(self, path):
+        if self.cache_format is None or not os.path.exists(path):
+            return None
+
+        # Key the cache by the source file and its state so that it is invalidated on change
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}-{stat.st_mtime_ns}-{stat.st_size}"
+        key = hashlib.sha1(key.encode()).hexdigest()
+
+        return os.path.join(self.cache_dir, f"{key}.{self.cache_format}")
+
+    def _read_cache(self, cache_path, **filters):
+        if self.cache_format == "parquet":
+            return pd.read_parquet(
+                cache_path, filters=_get_filters_as_tuples(filters) or None
+            )
+
+        return pd.read_pickle(cache_path)
+
+    def _write_cache(self, df, cache_path):
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        if self.cache_format == "parquet":
+            df.to_parquet(cache_path)
+        else:
+            df.to_pickle(cache_path)
+
+        logger.info(f"Cached results in binary format at '{cache_path}'.")
+
+    def _load(self, path, load_func):
+        r"""
+        Loads data from the binary cache if available, otherwise with load_func from path.
+        """
+        cache_path = self._get_cache_path(path)
+
+        if cache_path is not None and os.path.exists(cache_path):
+            return self._read_cache(cache_path)
+
+        df = load_func(path)
+
+        if cache_path is not None:
+            self._write_cache(df, cache_path)
+
+        return df
+
+    def _load_scalars(self, path):
+        def load_func(path):
+            df = dp.load_tabular_results_scal(path)
+
+            df = df.rename(columns={"scenario": "scenario_key"})
+
+            if self.cache_format == "parquet":
+                # var_value holds mixed types, which parquet cannot store in one column. Keep
+                # it as str like in the csv file, it is converted again after loading.
+                df["var_value"] = df["var_value"].astype(str)
+
+            return df
+
+        df = self._load(os.path.join(path, SCALARS_FILE), load_func)
+
+        return format_scalar_results(df)
+
+    def get_scalars(self, **filters):
+        r"""
+        Returns the scalar results, filtered by the given keyword arguments.
+
+        Parameters
+        ----------
+        filters : Additional keyword arguments
+            Filters like ``scenario_key``, ``region``, ``carrier`` or ``var_name`` and
+            values (or list of values) to select.
+
+        Returns
+        -------
+        scalars : pd.DataFrame
+            Scalar results in oemof_b3 scalars format
+        """
+        if self._scalars is None and filters and self.cache_format == "parquet":
+            # Push filters down to the parquet reader
+            cache_paths = [
+                self._get_cache_path(os.path.join(path, SCALARS_FILE))
+                for path in self.paths.values()
+            ]
+            if all(path is not None and os.path.exists(path) for path in cache_paths):
+                return pd.concat(
+                    [
+                        format_scalar_results(self._read_cache(path, **filters))
+                        for path in cache_paths
+                    ]
+                )
+
+        if self._scalars is None:
+            self._scalars = pd.concat(
+                [self._load_scalars(path) for path in self.paths.values()]
+            )
+
+        return dp.multi_filter_df(self._scalars, **filters)
+
+    def list_sequences(self, subdir="by_variable"):
+        r"""
+        Returns the names of the sequences in ``sequences/<subdir>`` of all scenarios.
+        """
+        names = []
+        for path in self.paths.values():
+            sequences_dir = os.path.join(path, SEQUENCES_DIR, subdir)
+            if not os.path.exists(sequences_dir):
+                continue
+            for file_name in sorted(os.listdir(sequences_dir)):
+                name = os.path.splitext(file_name)[0]
+                if name not in names:
+                    names.append(name)
+
+        return names
+
+    def get_sequences(self, name, subdir="by_variable", scenario=None):
+        r"""
+        Returns the sequence ``sequences/<subdir>/<name>.csv`` of a scenario as given by
+        oemof.tabular/oemoflex.
+
+        Parameters
+        ----------
+        name : str
+            Name of the sequence, e.g. 'flow' or 'BB-electricity'
+        subdir : str
+            Subdirectory of ``sequences``, e.g. 'by_variable' or 'bus'. Default: 'by_variable'
+        scenario : str
+            Name of the scenario. Can be omitted if there is only one scenario in the store.
+
+        Returns
+        -------
+        sequences : pd.DataFrame
+        """
+        if scenario is None:
+            if len(self.paths) > 1:
+                raise ValueError(
+                    "Please specify the scenario, the store contains several scenarios: "
+                    f"{self.scenarios}."
+                )
+            scenario = self.scenarios[0]
+
+        key = (scenario, subdir, name)
+
+        if key not in self._sequences:
+            path = os.path.join(
+                self.paths[scenario], SEQUENCES_DIR, subdir, name + ".csv"
+            )
+            self._sequences[key] = self._load(path, dp.load_tabular_results_ts)
+
+        return self._sequences[key]
+
+    def get_b3_sequences(self, name, subdir="by_variable", **filters):
+        r"""
+        Returns the sequence ``sequences/<subdir>/<name>.csv`` of all scenarios in stacked
+        oemof_b3 timeseries format, filtered by the given keyword arguments. Scenarios not
+        matching a filter on 'scenario_key' are not loaded at all.
+
+        Parameters
+        ----------
+        name : str
+            Name of the sequence, e.g. 'flow'
+        subdir : str
+            Subdirectory of ``sequences``. Default: 'by_variable'
+        filters : Additional keyword arguments
+            Filters like ``scenario_key``, ``region``, ``carrier`` or ``var_name``.
+
+        Returns
+        -------
+        sequences : pd.DataFrame
+            Sequences in oemof_b3 timeseries format
+        """
+        scenarios = filters.pop("scenario_key", self.scenarios)
+        if not isinstance(scenarios, list):
+            scenarios = [scenarios]
+
+        stacked = []
+        for scenario in self.scenarios:
+            if scenario not in scenarios:
+                continue
+
+            ts = dp.oemof_results_ts_to_oemof_b3(
+                self.get_sequences(name, subdir=subdir, scenario=scenario)
+            )
+            ts["scenario_key"] = scenario
+
+            stacked.append(dp.multi_filter_df(ts, **filters))
+
+        if not stacked:
+            raise ValueError(f"No scenario in the store matches {scenarios}.")
+
+        return pd.concat(stacked)
@@ -0,0 +1,151 @@
+# coding: utf-8
+r"""
+This module contains the ScenarioRegistry, which loads the specifications of the scenarios in
+``scenarios/`` once and shares them between the Snakefile, the scripts and the plots.
+"""
+import os
+from collections.abc import Mapping
+
+from oemof_b3.config.config import load_yaml
+
+
+SCENARIO_DIR = "scenarios"
+
+REQUIRED_KEYS = ["name", "model_structure", "paths_scalars", "paths_timeseries"]
+
+INPUT_KEYS = ["paths_scalars", "paths_timeseries"]
+
+FILTER_KEYS = ["filter_scalars", "filter_timeseries"]
+
+
+def validate_scenario_specs(scenario_specs, path):
+    r"""
+    Checks that the scenario specifications contain all required keys.
+
+    Raises
+    ------
+    ValueError
+        If keys are missing
+    """
+    if not isinstance(scenario_specs, dict):
+        raise ValueError(f"Scenario specifications in '{path}' are not a mapping.")
+
+    missing = [key for key in REQUIRED_KEYS if key not in scenario_specs]
+
+    if missing:
+        raise ValueError(
+            f"Scenario specifications in '{path}' are missing the keys {missing}."
+        )
+
+
+class ScenarioRegistry(Mapping):
+    r"""
+    Read-only mapping of the names of the scenarios in a directory to their specifications.
+    Each scenario file is read and validated on first access only and read again only if it
+    has changed since.
+
+    Parameters
+    ----------
+    directory : str
+        Directory with the scenario specifications ``{scenario}.yml``. Default: 'scenarios'
+    """
+
+    def __init__(self, directory=SCENARIO_DIR):
+        self.directory = directory
+        self._names = None
+        self._loaded = {}
+
+    def get_path(self, name):
+        r"""Returns the path of the specifications of scenario `name`"""
+        return os.path.join(self.directory, f"{name}.yml")
+
+    def names(self):
+        r"""Returns the sorted names of all scenarios in the directory"""
+        mtime = os.stat(self.directory).st_mtime_ns
+
+        if self._names is None or self._names[0] != mtime:
+            names = sorted(
+                os.path.splitext(file_name)[0]
+                for file_name in os.listdir(self.directory)
+                if file_name.endswith(".yml")
+            )
+            self._names = (mtime, names)
+
+        return self._names[1]
+
+    def load(self, path):
+        r"""
+        Returns the scenario specifications in the file at `path`, which may be outside of the
+        directory of the registry.
+
+        Parameters
+        ----------
+        path : str
+            Path of the scenario specifications (.yml)
+
+        Returns
+        -------
+        scenario_specs : dict
+            Scenario specifications. They are shared, so copy them before changing them.
+        """
+        key = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+
+        if key not in self._loaded or self._loaded[key][0] != mtime:
+            scenario_specs = load_yaml(path)
+            validate_scenario_specs(scenario_specs, path)
+            self._loaded[key] = (mtime, scenario_specs)
+
+        return self._loaded[key][1]
+
+    def __getitem__(self, name):
+        try:
+            return self.load(self.get_path(name))
+        except FileNotFoundError:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        return os.path.isfile(self.get_path(name))
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self.names())
+
+    def get_label(self, name):
+        r"""
+        Returns the label of scenario `name`, or `name` if it has no label or there is no
+        such scenario.
+        """
+        if name not in self:
+            return name
+
+        return self[name].get("label", name)
+
+    def get_input_paths(self, name):
+        r"""
+        Returns the paths of the scalars and timeseries of scenario `name`.
+        """
+        scenario_specs = self[name]
+
+        paths_scenario_inputs = []
+        for key in INPUT_KEYS:
+            paths = scenario_specs[key]
+            if isinstance(paths, list):
+                paths_scenario_inputs.extend(paths)
+            elif isinstance(paths, str):
+                paths_scenario_inputs.append(paths)
+
+        return paths_scenario_inputs
+
+    def get_filters(self, name):
+        r"""
+        Returns the filters of the scalars and timeseries of scenario `name`.
+        """
+        scenario_specs = self[name]
+
+        return {key: scenario_specs.get(key) for key in FILTER_KEYS}
+
+
+scenario_registry = ScenarioRegistry()
@@ -0,0 +1,254 @@
+# coding: utf-8
+r"""
+This module contains functions to define sweeps, i.e. variants of a base scenario that differ
+in the values of selected scalars, and to collect the results of all variants.
+
+A sweep is defined in a yml file with the base scenario and the axes of the parameter grid::
+
+    base_scenario: scenarios/2050-95-gas_moreCH4.yml
+    combination: product  # 'product' (all combinations) or 'zip' (i-th value of each axis)
+    axes:
+      ch4_cost:
+        select:  # scalars to change, like the filters of multi_filter_df
+          carrier: ch4
+          var_name: carrier_cost
+        operation: multiply  # 'set' (default) or 'multiply'
+        values: [0.8, 1.0, 1.2]
+
+Variants are generated lazily and are named ``{sweep}--{number}``. Their scenario
+specifications are those of the base scenario with the additional key *scalar_overrides*,
+which is applied to the scalars by :func:`apply_scalar_overrides` when the datapackage is
+built.
+"""
+import copy
+import itertools
+import math
+import os
+
+import pandas as pd
+
+from oemof_b3.config.config import load_yaml
+from oemof_b3.tools.results import ResultsStore
+from oemof_b3.tools.scenarios import scenario_registry
+
+
+VARIANT_SEPARATOR = "--"
+
+COMBINATIONS = ["product", "zip"]
+
+OPERATIONS = ["set", "multiply"]
+
+
+def get_variant_name(sweep_name, number):
+    r"""Returns the name of the variant ``number`` of a sweep"""
+    return f"{sweep_name}{VARIANT_SEPARATOR}{number:04d}"
+
+
+def load_sweep(path):
+    r"""
+    Loads and checks a sweep definition. The name of the sweep is the name of the file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the sweep definition (.yml)
+
+    Returns
+    -------
+    sweep : dict
+        Sweep definition with the additional key 'name'
+    """
+    sweep = load_yaml(path)
+
+    sweep.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    sweep.setdefault("combination", "product")
+
+    if sweep["combination"] not in COMBINATIONS:
+        raise ValueError(
+            f"combination '{sweep['combination']}' is not one of {COMBINATIONS}."
+        )
+
+    if not sweep.get("axes"):
+        raise ValueError(f"Sweep '{path}' does not define any axes.")
+
+    for axis_name, axis in sweep["axes"].items():
+        axis.setdefault("operation", "set")
+
+        if axis["operation"] not in OPERATIONS:
+            raise ValueError(
+                f"operation '{axis['operation']}' of axis '{axis_name}' is not one of "
+                f"{OPERATIONS}."
+            )
+
+        if not axis.get("select") or not axis.get("values"):
+            raise ValueError(f"Axis '{axis_name}' needs 'select' and 'values'.")
+
+    if sweep["combination"] == "zip":
+        lengths = {name: len(axis["values"]) for name, axis in sweep["axes"].items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(
+                f"All axes need the same number of values to be zipped: {lengths}."
+            )
+
+    return sweep
+
+
+def count_variants(sweep):
+    r"""Returns the number of variants of a sweep without generating them"""
+    lengths = [len(axis["values"]) for axis in sweep["axes"].values()]
+
+    if sweep["combination"] == "zip":
+        return lengths[0]
+
+    return math.prod(lengths)
+
+
+def iter_variants(sweep, base_specs=None):
+    r"""
+    Generates the variants of a sweep one by one.
+
+    Parameters
+    ----------
+    sweep : dict
+        Sweep definition as returned by :func:`load_sweep`
+    base_specs : dict
+        Specifications of the base scenario. Loaded from *base_scenario* if None.
+
+    Yields
+    ------
+    name : str
+        Name of the variant
+    values : dict
+        Value of each axis
+    scenario_specs : dict
+        Scenario specifications of the variant
+    """
+    if base_specs is None:
+        base_specs = scenario_registry.load(sweep["base_scenario"])
+
+    axes = sweep["axes"]
+
+    combine = itertools.product if sweep["combination"] == "product" else zip
+
+    for number, combination in enumerate(
+        combine(*[axis["values"] for axis in axes.values()])
+    ):
+        name = get_variant_name(sweep["name"], number)
+        values = dict(zip(axes.keys(), combination))
+
+        scenario_specs = copy.deepcopy(base_specs)
+        scenario_specs["name"] = name
+        scenario_specs["label"] = ", ".join(f"{k}={v}" for k, v in values.items())
+        scenario_specs["scalar_overrides"] = [
+            {
+                "select": axis["select"],
+                "operation": axis["operation"],
+                "value": values[axis_name],
+            }
+            for axis_name, axis in axes.items()
+        ]
+
+        yield name, values, scenario_specs
+
+
+def apply_scalar_overrides(scalars, overrides):
+    r"""
+    Changes the values of the scalars selected by each override.
+
+    Parameters
+    ----------
+    scalars : pd.DataFrame
+        Scalars in oemof_b3 format
+    overrides : list
+        Dicts with 'select' (values of columns to select, like the filters of
+        :func:`oemof_b3.tools.data_processing.multi_filter_df`), 'operation' ('set' or
+        'multiply') and 'value'
+
+    Returns
+    -------
+    scalars : pd.DataFrame
+        Copy of the scalars with changed values
+    """
+    if not overrides:
+        return scalars
+
+    scalars = scalars.copy()
+
+    for override in overrides:
+        selected = pd.Series(True, index=scalars.index)
+        for column, value in override["select"].items():
+            if not isinstance(value, list):
+                value = [value]
+            selected &= scalars[column].isin(value)
+
+        if not selected.any():
+            raise ValueError(f"No scalars match {override['select']}.")
+
+        if override.get("operation", "set") == "multiply":
+            scalars.loc[selected, "var_value"] = (
+                pd.to_numeric(scalars.loc[selected, "var_value"]) * override["value"]
+            )
+        else:
+            scalars.loc[selected, "var_value"] = override["value"]
+
+    return scalars
+
+
+def save_index(rows, path):
+    r"""
+    Saves the index of a sweep, i.e. the name of each variant and its values.
+
+    Parameters
+    ----------
+    rows : list
+        Dicts with 'variant' and the value of each axis
+    path : str
+        Path of the index (.csv)
+    """
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def load_index(path):
+    r"""
+    Loads the index of a sweep.
+
+    Returns
+    -------
+    index : pd.DataFrame
+        Value of each axis, indexed by variant
+    """
+    return pd.read_csv(path, index_col="variant")
+
+
+def load_sweep_scalars(index_path, results_dir="results", **filters):
+    r"""
+    Loads the postprocessed scalar results of all variants of a sweep and adds the values of
+    the axes as columns.
+
+    Parameters
+    ----------
+    index_path : str
+        Path of the index of the sweep
+    results_dir : str
+        Directory with ``{variant}/postprocessed`` of each variant
+    filters : Additional keyword arguments
+        Filters passed to :meth:`oemof_b3.tools.results.ResultsStore.get_scalars`
+
+    Returns
+    -------
+    scalars : pd.DataFrame
+        Scalar results in oemof_b3 format with the variant as 'scenario_key' and one column
+        per axis
+    """
+    index = load_index(index_path)
+
+    store = ResultsStore(
+        [os.path.join(results_dir, variant, "postprocessed") for variant in index.index]
+    )
+
+    scalars = store.get_scalars(**filters)
+
+    return scalars.join(index, on="scenario_key")
@@ -1,28 +1,98 @@
 r"""
-A Timer class, adapted from https://github.com/realpython/codetiming
+A Timer class, adapted from https://github.com/realpython/codetiming, and a Profiler that
+records nested timers as spans with wall time, CPU time, peak memory and the size of the
+processed data.
 """
 import datetime
+import json
+import os
+import sys
 import time
 
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from oemof_b3.config import config
+
+
+PROFILE_COLUMNS = [
+    "script",
+    "span",
+    "depth",
+    "start",
+    "wall_time",
+    "cpu_time",
+    "peak_rss",
+    "rows",
+    "columns",
+]
+
+
+def get_cpu_time():
+    r"""
+    Returns the CPU time in seconds used by the process and its terminated child processes
+    (e.g. the solver).
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def get_peak_rss():
+    r"""
+    Returns the peak resident set size in MB of the process or its largest terminated child
+    process, None if it cannot be determined on this platform.
+    """
+    if resource is None:
+        return None
+
+    # ru_maxrss is given in bytes on macOS and in kilobytes on Linux
+    to_mb = 1 / 1024**2 if sys.platform == "darwin" else 1 / 1024
+
+    return to_mb * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
 
 class Timer:
-    def __init__(self, text, logger=print):
+    def __init__(self, text, logger=print, profiler=None, name=None):
         self._start_time = None
+        self._start_cpu_time = None
         self.text = text
         self.logger = logger
+        self.profiler = profiler
+        self.name = name or text
+        self.rows = None
+        self.columns = None
+
+    def add_shape(self, df):
+        """Record the number of rows and columns of the data processed within the timer"""
+        self.rows = df.shape[0]
+        self.columns = df.shape[1] if df.ndim > 1 else 1
 
     def start(self):
         """Start a new timer"""
+        if self.profiler is not None:
+            self.profiler.enter(self)
+        self._start_cpu_time = get_cpu_time()
         self._start_time = time.perf_counter()
 
     def stop(self):
         """Stop the timer, and report the elapsed time"""
         elapsed_time = time.perf_counter() - self._start_time
+        cpu_time = get_cpu_time() - self._start_cpu_time
         self._start_time = None
+        if self.profiler is not None:
+            self.profiler.exit(self, elapsed_time, cpu_time)
         if self.logger:
             self.logger(
                 self.text + f" Elapsed time: {datetime.timedelta(seconds=elapsed_time)}"
             )
+        return elapsed_time
 
     def __enter__(self):
         """Start a new timer as a context manager"""
@@ -32,3 +102,190 @@ class Timer:
     def __exit__(self, *exc_info):
         """Stop the context manager timer"""
         self.stop()
+
+
+class Profiler:
+    r"""
+    Records nested spans of a script run. Between :meth:`start` and :meth:`stop` (or within
+    the context when used as context manager), the whole run is recorded as root span. On
+    stop, the spans are saved to ``<directory>/<profiling.dir_name>/<name>.json`` and
+    ``.csv`` if *profiling.enabled* is set in settings.yaml.
+
+    Parameters
+    ----------
+    name : str
+        Name of the profiled script, used as name of the root span and the files.
+    directory : str
+        Directory the profiling directory is created in, usually ``results/{scenario}``.
+        Nothing is saved if None.
+    logger : callable
+        Called with a message on the elapsed time of each span. No messages if None.
+
+    Examples
+    --------
+    >>> with Profiler("build_datapackage", "results/example") as profiler:
+    ...     with profiler.span("load scalars") as span:
+    ...         scalars = load_b3_scalars(path)
+    ...         span.add_shape(scalars)
+    """
+
+    def __init__(self, name, directory=None, logger=None):
+        self.name = name
+        self.directory = directory
+        self.logger = logger
+        self.records = []
+        self._order = []
+        self._n_started = 0
+        self._stack = []
+        self._root = None
+
+    def span(self, name, text=None):
+        r"""
+        Returns a Timer that records a span named ``name``, nested into the currently open
+        spans. ``text`` is logged with the elapsed time, defaults to the name.
+        """
+        return Timer(
+            text=text or f"{name}.", logger=self.logger, profiler=self, name=name
+        )
+
+    def enter(self, timer):
+        self._stack.append(timer.name)
+        timer.path = "/".join(self._stack)
+        timer.order = self._n_started
+        self._n_started += 1
+        timer.started = datetime.datetime.now().isoformat(timespec="seconds")
+
+    def exit(self, timer, wall_time, cpu_time):
+        self.records.append(
+            {
+                "script": self.name,
+                "span": timer.path,
+                "depth": len(self._stack) - 1,
+                "start": timer.started,
+                "wall_time": wall_time,
+                "cpu_time": cpu_time,
+                "peak_rss": get_peak_rss(),
+                "rows": timer.rows,
+                "columns": timer.columns,
+            }
+        )
+        self._order.append(timer.order)
+        self._stack.pop()
+
+    def to_frame(self):
+        r"""
+        Returns the recorded spans, ordered by their start.
+
+        Returns
+        -------
+        spans : pd.DataFrame
+            Wall time and CPU time in seconds, peak RSS in MB and the number of rows and
+            columns of the spans.
+        """
+        # Spans are recorded when they end, i.e. inner spans before outer spans
+        order = sorted(range(len(self.records)), key=lambda i: self._order[i])
+        return pd.DataFrame([self.records[i] for i in order], columns=PROFILE_COLUMNS)
+
+    def save(self, directory=None):
+        r"""
+        Saves the recorded spans to ``<directory>/<profiling.dir_name>/<name>.json`` and
+        ``.csv``.
+
+        Returns
+        -------
+        path : str
+            Path of the csv file
+        """
+        directory = os.path.join(
+            directory or self.directory, config.settings.profiling.dir_name
+        )
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        spans = self.to_frame()
+
+        path = os.path.join(directory, self.name)
+
+        with open(path + ".json", "w") as json_file:
+            json.dump(spans.to_dict(orient="records"), json_file, indent=2)
+
+        spans.to_csv(path + ".csv", index=False)
+
+        return path + ".csv"
+
+    def start(self):
+        """Start recording the root span"""
+        self._root = self.span(self.name)
+        self._root.start()
+
+    def stop(self):
+        """Stop recording the root span and save the spans"""
+        self._root.stop()
+        if self.directory is not None and config.settings.profiling.enabled:
+            self.save()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def load_profiles(results_dir):
+    r"""
+    Loads all profiles saved in directories named *profiling.dir_name* within
+    ``results_dir``.
+
+    Returns
+    -------
+    profiles : pd.DataFrame
+        Spans of all profiled script runs with the directory the profile was saved in,
+        relative to ``results_dir``, in column 'scenario'.
+    """
+    profiles = []
+    for root, dirs, files in sorted(os.walk(results_dir)):
+        if os.path.basename(root) != config.settings.profiling.dir_name:
+            continue
+
+        scenario = os.path.relpath(os.path.dirname(root), results_dir)
+
+        for file_name in sorted(files):
+            if not file_name.endswith(".csv"):
+                continue
+            profile = pd.read_csv(os.path.join(root, file_name))
+            profile.insert(0, "scenario", scenario)
+            profiles.append(profile)
+
+    if not profiles:
+        return pd.DataFrame(columns=["scenario"] + PROFILE_COLUMNS)
+
+    return pd.concat(profiles, ignore_index=True)
+
+
+def summarize_profiles(profiles):
+    r"""
+    Aggregates spans of the same script and name across scenarios.
+
+    Parameters
+    ----------
+    profiles : pd.DataFrame
+        Spans as returned by :func:`load_profiles`
+
+    Returns
+    -------
+    summary : pd.DataFrame
+        Number of scenarios, total, mean and max wall time, total CPU time, max peak RSS and
+        max number of rows per span, sorted by total wall time.
+    """
+    summary = profiles.groupby(["script", "span"]).agg(
+        scenarios=("scenario", "nunique"),
+        wall_time_total=("wall_time", "sum"),
+        wall_time_mean=("wall_time", "mean"),
+        wall_time_max=("wall_time", "max"),
+        cpu_time_total=("cpu_time", "sum"),
+        peak_rss_max=("peak_rss", "max"),
+        rows_max=("rows", "max"),
+    )
+
+    return summary.sort_values("wall_time_total", ascending=False)
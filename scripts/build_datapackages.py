@@ -0,0 +1,76 @@
+# coding: utf-8
+r"""
+Inputs
+-------
+scenario_specs : str
+    ``scenarios/{scenario}.yml``: paths of input files (.yml) containing scenario
+    specifications, one or more
+--results-dir : str
+    Directory in which ``{scenario}/preprocessed`` is created for each scenario.
+    Default: 'results'
+--logfile : str
+    ``results/joined_scenarios/{scenario_group}/{scenario_group}.log``: path to logfile
+--jobs : int
+    Number of processes building datapackages in parallel. Default: 1
+
+Outputs
+---------
+oemoflex.EnergyDatapackage
+    For each scenario, an EnergyDatapackage in ``{results_dir}/{scenario}/preprocessed``, as
+    built by ``scripts/build_datapackage.py``.
+
+Description
+-------------
+The script builds the datapackages of several scenarios in one run. Scenarios typically share
+their scalars and timeseries files and model structure and differ only in their filters. The
+shared inputs are loaded, their regions expanded and their names checked only once, and the
+default structure of the EnergyDataPackage is set up once per model structure. Each scenario's
+datapackage is then built by applying its filters, in parallel if ``--jobs`` is greater than 1.
+"""
+import argparse
+import logging
+import os
+
+from oemof_b3.config import config
+from oemof_b3.tools.datapackage import build_all, load_shared_inputs
+from oemof_b3.tools.scenarios import scenario_registry
+from oemof_b3.tools.timing import Profiler
+
+logger = logging.getLogger("build_datapackage")
+
+
+def get_scenario_name(path):
+    r"""Returns the name of the scenario defined in ``scenarios/{scenario}.yml``"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the datapackages of several scenarios."
+    )
+    parser.add_argument("scenario_specs", nargs="+")
+    parser.add_argument("--results-dir", default="results")
+    parser.add_argument("--logfile")
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    logger = config.add_snake_logger("build_datapackage")
+
+    builds = [
+        (
+            scenario_registry.load(path),
+            os.path.join(args.results_dir, get_scenario_name(path), "preprocessed"),
+        )
+        for path in args.scenario_specs
+    ]
+
+    with Profiler(
+        "load_shared_inputs",
+        os.path.dirname(args.logfile) if args.logfile else None,
+        logger=logger.info,
+    ) as profiler:
+        shared = load_shared_inputs([specs for specs, _ in builds], profiler)
+
+    destinations = build_all(builds, shared, min(args.jobs, len(builds)))
+
+    logger.info(f"Built {len(destinations)} datapackages: {destinations}.")
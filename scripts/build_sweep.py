@@ -0,0 +1,89 @@
+# coding: utf-8
+r"""
+Inputs
+-------
+sweep : str
+    ``sweeps/{sweep}.yml``: path of the sweep definition (.yml)
+index : str
+    ``results/_sweeps/{sweep}/index.csv``: path of the output index of the variants
+variants : str
+    ``results/_sweeps/{sweep}/variants``: directory in which ``{variant}/preprocessed`` is
+    created for each variant
+--logfile : str
+    ``results/_sweeps/{sweep}/{sweep}.log``: path to logfile
+--jobs : int
+    Number of processes building datapackages in parallel. Default: 1
+
+Outputs
+---------
+oemoflex.EnergyDatapackage
+    For each variant of the sweep, an EnergyDatapackage in
+    ``{variants}/{sweep}--{number}/preprocessed``. The rule prepare_sweep_variant copies it
+    to ``results/{sweep}--{number}/preprocessed``.
+.csv
+    Index with the name and the value of each axis of all variants.
+
+Description
+-------------
+The script builds the datapackages of all variants of a sweep, see
+:mod:`oemof_b3.tools.sweep`. The variants are generated from the sweep definition while
+building, without writing a scenario file for each. The inputs of the base scenario are
+loaded and prepared once and shared by all variants, which differ only in the values of the
+scalars selected by the axes of the sweep.
+
+The variants can be optimized and postprocessed like other scenarios, e.g. with the rule
+``run_sweep``. :func:`oemof_b3.tools.sweep.load_sweep_scalars` loads the scalar results of
+all variants together with their values from the index.
+"""
+import argparse
+import logging
+import os
+
+from oemof_b3.config import config
+from oemof_b3.tools.datapackage import build_all, load_shared_inputs
+from oemof_b3.tools.scenarios import scenario_registry
+from oemof_b3.tools.sweep import count_variants, iter_variants, load_sweep, save_index
+from oemof_b3.tools.timing import Profiler
+
+logger = logging.getLogger("build_datapackage")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the datapackages of all variants of a sweep."
+    )
+    parser.add_argument("sweep")
+    parser.add_argument("index")
+    parser.add_argument("variants")
+    parser.add_argument("--logfile")
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    logger = config.add_snake_logger("build_datapackage")
+
+    sweep = load_sweep(args.sweep)
+
+    base_specs = scenario_registry.load(sweep["base_scenario"])
+
+    logger.info(
+        f"Building {count_variants(sweep)} variants of sweep '{sweep['name']}' based on "
+        f"'{sweep['base_scenario']}'."
+    )
+
+    with Profiler(
+        "load_shared_inputs", os.path.dirname(args.index), logger=logger.info
+    ) as profiler:
+        shared = load_shared_inputs([base_specs], profiler)
+
+    index = []
+
+    def get_builds():
+        for name, values, scenario_specs in iter_variants(sweep, base_specs):
+            index.append(dict(variant=name, **values))
+            yield scenario_specs, os.path.join(args.variants, name, "preprocessed")
+
+    build_all(get_builds(), shared, args.jobs)
+
+    save_index(index, args.index)
+
+    logger.info(f"Saved index of {len(index)} variants to '{args.index}'.")
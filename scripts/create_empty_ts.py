@@ -34,10 +34,7 @@ from oemoflex.model.model_structure import module_path
 from oemof_b3.config.config import load_yaml, settings
 from oemof_b3.model import model_structures
 from oemof_b3 import model
-from oemof_b3.tools.data_processing import (
-    HEADER_B3_TS,
-    stack_timeseries,
-)
+from oemof_b3.tools.data_processing import HEADER_B3_TS
 
 
 def get_sub_dict(subsub_key, _dict):
@@ -69,25 +66,49 @@ def get_sub_dict(subsub_key, _dict):
     return subsub_dict
 
 
-def create_empty_ts_with_zero_or_nan_values(periods, date_rng, name):
+def get_date_range(_scenario_specs):
     """
-    Returns a pandas DataFrame with time series values set to either zeros or
-    NaNs, based on settings.yaml
+    This function returns the time index of the time series according to the start, periods
+    and freq of the scenario specifications
+
+    Parameters
+    ----------
+    _scenario_specs : dict
+        Scenario specifications
+
+    Returns
+    -------
+    date_rng : pd.DatetimeIndex
+        Time index of the time series
+    """
+    datetime_format = settings.create_empty_ts.datetime_format
+
+    # Get start date from scenario specifications
+    start = datetime.strptime(
+        _scenario_specs["filter_timeseries"]["timeindex_start"], datetime_format
+    )
+
+    # Get periods and freq from scenario specifications
+    periods = _scenario_specs["datetimeindex"]["periods"]
+    freq = _scenario_specs["datetimeindex"]["freq"]
+
+    return pd.date_range(start=start, periods=periods, freq=freq)
+
+
+def get_empty_series(periods):
+    """
+    Returns the values of an empty time series, set to either zeros or NaNs, based on
+    settings.yaml
 
     Parameters
     ----------
     periods : int
         Number of periods in the time series
-    date_rng : pd.DatetimeIndex
-        Datetime index specifying start and end dates of the time series
-    name : str
-        Name of the time series column in the DataFrame
 
     Returns
     -------
-    df : pd.DataFrame
-        A pandas DataFrame containing the time series values, with 'name' as
-        the column name.
+    series : list
+        Values of the time series
 
     Raises
     ------
@@ -97,58 +118,62 @@ def create_empty_ts_with_zero_or_nan_values(periods, date_rng, name):
     ts_values = settings.create_empty_ts.ts_values
 
     if ts_values == "zeros":
-        df = pd.DataFrame(np.zeros((periods, 1)), index=date_rng, columns=[name])
+        return [0.0] * periods
     elif ts_values == "empty":
-        df = pd.DataFrame(
-            np.empty((periods, 1)) * np.nan, index=date_rng, columns=[name]
-        )
-    else:
-        raise KeyError(
-            f"{ts_values} is not a valid option. Valid options are: 'zeros' or"
-            f"'empty'. Please provide a valid value for ts_values in "
-            f"settings.yaml"
-        )
+        return [np.nan] * periods
 
-    return df
+    raise KeyError(
+        f"{ts_values} is not a valid option. Valid options are: 'zeros' or"
+        f"'empty'. Please provide a valid value for ts_values in "
+        f"settings.yaml"
+    )
 
 
-def create_empty_ts(name):
+def get_empty_stacked_ts(profile_names, regions, date_rng):
     """
-    This function provides a Dataframe with a time series of zeros
-    according to the start, periods and freq of the scenario specifications
-
-    Parameters
-    ----------
-    name : str
-        Name of the ts
+    This function provides a Dataframe with the empty time series of all profiles (loads,
+    feedins or efficiencies) of all regions in stacked format. The time index is built once
+    and all rows share the same list of values.
 
-    Returns
+    Inputs
     -------
-    df : Dataframe
-        Dataframe containing ts with zeros as values and name as column name
-
-    """
-    datetime_format = settings.create_empty_ts.datetime_format
+    profile_names : list
+        List with names of profiles (loads, feedins or efficiencies)
 
-    # Get start date from scenario specifications
-    start = datetime.strptime(
-        scenario_specs["filter_timeseries"]["timeindex_start"], datetime_format
-    )
+    regions : list
+        Regions
 
-    # Get periods and freq from scenario specifications
-    periods = scenario_specs["datetimeindex"]["periods"]
-    freq = scenario_specs["datetimeindex"]["freq"]
+    date_rng : pd.DatetimeIndex
+        Time index of the time series with freq
 
-    # Get date range from start periods and freq
-    date_rng = pd.date_range(start=start, periods=periods, freq=freq)
+    Outputs
+    -------
+    ts_df : Dataframe
+        Dataframe with empty time series, ordered by region and profile name
 
-    # Create DataFrame with ts of zeros from date range and name
-    df = create_empty_ts_with_zero_or_nan_values(periods, date_rng, name)
+    """
+    series = get_empty_series(len(date_rng))
+
+    n_rows = len(profile_names) * len(regions)
+
+    ts_df = pd.DataFrame(
+        {
+            "scenario_key": settings.create_empty_ts.filter_ts,
+            "region": np.repeat(regions, len(profile_names)),
+            "var_name": np.tile(profile_names, len(regions)),
+            "timeindex_start": date_rng[0],
+            "timeindex_stop": date_rng[-1],
+            "timeindex_resolution": date_rng.freqstr,
+            "series": [series] * n_rows,
+        },
+        index=pd.RangeIndex(n_rows, name="id_ts"),
+    )
 
-    return df
+    # Reindex according to time series in schema directory
+    return ts_df.reindex(columns=HEADER_B3_TS)
 
 
-def get_df_of_all_empty_ts(profile_names, _region):
+def get_df_of_all_empty_ts(profile_names, _region, date_rng):
     """
     This function provides a Dataframe with all ts of a profile (load, feedin
     or efficiency)
@@ -161,32 +186,16 @@ def get_df_of_all_empty_ts(profile_names, _region):
     _region : str
         Region
 
+    date_rng : pd.DatetimeIndex
+        Time index of the time series with freq, see :func:`get_date_range`
+
     Outputs
     -------
     ts_df : Dataframe
         Dataframe with empty time series (consisting of zeros)
 
     """
-    ts_df = pd.DataFrame(columns=HEADER_B3_TS)
-
-    for name in profile_names:
-        df = create_empty_ts(name)
-
-        # Stack Dataframe
-        stacked_df = stack_timeseries(df)
-
-        # Reindex according to time series in schema directory
-        stacked_df = stacked_df.reindex(columns=HEADER_B3_TS)
-
-        # Add region and scenario_specs to Dataframe
-        stacked_df["region"] = _region
-        stacked_df["scenario_key"] = settings.create_empty_ts.filter_ts
-
-        # Append Dataframe to ts_profile_df and add index name
-        ts_df = pd.concat([ts_df, stacked_df], ignore_index=True)
-        ts_df.index.name = "id_ts"
-
-    return ts_df
+    return get_empty_stacked_ts(profile_names, [_region], date_rng)
 
 
 def drop_duplicates(_df):
@@ -256,21 +265,19 @@ if __name__ == "__main__":
 
     scenarios = os.listdir(scenarios_dir)
 
-    all_load_ts = pd.DataFrame(columns=HEADER_B3_TS)
-    all_feedin_ts = pd.DataFrame(columns=HEADER_B3_TS)
-    all_efficiencies_ts = pd.DataFrame(columns=HEADER_B3_TS)
+    all_ts = {"load": [], "feedin": [], "efficiency": []}
 
     component_attrs_file = (os.path.join(module_path, "component_attrs.yml"),)
     component_attrs = load_yaml(component_attrs_file[0])
 
+    component_attrs_update = load_yaml(
+        os.path.join(model.here, "component_attrs_update.yml")
+    )
+
     for scenario_specs in scenarios:
         scenario_specs = load_yaml(os.path.join(scenarios_dir, scenario_specs))
         model_structure = model_structures[scenario_specs["model_structure"]]
 
-        component_attrs_update = load_yaml(
-            os.path.join(model.here, "component_attrs_update.yml")
-        )
-
         # Get all foreign_keys that contain "profile" from component_attrs
         foreign_keys_profile = get_sub_dict("profile", component_attrs)
 
@@ -302,39 +309,29 @@ if __name__ == "__main__":
             attr_subdict["efficiency"] for attr_subdict in foreign_keys_efficiency
         ]
 
-        ts_dict = {
+        ts_names = {
             "load": load_names,
             "feedin": feedin_names,
             "efficiency": efficiency_names,
         }
 
-        for region in model_structure["regions"]:
-
-            if load_names:
-                df_loads = get_df_of_all_empty_ts(load_names, region)
-                all_load_ts = pd.concat([all_load_ts, df_loads], ignore_index=True)
-
-            if feedin_names:
-                df_feedin = get_df_of_all_empty_ts(feedin_names, region)
-                all_feedin_ts = pd.concat([all_feedin_ts, df_feedin], ignore_index=True)
+        # The time index is the same for all time series of a scenario
+        date_rng = get_date_range(scenario_specs)
 
-            if efficiency_names:
-                df_efficiencies = get_df_of_all_empty_ts(efficiency_names, region)
-                all_efficiencies_ts = pd.concat(
-                    [all_efficiencies_ts, df_efficiencies], ignore_index=True
+        for ts_type, names in ts_names.items():
+            if names:
+                all_ts[ts_type].append(
+                    get_empty_stacked_ts(names, model_structure["regions"], date_rng)
                 )
 
-    ts_dict = {
-        "load": (load_names, all_load_ts, path_empty_load_ts),
-        "feedin": (feedin_names, all_feedin_ts, path_empty_ts_feedin),
-        "efficiency": (
-            efficiency_names,
-            all_efficiencies_ts,
-            path_empty_ts_efficiencies,
-        ),
+    ts_paths = {
+        "load": path_empty_load_ts,
+        "feedin": path_empty_ts_feedin,
+        "efficiency": path_empty_ts_efficiencies,
     }
 
-    for ts_type, (ts_name, ts_data, ts_path) in ts_dict.items():
-        if ts_name:
+    for ts_type, ts_path in ts_paths.items():
+        if ts_names[ts_type]:
+            ts_data = pd.concat(all_ts[ts_type], ignore_index=True)
             ts_data = drop_duplicates(ts_data)
             save_ts(ts_data, ts_path)
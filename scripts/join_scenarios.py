@@ -15,21 +15,15 @@ Outputs
 
 Description
 -------------
-This script joins scalar results of a group of scenarios.
+This script joins scalar results of a group of scenarios and saves them in oemof_b3 scalars
+format.
 """
 import os
 import sys
 
-import pandas as pd
-
 from oemof_b3.config import config
-
-
-def load_scalars(path):
-    scalars = pd.read_csv(
-        path, index_col=[0, 1, 2], sep=config.settings.general.separator
-    )
-    return scalars
+from oemof_b3.tools.data_processing import save_df
+from oemof_b3.tools.results import ResultsStore
 
 
 if __name__ == "__main__":
@@ -37,17 +31,13 @@ if __name__ == "__main__":
 
     destination = sys.argv[-1]
 
-    joined_scalars = list()
-    for path_sc in paths_scenarios:
-        scalars = load_scalars(os.path.join(path_sc, "scalars.csv"))
-
-        joined_scalars.append(scalars)
+    joined_scalars = ResultsStore(paths_scenarios).scalars
 
-    joined_scalars = pd.concat(joined_scalars)
+    # The ids of the scalars of each scenario start at 0, renumber them to keep them unique
+    joined_scalars = joined_scalars.reset_index(drop=True)
+    joined_scalars.index.name = config.settings.general.scal_index_name
 
     if not os.path.exists(destination):
         os.makedirs(destination)
 
-    joined_scalars.to_csv(
-        os.path.join(destination, "scalars.csv"), sep=config.settings.general.separator
-    )
+    save_df(joined_scalars, os.path.join(destination, "scalars.csv"))
@@ -3,6 +3,8 @@ import pathlib
 
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config import config
+from oemof_b3.tools.results import ResultsStore
+from oemof_b3.tools.timing import Profiler
 
 
 if __name__ == "__main__":
@@ -13,32 +15,31 @@ if __name__ == "__main__":
     target.mkdir(exist_ok=True)
     logger = config.add_snake_logger("map_results_to_b3_format")
 
-    scenario = postprocessed.parts[-2]
+    with Profiler(
+        "map_results_to_b3_format", postprocessed.parent, logger=logger.info
+    ) as profiler:
+        store = ResultsStore(str(postprocessed))
 
-    # map sequences
-    sequences = postprocessed / "sequences" / "by_variable"
-    for path in sequences.iterdir():
-        file_name = str(path.parts[-1])
+        # map sequences
+        for name in store.list_sequences("by_variable"):
+            file_name = name + ".csv"
 
-        ts = dp.load_tabular_results_ts(path)
+            with profiler.span(f"map {name}") as span:
+                ts = store.get_b3_sequences(name, subdir="by_variable")
+                span.add_shape(ts)
 
-        ts = dp.oemof_results_ts_to_oemof_b3(ts)
+                dp.save_df(ts, target / file_name)
 
-        ts["scenario_key"] = scenario
+            logger.info(
+                f"Saved mapped timeseries results in b3 format to {target / file_name}"
+            )
 
-        dp.save_df(ts, target / file_name)
+        # map scalars
+        with profiler.span("map scalars") as span:
+            span.add_shape(store.scalars)
+
+            dp.save_df(store.scalars, target / "scalars.csv")
 
         logger.info(
-            f"Saved mapped timeseries results in b3 format to {target / file_name}"
+            f"Saved mapped scalar results in b3 format to {target / 'scalars.csv'}"
         )
-
-    # map scalars
-    scal = dp.load_tabular_results_scal(postprocessed / "scalars.csv")
-
-    scal = scal.rename(columns={"scenario": "scenario_key"})
-
-    scal = dp.format_header(scal, dp.HEADER_B3_SCAL, "id_scal")
-
-    dp.save_df(scal, target / "scalars.csv")
-
-    logger.info(f"Saved mapped scalar results in b3 format to {target / file_name}")
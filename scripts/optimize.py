@@ -29,6 +29,11 @@ The following constraints are added:
       [`equate_flows.py`](https://github.com/oemof/oemof-solph/blob/features/equate-flows/src/oemof/solph/constraints/equate_variables.py)
       of oemof.solph into `/tools` directory of `oemof-B3`.
 
+Before the model is built, components that provably have no flows (e.g. zero capacity and not
+expandable) and buses only connected to them are removed if
+``config.settings.optimize.prune_inactive`` is True. They are added to the results with zero
+flows after solving.
+
 The EnergySystem with results, meta-results and parameters is saved.
 """
 import logging
@@ -47,7 +52,8 @@ from oemof.tabular.facades import TYPEMAP
 from oemof_b3.tools import data_processing as dp
 from oemof.solph.constraints.equate_flows import equate_flows_by_keyword
 from oemof_b3.config import config
-from oemof_b3.tools.timing import Timer
+from oemof_b3.tools import presolve
+from oemof_b3.tools.timing import Profiler
 
 
 logger = logging.getLogger()
@@ -214,90 +220,123 @@ if __name__ == "__main__":
     if not os.path.exists(optimized):
         os.mkdir(optimized)
 
-    try:
+    with Profiler(
+        "optimize", os.path.dirname(os.path.normpath(optimized)), logger=logger.info
+    ) as profiler:
+        # flows removed from the energy system before building the model, see presolve
+        removed_nodes, removed_flows = [], {}
 
-        logger.info(
-            f"Created solph.EnergSystem using oemof.solph version '{solph.__version__}'."
-        )
+        try:
 
-        with Timer(text="Created solph.Energystem.", logger=logger.info):
-            es = EnergySystem.from_datapackage(
-                os.path.join(preprocessed, config.settings.optimize.filename_metadata),
-                attributemap={},
-                typemap=TYPEMAP,
+            logger.info(
+                f"Created solph.EnergSystem using oemof.solph version '{solph.__version__}'."
             )
 
-        # Reduce number of timestep for debugging
-        if config.settings.optimize.debug:
-            es.timeindex = es.timeindex[:3]
-            es.timeincrement = es.timeincrement[:3]
+            with profiler.span("create energysystem", text="Created solph.Energystem."):
+                es = EnergySystem.from_datapackage(
+                    os.path.join(
+                        preprocessed, config.settings.optimize.filename_metadata
+                    ),
+                    attributemap={},
+                    typemap=TYPEMAP,
+                )
 
-            logger.info("Using DEBUG mode: Running model with first 3 timesteps only.")
+            # Reduce number of timestep for debugging
+            if config.settings.optimize.debug:
+                es.timeindex = es.timeindex[:3]
+                es.timeincrement = es.timeincrement[:3]
 
-        # add output_parameters of bpchp
-        if bpchp_out is not None:
-            es = add_output_parameters_to_bpchp(parameters=bpchp_out, energysystem=es)
+                logger.info(
+                    "Using DEBUG mode: Running model with first 3 timesteps only."
+                )
 
-        # create model from energy system (this is just oemof.solph)
-        logger.info("Creating solph.Model.")
+            # add output_parameters of bpchp
+            if bpchp_out is not None:
+                es = add_output_parameters_to_bpchp(
+                    parameters=bpchp_out, energysystem=es
+                )
 
-        with Timer(text="Created solph.Model.", logger=logger.info):
-            m = Model(es)
+            # remove components without flows from the model
+            es_model = es
+            if config.settings.optimize.prune_inactive:
+                with profiler.span("prune energysystem"):
+                    (
+                        es_model,
+                        removed_nodes,
+                        removed_flows,
+                    ) = presolve.prune_energysystem(es)
+
+            # create model from energy system (this is just oemof.solph)
+            logger.info("Creating solph.Model.")
+
+            with profiler.span("create model", text="Created solph.Model."):
+                m = Model(es_model)
+
+            # add constraints
+            logger.info("Setting constraints.")
+
+            if emission_limit is not None:
+                constraints.emission_limit(m, limit=emission_limit)
+            if el_gas_relations is not None:
+                add_electricity_gas_relation_constraints(
+                    model=m, relations=el_gas_relations
+                )
 
-        # add constraints
-        logger.info("Setting constraints.")
+            # tell the model to get the dual variables when solving
+            if config.settings.optimize.receive_duals:
+                m.receive_duals()
 
-        if emission_limit is not None:
-            constraints.emission_limit(m, limit=emission_limit)
-        if el_gas_relations is not None:
-            add_electricity_gas_relation_constraints(
-                model=m, relations=el_gas_relations
+            # save solver log to scenario specific location
+            solve_kwargs = config.settings.optimize.solve_kwargs
+            solve_kwargs["logfile"] = (
+                logfile.split("." + logfile.split(".")[-1])[0] + "_solver_log.log"
             )
 
-        # tell the model to get the dual variables when solving
-        if config.settings.optimize.receive_duals:
-            m.receive_duals()
-
-        # save solver log to scenario specific location
-        solve_kwargs = config.settings.optimize.solve_kwargs
-        solve_kwargs["logfile"] = (
-            logfile.split("." + logfile.split(".")[-1])[0] + "_solver_log.log"
-        )
-
-        logger.info(
-            f"Solving with solver '{config.settings.optimize.solver}' "
-            f"using solve_kwargs '{config.settings.optimize.solve_kwargs}' "
-            f"and cmdline_options '{config.settings.optimize.cmdline_options}'."
-        )
+            logger.info(
+                f"Solving with solver '{config.settings.optimize.solver}' "
+                f"using solve_kwargs '{config.settings.optimize.solve_kwargs}' "
+                f"and cmdline_options '{config.settings.optimize.cmdline_options}'."
+            )
 
-        with Timer(text="Solved the model.", logger=logger.info):
-            if config.settings.optimize.write_lp_file:
-                m.write(
-                    os.path.join(optimized, "optimized.lp"),
-                    io_options={"symbolic_solver_labels": True},
+            with profiler.span("solve", text="Solved the model."):
+                if config.settings.optimize.write_lp_file:
+                    m.write(
+                        os.path.join(optimized, "optimized.lp"),
+                        io_options={"symbolic_solver_labels": True},
+                    )
+                m.solve(
+                    solver=config.settings.optimize.solver,
+                    solve_kwargs=config.settings.optimize.solve_kwargs,
+                    cmdline_options=config.settings.optimize.cmdline_options,
                 )
-            m.solve(
-                solver=config.settings.optimize.solver,
-                solve_kwargs=config.settings.optimize.solve_kwargs,
-                cmdline_options=config.settings.optimize.cmdline_options,
+
+        except:  # noqa: E722
+            logger.exception(
+                f"Could not optimize energysystem for datapackage from '{preprocessed}'."
             )
+            # reconnect the removed components
+            presolve.restore_energysystem(removed_flows)
+            raise
 
-    except:  # noqa: E722
-        logger.exception(
-            f"Could not optimize energysystem for datapackage from '{preprocessed}'."
-        )
-        raise
+        else:
 
-    else:
+            logger.info("Model solved. Collecting results.")
 
-        logger.info("Model solved. Collecting results.")
+            # get results from the solved model(still oemof.solph)
+            with profiler.span("collect results"):
+                es.meta_results = processing.meta_results(m)
+                es.results = processing.results(m)
+
+                # add the removed components with zero flows
+                presolve.restore_energysystem(removed_flows)
+                es.results = presolve.add_zero_results(
+                    es.results, removed_nodes, removed_flows, es.timeindex
+                )
 
-        # get results from the solved model(still oemof.solph)
-        es.meta_results = processing.meta_results(m)
-        es.results = processing.results(m)
-        es.params = processing.parameter_as_dict(es)
+                es.params = processing.parameter_as_dict(es)
 
-        # dump the EnergySystem
-        es.dump(optimized)
+            # dump the EnergySystem
+            with profiler.span("dump energysystem"):
+                es.dump(optimized)
 
-        logger.info(f"Results saved to {optimized}.")
+            logger.info(f"Results saved to {optimized}.")
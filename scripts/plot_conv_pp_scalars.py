@@ -30,6 +30,7 @@ import pandas as pd
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config.config import LABELS, COLORS
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
 
 # User input
 # converting from MW to W
@@ -154,6 +155,9 @@ if __name__ == "__main__":
     if not os.path.exists(target_dir):
         os.makedirs(target_dir)
 
+    profiler = Profiler("plot_conv_pp_scalars", os.path.dirname(resources))
+    profiler.start()
+
     # Load scalar data
     df_conv_pp_scalars = dp.load_b3_scalars(resources)
 
@@ -173,3 +177,5 @@ if __name__ == "__main__":
     target_path = target.split(".")[0] + config.settings.general.plot_filetype
 
     plt.savefig(target_path, bbox_inches="tight")
+
+    profiler.stop()
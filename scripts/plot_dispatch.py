@@ -10,6 +10,9 @@ plotted : str
     the plots are saved
 logfile : str
     ``results/{scenario}/{scenario}.log``: path to logfile
+--jobs : int
+    Optional number of processes used to render the plots. Defaults to
+    *plot_jobs.jobs* in ``oemof_b3/config/settings.yaml``.
 
 Outputs
 ---------
@@ -19,13 +22,17 @@ Outputs
 Description
 -------------
 The script creates dispatch plots based on plot_dispatch and plot_dispatch_plotly
-functions in oemoflex.
+functions in oemoflex. Before plotting, the number of time steps is reduced as defined by
+*plot_dispatch.downsample* in ``oemof_b3/config/settings.yaml``. With
+*plot_dispatch.multi_resolution*, the interactive plots show the reduced data first and
+full resolution data when zooming in.
 The static plots are saved with a file format defined by the *plot_filetype* variable in
 ``oemof_b3/config/settings.yaml`` and the interactive plotly plots as html-files
 in a new directory called dispatch within directory plotted.
 Timeframes and the carrier for the plot can be chosen.
 """
 
+import logging
 import sys
 import os
 import pandas as pd
@@ -36,16 +43,27 @@ import matplotlib.dates as mdates
 from oemof_b3.config.config import LABELS, COLORS
 from oemof_b3.config import config
 from oemof_b3.tools import data_processing as dp
+from oemof_b3.tools.plots import (
+    PlotScheduler,
+    downsample_dispatch_data,
+    write_multi_resolution_html,
+)
+from oemof_b3.tools.results import ResultsStore
+from oemof_b3.tools.timing import Profiler
 
+logger = logging.getLogger()
 
-def prepare_dispatch_data(bus_file):
+
+def prepare_dispatch_data(store, bus_name):
     """
     This function prepares data for the dispatch plot
 
     Parameters
     ----------
-    bus_file: str
-        File name of the bus file
+    store: oemof_b3.tools.results.ResultsStore
+        Store of the postprocessed results
+    bus_name: str
+        Name of the bus
 
     Returns
     -------
@@ -57,16 +75,7 @@ def prepare_dispatch_data(bus_file):
         Name of the bus
 
     """
-    bus_name = os.path.splitext(bus_file)[0]
-    bus_path = os.path.join(bus_directory, bus_file)
-
-    data = pd.read_csv(
-        bus_path,
-        header=[0, 1, 2],
-        parse_dates=[0],
-        index_col=[0],
-        sep=config.settings.general.separator,
-    )
+    data = store.get_sequences(bus_name, subdir="bus")
 
     # convert data to SI-unit
     MW_to_W = 1e6
@@ -83,7 +92,7 @@ def prepare_dispatch_data(bus_file):
     return df, df_demand, bus_name
 
 
-def plot_dispatch_data(df, df_demand, bus_name):
+def plot_dispatch_data(df, df_demand, bus_name, plotted):
     """
     This function contains the plotting of dispatch data
 
@@ -95,30 +104,56 @@ def plot_dispatch_data(df, df_demand, bus_name):
         Dataframe with demand
     bus_name: str
         Name of the bus
+    plotted: str
+        Directory the plots are saved to
 
     Returns
     -------
-
+    file_paths: list
+        Paths of the saved plots
     """
-    # change colors for demand in colors_odict to black
+    file_paths = []
+
+    # change colors for demand to black, in a copy as jobs can run in the same process
+    colors = COLORS.copy()
     for i in df_demand.columns:
-        COLORS[i] = "#000000"
+        colors[i] = "#000000"
+
+    # reduce the number of time steps of full-year data before plotting
+    df_downsampled, df_demand_downsampled = downsample_dispatch_data(df, df_demand)
 
     # interactive plotly dispatch plot
     fig_plotly = plots.plot_dispatch_plotly(
-        df=df, df_demand=df_demand, unit="W", colors_odict=COLORS
+        df=df_downsampled,
+        df_demand=df_demand_downsampled,
+        unit="W",
+        colors_odict=colors,
     )
     file_name = bus_name + "_dispatch_interactive" + ".html"
-    fig_plotly.write_html(
-        file=os.path.join(plotted, file_name),
-        # The following parameters are set according to
-        # https://plotly.github.io/plotly.py-docs/generated/plotly.io.write_html.html
-        # The files are much smaller now because a script tag containing the plotly.js source
-        # code (~3MB) is not included in the output anymore. It is refered to plotlyjs via a
-        # link in div of the plot.
-        include_plotlyjs="cdn",
-        full_html=False,
-    )
+    file_paths.append(os.path.join(plotted, file_name))
+
+    # The following parameters are set according to
+    # https://plotly.github.io/plotly.py-docs/generated/plotly.io.write_html.html
+    # The files are much smaller now because a script tag containing the plotly.js source
+    # code (~3MB) is not included in the output anymore. It is refered to plotlyjs via a
+    # link in div of the plot.
+    html_kwargs = dict(include_plotlyjs="cdn", full_html=False)
+
+    if config.settings.plot_dispatch.multi_resolution and len(df_downsampled) < len(df):
+        # show the downsampled data first and full resolution data when zooming in
+        fig_plotly_full = plots.plot_dispatch_plotly(
+            df=df, df_demand=df_demand, unit="W", colors_odict=colors
+        )
+        data_file = write_multi_resolution_html(
+            fig_plotly,
+            fig_plotly_full,
+            file_paths[-1],
+            n_points=config.settings.plot_dispatch.downsample.n_points,
+            **html_kwargs,
+        )
+        file_paths.append(data_file)
+    else:
+        fig_plotly.write_html(file=file_paths[-1], **html_kwargs)
 
     # normal dispatch plot
     # plot one winter and one summer month
@@ -142,13 +177,17 @@ def plot_dispatch_data(df, df_demand, bus_name):
             logger.warning(f"Data for bus '{bus_name}' is empty, cannot plot.")
             continue
 
+        df_time_filtered, df_demand_time_filtered = downsample_dispatch_data(
+            df_time_filtered, df_demand_time_filtered
+        )
+
         # plot time filtered data
         plots.plot_dispatch(
             ax=ax,
             df=df_time_filtered,
             df_demand=df_demand_time_filtered,
             unit="W",
-            colors_odict=COLORS,
+            colors_odict=colors,
         )
 
         plt.grid()
@@ -206,7 +245,10 @@ def plot_dispatch_data(df, df_demand, bus_name):
         file_name = (
             bus_name + "_" + start_date[5:7] + config.settings.general.plot_filetype
         )
-        plt.savefig(os.path.join(plotted, file_name), bbox_inches="tight")
+        file_paths.append(os.path.join(plotted, file_name))
+        plt.savefig(file_paths[-1], bbox_inches="tight")
+
+    return file_paths
 
 
 def get_df_for_aggregation(list_with_dfs):
@@ -257,12 +299,14 @@ def reduce_labels(ax, simple_labels_dict):
     return handles, labels
 
 
-def aggregate_by_region(bus_files, carrier):
+def aggregate_by_region(store, bus_files, carrier):
     """
     This function aggregates data of busses and demand by region
 
     Parameters
     ----------
+    store: oemof_b3.tools.results.ResultsStore
+        Store of the postprocessed results
     bus_files: pd.DataFrame
         Dataframe with bus data from ``results/{scenario}/postprocessed/sequences/bus``
 
@@ -287,7 +331,7 @@ def aggregate_by_region(bus_files, carrier):
     busses_to_be_aggregated = [file for file in bus_files if carrier in file]
     if len(busses_to_be_aggregated) > 1:
         for bus_to_be_aggregated in busses_to_be_aggregated:
-            df, df_demand, bus_name = prepare_dispatch_data(bus_to_be_aggregated)
+            df, df_demand, bus_name = prepare_dispatch_data(store, bus_to_be_aggregated)
 
             list_df_stacked.append(dp.stack_timeseries(df))
             list_df_demand_stacked.append(dp.stack_timeseries(df_demand))
@@ -322,24 +366,49 @@ if __name__ == "__main__":
     if not os.path.exists(plotted):
         os.makedirs(plotted)
 
-    bus_directory = os.path.join(postprocessed, "sequences/bus/")
-    bus_files = os.listdir(bus_directory)
+    scenario_dir = os.path.dirname(os.path.normpath(postprocessed))
+
+    profiler = Profiler("plot_dispatch", scenario_dir)
+    profiler.start()
+
+    store = ResultsStore(postprocessed)
+    bus_files = store.list_sequences("bus")
 
     # select carrier
     carriers = ["electricity", "heat_central", "heat_decentral"]
 
     selected_bus_files = [
-        file for file in bus_files for carrier in carriers if carrier in file
+        file for file in bus_files if any(carrier in file for carrier in carriers)
     ]
-    for carrier in carriers:
-        try:
-            df_aggregated, df_demand_aggregated, bus_name = aggregate_by_region(
-                bus_files, carrier
+    scheduler = PlotScheduler(plotted, scenario_dir)
+
+    # prepare data in this process, render plots in parallel
+    with profiler.span("prepare data"):
+        for carrier in carriers:
+            try:
+                df_aggregated, df_demand_aggregated, bus_name = aggregate_by_region(
+                    store, bus_files, carrier
+                )
+            except Exception:
+                logger.warning(f"Could not plot dispatch for carrier {carrier}")
+                continue
+
+            scheduler.add(
+                bus_name,
+                plot_dispatch_data,
+                df_aggregated,
+                df_demand_aggregated,
+                bus_name,
+                plotted,
+            )
+
+        for bus_file in selected_bus_files:
+            df, df_demand, bus_name = prepare_dispatch_data(store, bus_file)
+            scheduler.add(
+                bus_name, plot_dispatch_data, df, df_demand, bus_name, plotted
             )
-            plot_dispatch_data(df_aggregated, df_demand_aggregated, bus_name)
-        except Exception:
-            logger.warning(f"Could not plot dispatch for carrier {carrier}")
 
-    for bus_file in selected_bus_files:
-        df, df_demand, bus_name = prepare_dispatch_data(bus_file)
-        plot_dispatch_data(df, df_demand, bus_name)
+    with profiler.span("render plots"):
+        scheduler.run()
+
+    profiler.stop()
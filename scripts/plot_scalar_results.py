@@ -2,13 +2,16 @@
 r"""
 Inputs
 -------
-scalars_path : str
+postprocessed : str
     ``results/{scenario}/postprocessed/``: path to directory containing postprocessed results.
 target : str
     ``results/{scenario}/plotted/scalars/``: path where a new directory is
     created and the plots are saved.
 logfile : str
     ``results/{scenario}/{scenario}.log``: path to logfile
+--jobs : int
+    Optional number of processes used to render the plots. Defaults to
+    *plot_jobs.jobs* in ``oemof_b3/config/settings.yaml``.
 
 Outputs
 ---------
@@ -19,17 +22,19 @@ Description
 -------------
 The result scalars of all scenarios are plotted in a single plot.
 """
+import functools
 import logging
 import os
 import sys
 
 import matplotlib.pyplot as plt
 import oemoflex.tools.plots as plots
-import pandas as pd
 
 from oemof_b3.config import config
 from oemof_b3.config.config import COLORS, LABELS
 from oemof_b3.tools import data_processing as dp
+from oemof_b3.tools.results import ResultsStore
+from oemof_b3.tools.timing import Profiler
 from oemof_b3.tools.plots import (
     prepare_scalar_data,
     swap_multiindex_levels,
@@ -41,6 +46,7 @@ from oemof_b3.tools.plots import (
     draw_standalone_legend,
     set_hierarchical_xlabels,
     set_scenario_labels,
+    PlotScheduler,
 )
 
 logger = logging.getLogger()
@@ -49,114 +55,118 @@ POS_VLINE = 3
 
 
 def try_to_plot(func):
+    @functools.wraps(func)
     def decorated_func(*args, **kwargs):
         try:
-            func(*args, **kwargs)
+            return func(*args, **kwargs)
         except Exception as e:
             logger.warning(f"Could not plot '{func.__name__}' because: {e}.")
 
     return decorated_func
 
 
+def select_scalars(scalars, exclude_types=None, **filters):
+    r"""
+    Selects the scalars of a plot with :py:func:`oemof_b3.tools.data_processing.multi_filter_df`
+    and drops the rows whose 'type' is in `exclude_types`.
+    """
+    df = dp.multi_filter_df(scalars, **filters)
+    if exclude_types is not None:
+        df = dp.filter_df(df, "type", exclude_types, inverse=True)
+    return df
+
+
 @try_to_plot
-def plot_invest_out(carrier):
+def plot_invest_out(df, target, carrier):
     var_name = f"invest_out_{carrier}"
     unit = "W"
     output_path_plot = os.path.join(
         target, var_name + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
     df = prepare_scalar_data(df)
     draw_plot(df, unit=unit, title=None)
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_storage_capacity(carrier):
+def plot_storage_capacity(df, target, carrier):
     title = f"storage_capacity_{carrier}"
     output_path_plot = os.path.join(
         target, title + config.settings.general.plot_filetype
     )
-    var_name = "storage_capacity"
     unit = "Wh"
 
-    df = dp.multi_filter_df(scalars, var_name=var_name, carrier=carrier)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
     df = prepare_scalar_data(df)
     draw_plot(df, unit=unit, title=None)
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_storage_invest(carrier):
+def plot_storage_invest(df, target, carrier):
     title = f"storage_invest_{carrier}"
     output_path_plot = os.path.join(
         target, f"{title}" + config.settings.general.plot_filetype
     )
-    var_name = "invest"
     unit = "Wh"
 
-    df = dp.multi_filter_df(scalars, var_name=var_name, carrier=carrier)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
     df = prepare_scalar_data(df)
     draw_plot(df, unit=unit, title=None)
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_flow_out(carrier):
+def plot_flow_out(df, target, carrier):
     title = f"production_{carrier}"
     output_path_plot = os.path.join(
         target, f"{title}" + config.settings.general.plot_filetype
     )
-    var_name = f"flow_out_{carrier}"
     unit = "Wh"
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
-    df = dp.filter_df(
-        df,
-        "type",
-        ["storage", "asymmetric_storage", "link"],
-        inverse=True,
-    )
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
     df = prepare_scalar_data(df)
     draw_plot(df, unit=unit, title=None)
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_storage_out(carrier):
+def plot_storage_out(df, target, carrier):
     title = f"storage_out_{carrier}"
     output_path_plot = os.path.join(
         target, f"{title}" + config.settings.general.plot_filetype
     )
-    var_name = f"flow_out_{carrier}"
     unit = "Wh"
 
-    df = dp.multi_filter_df(var_name=var_name)
-    df = dp.filter_df(df, "type", ["storage", "asymmetric_storage"])
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
     df = prepare_scalar_data(df)
     draw_plot(df, unit=unit, title=None)
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_invest_out_multi_carrier(carriers):
-    var_name = [f"invest_out_{carrier}" for carrier in carriers]
+def plot_invest_out_multi_carrier(df, target):
     unit = "W"
     output_path_plot = os.path.join(
         target, "energy_usage" + config.settings.general.plot_filetype
     )
-    df = dp.multi_filter_df(scalars, var_name=var_name)
     df = df.replace({"invest_out_*": ""}, regex=True)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
@@ -189,17 +199,16 @@ def plot_invest_out_multi_carrier(carriers):
 
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_flow_out_multi_carrier(carriers):
-    var_name = [f"flow_out_{carrier}" for carrier in carriers]
+def plot_flow_out_multi_carrier(df, target):
     unit = "Wh"
     output_path_plot = os.path.join(
         target, "summed_energy" + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
-    df = dp.filter_df(df, column_name="type", values="storage", inverse=True)
     df = df.replace({"flow_out_*": ""}, regex=True)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
@@ -233,17 +242,16 @@ def plot_flow_out_multi_carrier(carriers):
 
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_demands(carriers):
-    var_name = [f"flow_in_{carrier}" for carrier in carriers]
-    tech = "demand"
+def plot_demands(df, target):
     unit = "Wh"
     output_path_plot = os.path.join(
         target, "demands" + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name, tech=tech)
     df = df.replace({"flow_in_*": ""}, regex=True)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
@@ -277,18 +285,17 @@ def plot_demands(carriers):
 
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def subplot_invest_out_multi_carrier(carriers):
-    var_name = [f"invest_out_{carrier}" for carrier in carriers]
+def subplot_invest_out_multi_carrier(df, target):
     unit = "W"
     output_path_plot = os.path.join(
         target,
         "invested_capacity_subplots" + config.settings.general.plot_filetype,
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
-
     # replacing invest_out_<carrier> with <carrier> to subplot by carrier
     df = df.replace({"invest_out_*": ""}, regex=True)
     if config.settings.plot_scalar_results.agg_regions:
@@ -307,19 +314,18 @@ def subplot_invest_out_multi_carrier(carriers):
     plt.tight_layout()
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def subplot_storage_invest_multi_carrier(carriers):
-    var_name = "invest"
+def subplot_storage_invest_multi_carrier(df, target):
     unit = "Wh"
     output_path_plot = os.path.join(
         target, "storage_invest_subplots" + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
-
     # replacing invest with <carrier> to subplot by carrier
-    df["var_name"] = df["carrier"]
+    df = df.assign(var_name=df["carrier"])
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
     df = prepare_scalar_data(df)
@@ -329,17 +335,16 @@ def subplot_storage_invest_multi_carrier(carriers):
     plt.tight_layout()
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def subplot_demands(carriers):
-    var_name = [f"flow_in_{carrier}" for carrier in carriers]
-    tech = "demand"
+def subplot_demands(df, target):
     unit = "Wh"
     output_path_plot = os.path.join(
         target, "demands_subplots" + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name, tech=tech)
     df = df.replace({"flow_in_*": ""}, regex=True)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
@@ -357,18 +362,16 @@ def subplot_demands(carriers):
     plt.tight_layout()
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def subplot_energy_usage_multi_carrier(carriers):
-    var_name = [f"flow_in_{carrier}" for carrier in carriers]
+def subplot_energy_usage_multi_carrier(df, target):
     unit = "Wh"
     output_path_plot = os.path.join(
         target, "energy_usage_subplots" + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
-    # exclude storage charging
-    df = dp.filter_df(df, column_name="type", values="storage", inverse=True)
     df = df.replace({"flow_in_*": ""}, regex=True)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
@@ -386,17 +389,16 @@ def subplot_energy_usage_multi_carrier(carriers):
     plt.tight_layout()
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def subplot_flow_out_multi_carrier(carriers):
-    var_name = [f"flow_out_{carrier}" for carrier in carriers]
+def subplot_flow_out_multi_carrier(df, target):
     unit = "Wh"
     output_path_plot = os.path.join(
         target, "summed_energy_subplots" + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
-    df = dp.filter_df(df, column_name="type", values="storage", inverse=True)
     df = df.replace({"flow_out_*": ""}, regex=True)
     if config.settings.plot_scalar_results.agg_regions:
         df = aggregate_regions(df)
@@ -414,20 +416,17 @@ def subplot_flow_out_multi_carrier(carriers):
     plt.tight_layout()
     save_plot(output_path_plot)
 
+    return output_path_plot
+
 
 @try_to_plot
-def plot_demands_stacked_carriers(carriers):
-    var_name = [f"flow_in_{carrier}" for carrier in carriers]
-    tech = "demand"
+def plot_demands_stacked_carriers(df, target):
     unit = "Wh"
     MW_TO_W = 1e6
     output_path_plot = os.path.join(
         target, "demands_stacked" + config.settings.general.plot_filetype
     )
 
-    df = dp.multi_filter_df(scalars, var_name=var_name)
-    # Show only demands
-    df = dp.filter_df(df, column_name="tech", values=tech, inverse=False)
     # Remove "flow_in_" from var_name
     df = df.replace({"flow_in_*": ""}, regex=True)
     # Aggregate regions
@@ -465,10 +464,7 @@ def plot_demands_stacked_carriers(carriers):
     # rename and aggregate duplicated columns
     df = plots.map_labels(df, LABELS)
 
-    fig, ax = draw_plot(df, unit=unit, title=var_name)
-
-    # Reset plot title
-    ax.set_title("")
+    fig, ax = draw_plot(df, unit=unit, title=None)
 
     # Move the legend below current axis
     ax.legend(
@@ -488,26 +484,11 @@ def plot_demands_stacked_carriers(carriers):
 
     save_plot(output_path_plot)
 
-
-def load_scalar_results(path, sep=config.settings.general.separator):
-
-    df = pd.read_csv(path, sep=sep)
-
-    df = df.rename(columns={"scenario": "scenario_key"})
-
-    df["var_value"] = pd.to_numeric(df["var_value"], errors="coerce").fillna(
-        df["var_value"]
-    )
-
-    df = dp.format_header(
-        df, dp.HEADER_B3_SCAL, config.settings.general.scal_index_name
-    )
-
-    return df
+    return output_path_plot
 
 
 if __name__ == "__main__":
-    scalars_path = os.path.join(sys.argv[1], "scalars.csv")
+    postprocessed = sys.argv[1]
     target = sys.argv[2]
 
     logger = config.add_snake_logger("plot_scalar_results")
@@ -520,19 +501,54 @@ if __name__ == "__main__":
     if not os.path.exists(target):
         os.makedirs(target)
 
+    scenario_dir = os.path.dirname(os.path.normpath(postprocessed))
+
+    profiler = Profiler("plot_scalar_results", scenario_dir)
+    profiler.start()
+
     # Load scalar data
-    scalars = load_scalar_results(scalars_path)
-    scalars = set_scenario_labels(scalars)
-
-    plot_invest_out_multi_carrier(CARRIERS_WO_CH4)
-    plot_flow_out_multi_carrier(CARRIERS_WO_CH4)
-    plot_demands(CARRIERS)
-    subplot_invest_out_multi_carrier(CARRIERS_WO_CH4)
-    subplot_storage_invest_multi_carrier(CARRIERS_WO_CH4)
-    subplot_flow_out_multi_carrier(CARRIERS_WO_CH4)
-    subplot_demands(CARRIERS)
-    subplot_energy_usage_multi_carrier(CARRIERS)
-    plot_demands_stacked_carriers(CARRIERS)
+    with profiler.span("load scalars") as span:
+        scalars = ResultsStore(postprocessed).scalars
+        scalars = set_scenario_labels(scalars)
+        span.add_shape(scalars)
+
+    scheduler = PlotScheduler(target, scenario_dir)
+
+    invest_out = [f"invest_out_{carrier}" for carrier in CARRIERS_WO_CH4]
+    flow_out = [f"flow_out_{carrier}" for carrier in CARRIERS_WO_CH4]
+    flow_in = [f"flow_in_{carrier}" for carrier in CARRIERS]
+
+    # The scalars of each plot are selected once here, so that each job only gets its slice
+    with profiler.span("select scalars"):
+        selections = {}
+        for plot_func, filters in [
+            (plot_invest_out_multi_carrier, dict(var_name=invest_out)),
+            (
+                plot_flow_out_multi_carrier,
+                dict(var_name=flow_out, exclude_types="storage"),
+            ),
+            (plot_demands, dict(var_name=flow_in, tech="demand")),
+            (subplot_invest_out_multi_carrier, dict(var_name=invest_out)),
+            (subplot_storage_invest_multi_carrier, dict(var_name="invest")),
+            (
+                subplot_flow_out_multi_carrier,
+                dict(var_name=flow_out, exclude_types="storage"),
+            ),
+            (subplot_demands, dict(var_name=flow_in, tech="demand")),
+            (
+                subplot_energy_usage_multi_carrier,
+                dict(var_name=flow_in, exclude_types="storage"),
+            ),
+            (plot_demands_stacked_carriers, dict(var_name=flow_in, tech="demand")),
+        ]:
+            key = repr(sorted(filters.items()))
+            if key not in selections:
+                selections[key] = select_scalars(scalars, **filters)
+
+            scheduler.add(plot_func.__name__, plot_func, selections[key], target)
+
+    with profiler.span("render plots"):
+        scheduler.run()
 
     standalone_legend = False
     if standalone_legend:
@@ -540,3 +556,5 @@ if __name__ == "__main__":
         plt.savefig(
             os.path.join(target, "legend" + config.settings.general.plot_filetype)
         )
+
+    profiler.stop()
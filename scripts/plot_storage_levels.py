@@ -27,7 +27,6 @@ Timeframes and the carrier for the plot can be chosen.
 
 import sys
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
 import oemoflex.tools.plots as plots
 import matplotlib.dates as mdates
@@ -35,6 +34,8 @@ import matplotlib.dates as mdates
 from oemof_b3.config import config
 from oemof_b3.config.config import LABELS, COLORS
 from oemof_b3.tools import data_processing as dp
+from oemof_b3.tools.results import ResultsStore
+from oemof_b3.tools.timing import Profiler
 
 
 def reduce_labels(ax, simple_labels_dict):
@@ -132,13 +133,14 @@ if __name__ == "__main__":
     )
     MW_to_W = 1e6
 
-    data = pd.read_csv(
-        STORAGE_LEVEL_FILE,
-        header=[0, 1, 2],
-        parse_dates=[0],
-        index_col=[0],
-        delimiter=";",
+    profiler = Profiler(
+        "plot_storage_levels", os.path.dirname(os.path.normpath(postprocessed))
     )
+    profiler.start()
+
+    with profiler.span("load storage content") as span:
+        data = ResultsStore(postprocessed).get_sequences("storage_content")
+        span.add_shape(data)
 
     # select carrier
     carriers = ["electricity", "heat_central", "heat_decentral"]
@@ -201,3 +203,5 @@ if __name__ == "__main__":
             + config.settings.general.plot_filetype
         )
         plt.savefig(os.path.join(plotted, file_name), bbox_inches="tight")
+
+    profiler.stop()
@@ -33,6 +33,7 @@ from oemoflex import config as oemoflex_config
 from oemoflex.model.datapackage import ResultsDataPackage
 
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
 
 
 if __name__ == "__main__":
@@ -47,24 +48,32 @@ if __name__ == "__main__":
 
     oemoflex_config.config.settings.SEPARATOR = config.settings.general.separator
 
-    try:
-        es = EnergySystem()
+    with Profiler(
+        "postprocess",
+        os.path.dirname(os.path.normpath(destination)),
+        logger=logger.info,
+    ) as profiler:
+        try:
+            with profiler.span("restore energysystem"):
+                es = EnergySystem()
 
-        es.restore(optimized)
+                es.restore(optimized)
 
-        rdp = ResultsDataPackage.from_energysytem(es)
+            with profiler.span("create results datapackage"):
+                rdp = ResultsDataPackage.from_energysytem(es)
 
-        rdp.set_scenario_name(scenario_name)
+                rdp.set_scenario_name(scenario_name)
 
-        rdp.to_csv_dir(destination)
+            with profiler.span("save results"):
+                rdp.to_csv_dir(destination)
 
-        pd.Series({"objective": es.meta_results["objective"]}).to_csv(
-            os.path.join(destination, "objective.csv"),
-            sep=config.settings.general.separator,
-        )
+                pd.Series({"objective": es.meta_results["objective"]}).to_csv(
+                    os.path.join(destination, "objective.csv"),
+                    sep=config.settings.general.separator,
+                )
 
-    except:  # noqa: E722
-        logger.exception(
-            f"Could not postprocess data from energysystem in '{optimized}'."
-        )
-        raise
+        except:  # noqa: E722
+            logger.exception(
+                f"Could not postprocess data from energysystem in '{optimized}'."
+            )
+            raise
@@ -25,8 +25,11 @@ Description
 The script filters the OPSD conventional power plant package for power plants in the regions Berlin
 and Brandenburg. The retrieved data is stored in a new dataframe, aggregated and saved as a csv file
 in the format of the scalar data template. Only operating power plants are considered.
+If *prepare_conv_pp.geo_cache_dir* is set, the regions of Berlin and Brandenburg are cached there,
+so that the geopackage of all regions in Germany is only read if it or `in_path3` changes.
 """
 
+import os
 import sys
 
 import pandas as pd
@@ -34,6 +37,7 @@ import pandas as pd
 import oemof_b3.tools.data_processing as dp
 import oemof_b3.tools.geo as geo
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
 from oemof_b3.config.config import load_yaml
 
 
@@ -43,16 +47,22 @@ if __name__ == "__main__":
     in_path3 = sys.argv[3]  # path to b3_regions.yaml
     out_path = sys.argv[4]
 
+    profiler = Profiler("prepare_conv_pp", os.path.dirname(out_path))
+    profiler.start()
+
     pp_opsd_de = pd.read_csv(in_path1)
     pp_opsd_b3 = pp_opsd_de[pp_opsd_de.state.isin(["Brandenburg", "Berlin"])]
     pp_opsd_b3 = pp_opsd_b3.copy()
     pp_opsd_b3.reset_index(inplace=True, drop=True)
 
-    regions_nuts3_de = geo.load_regions_file(in_path2)
-
     b3_regions_list = load_yaml(in_path3)
 
-    b3_regions_geo = geo.filter_regions_file(regions_nuts3_de, b3_regions_list)
+    with profiler.span("load regions"):
+        b3_regions_geo = geo.load_regions(
+            in_path2,
+            regions=b3_regions_list,
+            cache_dir=config.settings.prepare_conv_pp.geo_cache_dir,
+        )
     pp_opsd_b3 = geo.add_region_to_register(pp_opsd_b3, b3_regions_geo)
 
     # clean up table columns
@@ -160,3 +170,5 @@ if __name__ == "__main__":
 
     # export prepared conventional power plant data
     dp.save_df(conv_scalars_prepared, out_path)
+
+    profiler.stop()
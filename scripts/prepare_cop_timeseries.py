@@ -42,6 +42,7 @@ from oemof_b3.config.config import load_yaml
 from oemof_b3 import model
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
 
 
 def find_regional_files(path, region):
@@ -178,6 +179,9 @@ if __name__ == "__main__":
 
     logger = config.add_snake_logger("prepare_cop_timeseries")
 
+    profiler = Profiler("prepare_cop_timeseries", os.path.dirname(out_path))
+    profiler.start()
+
     # Get constants
     # Quality grade of an air/water heat pump
     QUALITY_GRADE = config.settings.prepare_cop_timeseries.quality_grade
@@ -253,3 +257,5 @@ if __name__ == "__main__":
     )
 
     dp.save_df(final_cops, out_path)
+
+    profiler.stop()
@@ -21,6 +21,8 @@ downloads the 60 min timeseries data from OPSD and keeps it locally.
 The script takes this data and filters for the load data of the 50Hertz region in Germany.
 The load data is normalized with the total electricity demand of the corresponding year and put
 into the timeseries template format. The years 2015 to 2019 (including) are available.
+The raw data is read in chunks of *prepare_electricity_demand.chunksize* rows, parsing only the
+time index and the selected column and keeping only the rows of `opsd_years`.
 Note: the electricity demand profile for electric vehicle charging is prepared in
 `prepare_vehicle_charging_demand.py`.
 
@@ -31,37 +33,53 @@ import pandas as pd
 import os
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
 
 
-def prepare_load_profile_time_series(ts_raw, year, region):
+def load_opsd_time_series(opsd_ts_data, column, years, chunksize=None):
     r"""
-    Prepares and formats time series of load for region 'B' and 'BB'.
-    The load profile is normalized with the total energy demand of a year.
+    Reads one column of the OPSD time series data for the given years. The file is read in
+    chunks and only the time index and `column` are parsed, so that memory use does not depend
+    on the number of columns and years in the raw data.
 
     Parameters
     ----------
-    ts_raw : pd.DataFrame
-        Contains actual load data from 50hertz region from opsd load data
-    year : int
-        Year for which time series is extracted from raw data in `ts_raw`
-    region : str
-        Region of time series; used for column 'region' in output
+    opsd_ts_data : str
+        Path of raw opsd timeseries data
+    column : str
+        Column to read
+    years : list
+        Years to keep
+    chunksize : int
+        Number of rows read at once. Defaults to *prepare_electricity_demand.chunksize*.
 
     Returns
     -------
-    ts_prepared : pd.DataFrame
-        Contains time series in the format of timeseries template.
-
+    ts_raw : pd.DataFrame
+        Time series of `column` with utc DatetimeIndex
     """
-    # copy data frame
-    time_series = ts_raw.copy()
+    if chunksize is None:
+        chunksize = config.settings.prepare_electricity_demand.chunksize
+
+    # The first column holds the time index
+    time_column = pd.read_csv(opsd_ts_data, nrows=0).columns[0]
+
+    chunks = pd.read_csv(
+        opsd_ts_data, usecols=[time_column, column], chunksize=chunksize
+    )
 
-    # extract one specific `year`
-    time_series = time_series[time_series.index.year == year]
+    ts_raw = []
+    for chunk in chunks:
+        chunk.index = pd.to_datetime(chunk.pop(time_column), utc=True)
+        ts_raw.append(chunk.loc[chunk.index.year.isin(years), [column]])
 
-    # normalize with total electricity demand in year
-    time_series.iloc[:, 0] = time_series.iloc[:, 0] / time_series.iloc[:, 0].sum()
+    return pd.concat(ts_raw)
 
+
+def format_load_profile(time_series, region):
+    r"""
+    Brings a normalized load profile to the format of the timeseries template.
+    """
     # bring time series to oemof-B3 format with `stack_timeseries()` and `format_header()`
     ts_stacked = dp.stack_timeseries(time_series).rename(columns={"var_name": "region"})
     ts_prepared = dp.format_header(
@@ -87,29 +105,89 @@ def prepare_load_profile_time_series(ts_raw, year, region):
     return ts_prepared
 
 
+def prepare_load_profile_time_series(ts_raw, year, region):
+    r"""
+    Prepares and formats time series of load for region 'B' and 'BB'.
+    The load profile is normalized with the total energy demand of a year.
+
+    Parameters
+    ----------
+    ts_raw : pd.DataFrame
+        Contains actual load data from 50hertz region from opsd load data
+    year : int
+        Year for which time series is extracted from raw data in `ts_raw`
+    region : str
+        Region of time series; used for column 'region' in output
+
+    Returns
+    -------
+    ts_prepared : pd.DataFrame
+        Contains time series in the format of timeseries template.
+
+    """
+    return prepare_load_profiles(ts_raw, [year], [region])
+
+
+def prepare_load_profiles(ts_raw, years, regions):
+    r"""
+    Prepares and formats time series of load for several years and regions. The load profile
+    of all years is normalized at once with the total energy demand of each year.
+
+    Parameters
+    ----------
+    ts_raw : pd.DataFrame
+        Contains actual load data from 50hertz region from opsd load data
+    years : list
+        Years for which time series are extracted from raw data in `ts_raw`
+    regions : list
+        Regions of time series; the same profile is used for each region
+
+    Returns
+    -------
+    ts_prepared : pd.DataFrame
+        Contains time series in the format of timeseries template, ordered by year and region.
+    """
+    time_series = ts_raw[ts_raw.index.year.isin(years)]
+
+    # normalize with total electricity demand in each year
+    time_series = time_series / time_series.groupby(time_series.index.year).transform(
+        "sum"
+    )
+
+    ts_prepared = []
+    for _, time_series_year in time_series.groupby(time_series.index.year):
+        ts_year = format_load_profile(time_series_year, regions[0])
+
+        for region in regions:
+            ts_region = ts_year.copy()
+            ts_region.loc[:, "region"] = region
+            ts_prepared.append(ts_region)
+
+    return pd.concat(ts_prepared)
+
+
 if __name__ == "__main__":
     opsd_ts_data = sys.argv[1]
     output_file = sys.argv[2]
 
-    # initialize data frame
-    time_series_df = pd.DataFrame()
+    profiler = Profiler("prepare_electricity_demand", os.path.dirname(output_file))
+    profiler.start()
 
-    # download raw time series from OPSD
-    ts_raw = pd.read_csv(opsd_ts_data, index_col=0)
-    ts_raw.index = pd.to_datetime(ts_raw.index, utc=True)
-    # filter for 50hertz actual load
-    ts_raw = ts_raw[[config.settings.prepare_electricity_demand.col_select]]
+    # read 50hertz actual load of `opsd_years` from raw time series from OPSD
+    with profiler.span("load opsd time series") as span:
+        ts_raw = load_opsd_time_series(
+            opsd_ts_data,
+            column=config.settings.prepare_electricity_demand.col_select,
+            years=config.settings.prepare_electricity_demand.opsd_years,
+        )
+        span.add_shape(ts_raw)
 
     # prepare time series for each year and region
-    for year in config.settings.prepare_electricity_demand.opsd_years:
-        for region in config.settings.prepare_electricity_demand.regions:
-            # prepare opsd 50hertz actual load time series
-            load_ts = prepare_load_profile_time_series(
-                ts_raw=ts_raw, year=year, region=region
-            )
-
-            # add time series to `time_series_df`
-            time_series_df = pd.concat([time_series_df, load_ts], axis=0)
+    time_series_df = prepare_load_profiles(
+        ts_raw,
+        years=config.settings.prepare_electricity_demand.opsd_years,
+        regions=config.settings.prepare_electricity_demand.regions,
+    )
 
     # set index
     time_series_df.reset_index(drop=True, inplace=True)
@@ -120,3 +198,5 @@ if __name__ == "__main__":
     if not os.path.exists(output_dir):
         os.mkdir(output_dir)
     dp.save_df(time_series_df, output_file)
+
+    profiler.stop()
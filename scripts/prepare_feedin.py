@@ -26,13 +26,156 @@ and Brandenburg. Raw data is read from csv-files from https://www.renewables.nin
 https://zenodo.org/record/1044463 (ror) and is then formatted to fit the time series template of
 oemof-B3 (`schema/timeseries.csv`).
 
+Each raw file is read once, with only the columns of the needed regions, and split by year. If
+*prepare_feedin.cache_dir* is set in settings.yaml, the parsed raw data is cached there and
+reused as long as the raw file does not change.
+
 """
 
+import hashlib
 import sys
+import numpy as np
 import pandas as pd
 import os
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
+
+
+def get_cache_path(filename_ts, columns):
+    r"""
+    Returns the path of the cached parsed data of the given columns of a raw file, None if
+    *prepare_feedin.cache_dir* is not set. The path changes if the raw file changes.
+    """
+    cache_dir = config.settings.prepare_feedin.cache_dir
+
+    if cache_dir is None:
+        return None
+
+    stat = os.stat(filename_ts)
+    key = f"{os.path.abspath(filename_ts)}-{stat.st_mtime_ns}-{stat.st_size}-{columns}"
+
+    return os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pkl")
+
+
+def load_ninja_time_series(filename_ts, columns):
+    r"""
+    Reads the given columns of a renewables.ninja file of NUTS2 regions. Only these columns
+    are parsed. If *prepare_feedin.cache_dir* is set, the parsed data is cached and reused
+    until the raw file changes.
+
+    Parameters
+    ----------
+    filename_ts : str
+        Path including file name to wind or pv time series of renewables ninja
+    columns : list
+        NUTS2 regions to read
+
+    Returns
+    -------
+    time_series : pd.DataFrame
+        Time series of the regions with DatetimeIndex
+    """
+    cache_path = get_cache_path(filename_ts, columns)
+
+    if cache_path is not None and os.path.exists(cache_path):
+        return pd.read_pickle(cache_path)
+
+    # The first column holds the time index
+    time_column = pd.read_csv(filename_ts, header=2, nrows=0).columns[0]
+
+    time_series = pd.read_csv(
+        filename_ts,
+        header=2,
+        index_col=0,
+        usecols=[time_column] + list(columns),
+        parse_dates=True,
+    )[list(columns)]
+
+    if cache_path is not None:
+        if not os.path.exists(os.path.dirname(cache_path)):
+            os.makedirs(os.path.dirname(cache_path))
+        time_series.to_pickle(cache_path)
+
+    return time_series
+
+
+def format_time_series(time_series, var_name, var_unit, source, comment):
+    r"""
+    Stacks time series with one column per region and brings them to the format of the
+    time series template of oemof-B3.
+    """
+    # bring time series to oemof-B3 format with `stack_timeseries()` and `format_header()`
+    ts_stacked = dp.stack_timeseries(time_series).rename(columns={"var_name": "region"})
+    ts_prepared = dp.format_header(
+        df=ts_stacked,
+        header=dp.HEADER_B3_TS,
+        index_name=config.settings.general.ts_index_name,
+    )
+
+    # add additional information as required by template
+    ts_prepared.loc[:, "var_unit"] = var_unit
+    ts_prepared.loc[:, "var_name"] = var_name
+    ts_prepared.loc[:, "source"] = source
+    ts_prepared.loc[:, "comment"] = comment
+    ts_prepared.loc[
+        :, "scenario_key"
+    ] = "ALL"  # The profile is not varied in different scenarios
+
+    return ts_prepared
+
+
+def prepare_feedin_time_series(filenames_ts, years):
+    r"""
+    Prepares and formats wind and pv time series for region 'B' and 'BB' for several years
+    and types. Each raw file is read once.
+
+    Parameters
+    ----------
+    filenames_ts : dict
+        Type of time series like 'wind' or 'pv' (used for column 'var_name' in output) and
+        path including file name to its time series of renewables ninja for NUTS2 regions
+    years : list
+        Years for which time series are extracted from the raw data
+
+    Returns
+    -------
+    ts_prepared : pd.DataFrame
+        Contains time series of all years and types in the format of time series template
+        of oemof-B3, ordered by year and type.
+    """
+    columns = [
+        config.settings.prepare_feedin.nuts_de30,
+        config.settings.prepare_feedin.nuts_de40,
+    ]
+
+    # read each file once and split it by year
+    time_series_by_year = {}
+    for type, filename_ts in filenames_ts.items():
+        time_series = load_ninja_time_series(filename_ts, columns)
+        # get time series for B and BB only
+        time_series = time_series.rename(
+            columns=config.settings.prepare_feedin.rename_nuts
+        )
+        time_series = time_series[time_series.index.year.isin(years)]
+
+        for year, time_series_year in time_series.groupby(time_series.index.year):
+            time_series_by_year[(year, type)] = time_series_year
+
+    ts_prepared = [
+        format_time_series(
+            time_series_by_year[(year, type)],
+            var_name=f"{type}-profile",
+            var_unit=config.settings.prepare_feedin.ts_var_unit,
+            source=config.settings.prepare_feedin.ts_source,
+            comment=config.settings.prepare_feedin.ts_comment,
+        )
+        for year in years
+        for type in filenames_ts
+        if (year, type) in time_series_by_year
+    ]
+
+    return pd.concat(ts_prepared, ignore_index=True)
 
 
 def prepare_wind_and_pv_time_series(filename_ts, year, type):
@@ -54,44 +197,41 @@ def prepare_wind_and_pv_time_series(filename_ts, year, type):
         Contains time series in the format of time series template of oemof-B3
 
     """
-    # load raw time series and copy data frame
-    ts_raw = pd.read_csv(filename_ts, header=2, index_col=0, parse_dates=True)
-    time_series = ts_raw.copy()
-
-    # extract one specific `year`
-    time_series = time_series[time_series.index.year == year]
-    # get time series for B and BB only
-    time_series_regions = time_series.loc[
-        :,
-        [
-            config.settings.prepare_feedin.nuts_de30,
-            config.settings.prepare_feedin.nuts_de40,
-        ],
-    ].rename(columns=config.settings.prepare_feedin.rename_nuts)
+    ts_prepared = prepare_feedin_time_series({type: filename_ts}, [year])
+    ts_prepared.index.name = config.settings.general.ts_index_name
 
-    # bring time series to oemof-B3 format with `stack_timeseries()` and `format_header()`
-    ts_stacked = dp.stack_timeseries(time_series_regions).rename(
-        columns={"var_name": "region"}
+    return ts_prepared
+
+
+def get_time_series_of_year(time_series, year):
+    r"""
+    Returns hourly time series of one year given for another (non-leap) year for `year`.
+    For leap years Feb 29th is filled with the last value of Feb 28.
+    """
+    new_index = pd.date_range(
+        f"{year}-01-01 00:00:00", f"{year}-12-31 23:00:00", freq="H"
     )
-    ts_prepared = dp.format_header(
-        df=ts_stacked,
-        header=dp.HEADER_B3_TS,
-        index_name=config.settings.general.ts_index_name,
+
+    # time steps of the original year the values are taken from
+    feb_29 = (new_index.month == 2) & (new_index.day == 29)
+    source_index = pd.to_datetime(
+        pd.DataFrame(
+            {
+                "year": time_series.index[0].year,
+                "month": new_index.month,
+                "day": np.where(feb_29, 28, new_index.day),
+                "hour": np.where(feb_29, 23, new_index.hour),
+            }
+        )
     )
 
-    # add additional information as required by template
-    ts_prepared.loc[:, "var_unit"] = config.settings.prepare_feedin.ts_var_unit
-    ts_prepared.loc[:, "var_name"] = f"{type}-profile"
-    ts_prepared.loc[:, "source"] = config.settings.prepare_feedin.ts_source
-    ts_prepared.loc[:, "comment"] = config.settings.prepare_feedin.ts_comment
-    ts_prepared.loc[
-        :, "scenario_key"
-    ] = "ALL"  # The profile is not varied in different scenarios
+    time_series_year = time_series.reindex(source_index)
+    time_series_year.index = new_index
 
-    return ts_prepared
+    return time_series_year
 
 
-def prepare_ror_time_series(filename_ts, region):
+def prepare_ror_time_series(filename_ts, region, regions=None):
     r"""
     Prepares and formats run-of-the-river (ror) time series for region 'B' and 'BB'.
 
@@ -105,64 +245,42 @@ def prepare_ror_time_series(filename_ts, region):
         Path including file name to ror time series of DIW Data Documentation 92
     region : str
         Region of time series; used for column 'region' in output
+    regions : list
+        Several regions, for which the same time series are prepared. Overrides `region`.
 
     Returns
     -------
     ts_df : pd.DataFrame
-        Contains time series in the format of time series template of oemof-B3
+        Contains time series in the format of time series template of oemof-B3, for several
+        regions ordered by region and year.
 
     """
-    # load raw time series and copy data frame
+    # load raw time series
     ts_raw = pd.read_csv(filename_ts, index_col=0, skiprows=3, delimiter=";")
     # add time index
     ts_raw.index = pd.date_range("2017-01-01 00:00:00", "2017-12-31 23:00:00", freq="H")
 
     # prepare for all years
-    ts_df = pd.DataFrame()
-    for year in config.settings.prepare_feedin.years:
-        time_series = ts_raw.copy()
-        new_index = pd.date_range(
-            f"{year}-01-01 00:00:00", f"{year}-12-31 23:00:00", freq="H"
+    ts_years = [
+        format_time_series(
+            get_time_series_of_year(ts_raw, year),
+            var_name="hydro-ror-profile",
+            var_unit=config.settings.prepare_feedin.ts_var_unit,
+            source=config.settings.prepare_feedin.ts_source_ror,
+            comment=config.settings.prepare_feedin.ts_comment_ror,
         )
-        new_index_df = pd.DataFrame(index=new_index)
-        leap_year = new_index_df.index.is_leap_year[0]
-
-        # extend time series for leap years
-        if leap_year == True:  # noqa: E712
-            # Change datetimeindex to current `year`
-            time_series.index = (
-                time_series.reset_index()["index"]
-                .apply(lambda x: x.replace(year=year))
-                .values
-            )
-            # concatenate `time_series` and the new index and fill nans with value of previous day
-            time_series = pd.concat(
-                [time_series, new_index_df], axis=1, join="outer"
-            ).fillna(method="ffill")
-        else:
-            # set `new_index`
-            time_series.index = new_index
-
-        # bring time series to oemof-B3 format with `stack_timeseries()` and `format_header()`
-        ts_stacked = dp.stack_timeseries(time_series).rename(
-            columns={"var_name": "region"}
-        )
-        ts_prepared = dp.format_header(
-            df=ts_stacked,
-            header=dp.HEADER_B3_TS,
-            index_name=config.settings.general.ts_index_name,
-        )
-        ts_prepared.loc[:, "scenario_key"] = "ALL"
-        ts_df = pd.concat([ts_df, ts_prepared])
+        for year in config.settings.prepare_feedin.years
+    ]
+    ts_years = pd.concat(ts_years)
 
-    # add additional information as required by template
-    ts_df.loc[:, "region"] = region
-    ts_df.loc[:, "var_unit"] = config.settings.prepare_feedin.ts_var_unit
-    ts_df.loc[:, "var_name"] = "hydro-ror-profile"
-    ts_df.loc[:, "source"] = config.settings.prepare_feedin.ts_source_ror
-    ts_df.loc[:, "comment"] = config.settings.prepare_feedin.ts_comment_ror
+    # the same time series for all regions
+    ts_df = []
+    for region in regions or [region]:
+        ts_region = ts_years.copy()
+        ts_region.loc[:, "region"] = region
+        ts_df.append(ts_region)
 
-    return ts_df
+    return pd.concat(ts_df)
 
 
 if __name__ == "__main__":
@@ -171,32 +289,23 @@ if __name__ == "__main__":
     filename_ror = sys.argv[3]
     output_file = sys.argv[4]
 
-    # initialize data frame
-    time_series_df = pd.DataFrame()
-
-    # prepare time series for each year
-    for year in config.settings.prepare_feedin.years:
-        # prepare wind time series
-        wind_ts = prepare_wind_and_pv_time_series(
-            filename_ts=filename_wind,
-            year=year,
-            type="wind-onshore",
-        )
-
-        # prepare pv time series
-        pv_ts = prepare_wind_and_pv_time_series(
-            filename_ts=filename_pv, year=year, type="solar-pv"
-        )
+    profiler = Profiler("prepare_feedin", os.path.dirname(output_file))
+    profiler.start()
 
-        # add time series to `time_series_df`
-        time_series_df = pd.concat([time_series_df, wind_ts, pv_ts], axis=0)
+    # prepare wind and pv time series for all years
+    wind_pv_ts = prepare_feedin_time_series(
+        {"wind-onshore": filename_wind, "solar-pv": filename_pv},
+        config.settings.prepare_feedin.years,
+    )
 
     # prepare ror time series
-    for region in config.settings.prepare_feedin.regions:
-        ror_ts = prepare_ror_time_series(filename_ts=filename_ror, region=region)
+    ror_ts = prepare_ror_time_series(
+        filename_ts=filename_ror,
+        region=None,
+        regions=config.settings.prepare_feedin.regions,
+    )
 
-        # add time series to `time_series_df`
-        time_series_df = pd.concat([time_series_df, ror_ts], axis=0)
+    time_series_df = pd.concat([wind_pv_ts, ror_ts], axis=0)
 
     # set index
     time_series_df.reset_index(drop=True, inplace=True)
@@ -207,3 +316,5 @@ if __name__ == "__main__":
     if not os.path.exists(output_dir):
         os.mkdir(output_dir)
     dp.save_df(time_series_df, output_file)
+
+    profiler.stop()
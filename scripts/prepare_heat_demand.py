@@ -52,6 +52,7 @@ from demandlib import bdew
 
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
 
 
 def get_shares_from_hh_distribution(path, region):
@@ -415,6 +416,9 @@ if __name__ == "__main__":
 
     logger = config.add_snake_logger("prepare_heat_demand")
 
+    profiler = Profiler("prepare_heat_demand", os.path.dirname(out_path1))
+    profiler.start()
+
     CARRIERS = ["heat_central", "heat_decentral"]
 
     # Read state heat demands of ghd and hh sectors
@@ -506,3 +510,5 @@ if __name__ == "__main__":
         index_name=config.settings.general.ts_index_name,
     )
     dp.save_df(head_load, out_path2)
+
+    profiler.stop()
@@ -49,13 +49,24 @@ Additionally, saves the following data in `output_dir`:
     - power potential of single areas in column 'power_potential' and reduced power potential (by
       degree of agreement) in column 'power_potential_agreed' in
       f"power_potential_single_areas_{type}.csv" for type in ['wind', 'pv']
+
+All potentials are calculated in memory and the output files are written at the end, by
+*prepare_re_potential.write_jobs* threads. If values of 'degree_of_agreement' or 'minimum_area'
+are given in *prepare_re_potential.sensitivity*, the potential of "Landkreise" is additionally
+calculated for each combination of these values in one pass and saved in
+f"power_potential_{type}_kreise_sensitivity.csv".
 """
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+from oemof_b3.config import config
 from oemof_b3.tools import data_processing as dp
+from oemof_b3.tools.timing import Profiler
 
 # global variables
 DROP_COLS = [
@@ -83,7 +94,85 @@ DROP_COLS = [
 ]
 
 
-def add_names_of_kreise(df, filename_kreise):
+KEEP_COLS = {
+    "wind": [
+        "area",
+        "overlap_pv_agriculture_area",
+        "overlap_pv_road_railway_area",
+        "power_potential",
+        "power_potential_agreed",
+    ],
+    "pv": [
+        "area",
+        "overlap_pv_agriculture_area",
+        "overlap_pv_road_railway_area",
+        "overlap_wind_area",
+        "power_potential",
+        "power_potential_agreed",
+    ],
+}
+
+CARRIERS = {"pv": "solar", "wind": "wind"}
+
+
+def check_type(type):
+    if type not in KEEP_COLS:
+        raise ValueError(f"Parameter `type` needs to be 'pv' or 'wind' but is {type}.")
+
+
+def load_area_potential(filename):
+    r"""
+    Reads area potentials of single areas.
+
+    Parameters
+    ----------
+    filename: str
+        Path including file name to raw area potentials
+
+    Returns
+    -------
+    areas: pandas.DataFrame
+        Area potentials indexed by 'fid'
+    """
+    return pd.read_csv(filename, header=0).set_index("fid").drop(DROP_COLS, axis=1)
+
+
+def get_assumptions(assumptions, type):
+    r"""
+    Returns the parameters for calculations like minimum required area and degree of agreement
+    of `type` from the assumptions (scalars) for wind and pv potential.
+
+    Parameters
+    ----------
+    assumptions: pandas.DataFrame
+        Assumptions (scalars) for wind and pv potential
+    type: str
+        Type of area potential "pv" or "wind"
+
+    Returns
+    -------
+    parameters: dict
+        Values of 'minimum_area', 'degree_of_agreement', 'required_specific_area' [MW/m²] and,
+        for pv, 'reduction_by_wind_overlap'
+    """
+    check_type(type)
+
+    values = assumptions.loc[assumptions["carrier"] == CARRIERS[type]].set_index(
+        "var_name"
+    )["var_value"]
+
+    parameters = {
+        "minimum_area": values.at["minimum_area"],
+        "degree_of_agreement": values.at["degree_of_agreement"],
+        "required_specific_area": values.at["required_specific_area"] / 1e6,
+    }
+    if type == "pv":
+        parameters["reduction_by_wind_overlap"] = values.at["reduction_by_wind_overlap"]
+
+    return parameters
+
+
+def add_names_of_kreise(df, kreise):
     r"""
     Merges names of Kreise of Brandenburg to `df` according to 'NUTS'.
 
@@ -91,8 +180,8 @@ def add_names_of_kreise(df, filename_kreise):
     ----------
     df: pandas.DataFrame
         Contains at least a column 'NUTS' with NUTS of Kreise of Brandenburg
-    filename_kreise: str
-        File name including path to csv containing lookup table for Kreise and NUTS in Brandenburg
+    kreise: pandas.DataFrame
+        Lookup table for Kreise and NUTS in Brandenburg
 
     Returns
     -------
@@ -100,71 +189,44 @@ def add_names_of_kreise(df, filename_kreise):
         `df` with added Kreise according to NUTS in column 'Kreis'
 
     """
-    kreise = pd.read_csv(filename_kreise)
     df.index.name = "NUTS"
     df_with_names = pd.merge(left=df, right=kreise, on="NUTS")
     df_with_names.set_index("NUTS", inplace=True)
     return df_with_names
 
 
-def calculate_potential_pv(
-    filename_agriculture,
-    filename_road_railway,
-    output_dir,
-    filename_kreise,
-    filename_assumptions,
-):
+def add_total_of_brandenburg(potentials_kreise):
     r"""
-    Calculates the area and power potential of photovoltaics.
+    Adds the sum of all Kreise as row 'Brandenburg'.
+    """
+    potential_bb = (
+        pd.DataFrame(potentials_kreise.sum(axis=0))
+        .transpose()
+        .rename({0: "Brandenburg"})
+    )
+    return pd.concat([potentials_kreise, potential_bb], axis=0)
 
-    - Merges area potential of agricultural areas (file `filename_agriculture`) and areas along
-      roads and railways (file `filename_road_railway`)
-    - Overlapping areas are subtracted from agricultural areas
-    - Calculates pv area potential for each area and Landkreis, methods see
-      :py:func:`~.calculate_area_potential`
-    - Calculates pv power potential for each area and Landkreis, methods see
-      :py:func:`~.calculate_power_potential`
 
-    The following data is saved:
-    - "raw" pv area potential of single areas in column 'area_raw' in
-      "area_potential_single_areas_pv_raw.csv" in `output_dir`
-    - pv area potential of single areas after processing with :py:func:`~.calculate_area_potential`
-      in column 'area_agreed' in "area_potential_single_areas_pv.csv" in `output_dir`
-    - pv power [MW] and area [m²] potential of "Landkreise" in columns 'area_agreed' and
-      'power_potential' in `output_dir/power_potential_pv_kreise.csv`
+def merge_area_potential_pv(areas_agriculture, areas_road_railway):
+    r"""
+    Merges area potential of agricultural areas and areas along roads and railways. Overlapping
+    areas are subtracted from agricultural areas.
 
     Parameters
     ----------
-    filename_agriculture: str
-        Path including file name to raw area potentials of pv on agricultural areas
-    filename_road_railway: str
-        Path including file name to raw area potentials of pv along roads and railways
-    output_dir: str
-        Directory where outputs are saved.
-    filename_kreise: str
-        File name including path to csv containing lookup table for Kreise and NUTS in Brandenburg
-    filename_assumptions: str
-        File name including path to csv containing assumptions (scalars) for wind and pv potential.
+    areas_agriculture: pandas.DataFrame
+        Raw area potentials of pv on agricultural areas
+    areas_road_railway: pandas.DataFrame
+        Raw area potentials of pv along roads and railways
 
     Returns
     -------
-    None
-
-
+    areas_pv: pandas.DataFrame
+        "Raw" pv area potential of single areas in column 'area_pv_raw' and area without
+        overlap in column 'area'
     """
-    # read total ground-mounted pv area potential from csvs (agricultural + roads and railways)
-    areas_agriculture = (
-        pd.read_csv(filename_agriculture, header=0)
-        .set_index("fid")
-        .drop(DROP_COLS, axis=1)
-        .rename(columns={"area": "area_pv_raw"})
-    )
-    areas_road_railway = (
-        pd.read_csv(filename_road_railway, header=0)
-        .set_index("fid")
-        .drop(DROP_COLS, axis=1)
-        .rename(columns={"area": "area_pv_raw"})
-    )
+    areas_agriculture = areas_agriculture.rename(columns={"area": "area_pv_raw"})
+    areas_road_railway = areas_road_railway.rename(columns={"area": "area_pv_raw"})
 
     # subtract overlapping areas from road_railway and merge data frames
     areas_agriculture["area"] = (
@@ -172,53 +234,82 @@ def calculate_potential_pv(
         - areas_agriculture["overlap_pv_road_railway_area"]
     )
     areas_road_railway["area"] = areas_road_railway["area_pv_raw"]
-    areas_pv = pd.concat([areas_road_railway, areas_agriculture], axis=0, sort=True)
 
-    # save total pv area potential
-    if not os.path.exists(output_dir):
-        os.mkdir(output_dir)
-    filename = os.path.join(output_dir, "area_potential_single_areas_pv_raw.csv")
-    areas_pv.to_csv(filename, sep=";")
-
-    # read parameters for calculations like minimum required area and degree of agreement from
-    # `filename_assumptions`
-    df = dp.load_b3_scalars(filename_assumptions)
-    pv_assumptions = df.loc[df["carrier"] == "solar"].set_index("var_name")
-    # get parameters
-    minimum_area = pv_assumptions.at["minimum_area", "var_value"]
-    degree_of_agreement = pv_assumptions.at["degree_of_agreement", "var_value"]
-    required_specific_area = (
-        pv_assumptions.at["required_specific_area", "var_value"] / 1e6
-    )
-    reduction_by_wind_overlap = pv_assumptions.at[
-        "reduction_by_wind_overlap", "var_value"
-    ]
+    return pd.concat([areas_road_railway, areas_agriculture], axis=0, sort=True)
+
+
+def calculate_potential_pv(
+    areas_agriculture,
+    areas_road_railway,
+    kreise,
+    assumptions,
+):
+    r"""
+    Calculates the area and power potential of photovoltaics.
+
+    - Merges area potential of agricultural areas (`areas_agriculture`) and areas along
+      roads and railways (`areas_road_railway`), see :py:func:`~.merge_area_potential_pv`
+    - Calculates pv area potential for each area and Landkreis, methods see
+      :py:func:`~.calculate_area_potential`
+    - Calculates pv power potential for each area and Landkreis, methods see
+      :py:func:`~.calculate_power_potential`
+
+    Parameters
+    ----------
+    areas_agriculture: pandas.DataFrame
+        Raw area potentials of pv on agricultural areas
+    areas_road_railway: pandas.DataFrame
+        Raw area potentials of pv along roads and railways
+    kreise: pandas.DataFrame
+        Lookup table for Kreise and NUTS in Brandenburg
+    assumptions: pandas.DataFrame
+        Assumptions (scalars) for wind and pv potential
+
+    Returns
+    -------
+    outputs: dict
+        Data frames by file name:
+        - "raw" pv area potential of single areas in column 'area_raw' in
+          "area_potential_single_areas_pv_raw.csv"
+        - pv area potential of single areas after processing with
+          :py:func:`~.calculate_area_potential` in column 'area' in
+          "area_potential_single_areas_pv.csv"
+        - pv power [MW] and area [m²] potential of single areas and "Landkreise" in
+          "power_potential_single_areas_pv.csv" and "power_potential_pv_kreise.csv"
+    """
+    areas_pv = merge_area_potential_pv(areas_agriculture, areas_road_railway)
+
+    parameters = get_assumptions(assumptions, "pv")
 
     # calculate area potential
-    filename_single_areas = calculate_area_potential(
+    areas = calculate_area_potential(
         area_data=areas_pv,
         type="pv",
-        minimum_area=minimum_area,
-        output_dir=output_dir,
-        reduction_by_wind_overlap=reduction_by_wind_overlap,
+        minimum_area=parameters["minimum_area"],
+        reduction_by_wind_overlap=parameters["reduction_by_wind_overlap"],
     )
 
     # calculate power potential
-    calculate_power_potential(
+    potentials, potentials_kreise = calculate_power_potential(
         type="pv",
-        input_file=filename_single_areas,
-        required_specific_area=required_specific_area,
-        degree_of_agreement=degree_of_agreement,
-        output_dir=output_dir,
-        filename_kreise=filename_kreise,
+        potentials=areas,
+        required_specific_area=parameters["required_specific_area"],
+        degree_of_agreement=parameters["degree_of_agreement"],
+        kreise=kreise,
     )
 
+    return {
+        "area_potential_single_areas_pv_raw.csv": areas_pv,
+        "area_potential_single_areas_pv.csv": areas,
+        "power_potential_pv_kreise.csv": potentials_kreise,
+        "power_potential_single_areas_pv.csv": potentials,
+    }
+
 
 def calculate_potential_wind(
-    filename_wind,
-    output_dir,
-    filename_kreise,
-    filename_assumptions,
+    areas_wind,
+    kreise,
+    assumptions,
 ):
     r"""
     Calculates the area and power potential of wind energy.
@@ -228,87 +319,63 @@ def calculate_potential_wind(
     - Calculates wind power potential for each area and Landkreis, methods see
       :py:func:`~.calculate_power_potential`
 
-    The following data is saved:
-    - wind area potential of single areas in [m²] in column 'area' in
-      "area_potential_single_areas_wind.csv" in `output_dir`
-    - wind power [MW] and area [m²] potential of "Landkreise" in columns 'area' and
-      'power_potential' in `output_dir/power_potential_wind_kreise.csv`
-
     Parameters
     ----------
-    filename_wind: str
-        Path including file name to raw area potentials for wind energy
-    output_dir: str
-        Directory where outputs are saved.
-    filename_kreise: str
-        File name including path to csv containing lookup table for Kreise and NUTS in Brandenburg
-    filename_assumptions: str
-        File name including path to csv containing assumptions (scalars) for wind and pv potential.
+    areas_wind: pandas.DataFrame
+        Raw area potentials for wind energy
+    kreise: pandas.DataFrame
+        Lookup table for Kreise and NUTS in Brandenburg
+    assumptions: pandas.DataFrame
+        Assumptions (scalars) for wind and pv potential
 
     Returns
     -------
-    None
-
+    outputs: dict
+        Data frames by file name:
+        - wind area potential of single areas in [m²] in column 'area' in
+          "area_potential_single_areas_wind.csv"
+        - wind power [MW] and area [m²] potential of single areas and "Landkreise" in
+          "power_potential_single_areas_wind.csv" and "power_potential_wind_kreise.csv"
     """
-    # read area potential wind
-    areas = (
-        pd.read_csv(filename_wind, header=0).set_index("fid").drop(DROP_COLS, axis=1)
-    )
-
-    # create directory for intermediate results if not existent
-    # save total wind area potential
-    if not os.path.exists(output_dir):
-        os.mkdir(output_dir)
-
-    # read parameters for calculations like minimum required area and degree of agreement from
-    # `filename_assumptions`
-    df = dp.load_b3_scalars(filename_assumptions)
-    wind_assumptions = df.loc[df["carrier"] == "wind"].set_index("var_name")
-    # get parameters
-    minimum_area = wind_assumptions.at["minimum_area", "var_value"]
-    degree_of_agreement = wind_assumptions.at["degree_of_agreement", "var_value"]
-    required_specific_area = (
-        wind_assumptions.at["required_specific_area", "var_value"] / 1e6
-    )
+    parameters = get_assumptions(assumptions, "wind")
 
     # calculate area potential
-    filename_single_areas = calculate_area_potential(
-        area_data=areas,
+    areas = calculate_area_potential(
+        area_data=areas_wind,
         type="wind",
-        minimum_area=minimum_area,
-        output_dir=output_dir,
+        minimum_area=parameters["minimum_area"],
     )
 
     # calculate power potential
-    calculate_power_potential(
+    potentials, potentials_kreise = calculate_power_potential(
         type="wind",
-        input_file=filename_single_areas,
-        required_specific_area=required_specific_area,
-        degree_of_agreement=degree_of_agreement,
-        output_dir=output_dir,
-        filename_kreise=filename_kreise,
+        potentials=areas,
+        required_specific_area=parameters["required_specific_area"],
+        degree_of_agreement=parameters["degree_of_agreement"],
+        kreise=kreise,
     )
 
+    return {
+        "area_potential_single_areas_wind.csv": areas,
+        "power_potential_wind_kreise.csv": potentials_kreise,
+        "power_potential_single_areas_wind.csv": potentials,
+    }
+
 
 def calculate_area_potential(
     area_data,
     type,
     minimum_area,
-    output_dir,
     reduction_by_wind_overlap=None,
 ):
     r"""
-    Calculates area potential for wind or pv for areas in `area_data` and saves results to csvs.
+    Calculates area potential for wind or pv for areas in `area_data`.
 
     Potential areas in `area_data` are processed in the following way:
     - areas smaller than `minimum_area` are excluded
     - if `type` is "pv", area is reduced by a certain percentage
       (`reduction_by_wind_overlap`) in case there is overlapping with wind potential area in sum.
 
-    The following data is saved in `output_dir`:
-    - Area potential of single areas in column 'area' in
-      f"output_dir/area_potential_single_areas_{type}.csv"
-
     Parameters
     ----------
     area_data: `pandas.DataFrame<frame>`
@@ -317,8 +384,6 @@ def calculate_area_potential(
         Type of area potential "pv" or "wind".
     minimum_area: float
         Minimum required area for considering area as potential for installing plants of `type`.
-    output_dir: str
-        Directory where outputs are saved.
     reduction_by_wind_overlap: float or None
         Reduction of area if `type` is "pv" in case there is overlapping with wind
         potential area in sum.
@@ -326,13 +391,14 @@ def calculate_area_potential(
 
     Returns
     -------
-    filename_single_areas: str
-        Path including file name where the area potential of the single areas is saved
+    areas: pandas.DataFrame
+        Area potential of single areas in m² in column 'area'
 
     """
+    check_type(type)
+
     # remove areas smaller minimum required area
-    areas = area_data.copy()
-    areas = areas.loc[area_data["area"] >= minimum_area]
+    areas = area_data.loc[area_data["area"] >= minimum_area].copy()
 
     # take pv area potential overlap with wind area potential into account; not necessary for wind
     # as wind has priority
@@ -343,45 +409,26 @@ def calculate_area_potential(
         areas["area"] = areas["area"] - (
             areas["overlap_wind_area"] * reduction_by_wind_overlap
         )
-    elif type == "wind":
-        pass
-    else:
-        raise ValueError(f"Parameter `type` needs to be 'pv' or 'wind' but is {type}.")
-
-    # save area potential of single areas in m²
-    filename_single_areas = os.path.join(
-        output_dir,
-        f"area_potential_single_areas_{type}.csv",
-    )
-    areas.to_csv(filename_single_areas, sep=";")
 
-    return filename_single_areas
+    return areas
 
 
 def calculate_power_potential(
     type,
-    input_file,
+    potentials,
     required_specific_area,
     degree_of_agreement,
-    output_dir,
-    filename_kreise,
+    kreise,
 ):
     r"""
-    Calculates wind or pv power potential for each area and Landkreis and saves results to csv.
-
-    Saves the following data for "Landkreise" in `output_dir/power_potential_{type}_kreise.csv`:
-    - power potential in column 'power_potential'
-    - power potential after reducing by degree of agreement in column 'power_potential_agreed'
-    - area potential in column 'area'
-    - percentage of overlap between the areas in columns 'overlap_pv_agriculture_percent',
-      'overlap_pv_road_railway_percent', 'overlap_wind_percent'
+    Calculates wind or pv power potential for each area and Landkreis.
 
     Parameters
     ----------
     type: str
         Type of area potential "pv" or "wind"
-    input_file: str
-        Filename including path to file containing area potential
+    potentials: pandas.DataFrame
+        Area potential of single areas as returned by :py:func:`~.calculate_area_potential`
     required_specific_area: float
         Specific area required per wind turbine or per installed capacity pv.
     degree_of_agreement: float or None
@@ -390,18 +437,27 @@ def calculate_power_potential(
         different parties and the calculated available area potential.
         If None, `degree_of_agreement` is set to 1
         Default: None.
-    output_dir: str
-        Directory where outputs are saved.
-    filename_kreise: str
-        File name including path to csv containing lookup table for Kreise and NUTS in Brandenburg
+    kreise: pandas.DataFrame
+        Lookup table for Kreise and NUTS in Brandenburg
 
     Returns
     -------
-    None
+    potentials: pandas.DataFrame
+        Power potential of single areas in MW in column 'power_potential' and reduced power
+        potential (by degree of agreement) in column 'power_potential_agreed'
+    potentials_kreise: pandas.DataFrame
+        Potentials of "Landkreise" and Brandenburg:
+        - power potential in column 'power_potential'
+        - power potential after reducing by degree of agreement in column
+          'power_potential_agreed'
+        - area potential in column 'area'
+        - overlapping areas in columns 'overlap_pv_agriculture_area',
+          'overlap_pv_road_railway_area', only for pv: 'overlap_wind_area'
 
     """
-    # read area potential
-    potentials = pd.read_csv(input_file, header=0, sep=";")
+    check_type(type)
+
+    potentials = potentials.copy()
 
     # calculate power potential with required specific area
     potentials["power_potential"] = potentials["area"] * required_specific_area
@@ -413,56 +469,169 @@ def calculate_power_potential(
         potentials["power_potential"] * degree_of_agreement
     )
 
-    if type == "wind":
-        keep_cols = [
-            "area",
-            "overlap_pv_agriculture_area",
-            "overlap_pv_road_railway_area",
-            "power_potential",
-            "power_potential_agreed",
-        ]
-
-    elif type == "pv":
-        keep_cols = [
-            "area",
-            "overlap_pv_agriculture_area",
-            "overlap_pv_road_railway_area",
-            "overlap_wind_area",
-            "power_potential",
-            "power_potential_agreed",
-        ]
-    else:
-        raise ValueError(f"Parameter `type` needs to be 'pv' or 'wind' but is {type}.")
-
-    # sum up area and power potential of "Landkreise"
-    potentials_kreise = potentials.groupby("NUTS")[keep_cols].sum()
-
-    # sum up area and power potential of Brandenburg
-    potential_bb = (
-        pd.DataFrame(potentials_kreise.sum(axis=0))
-        .transpose()
-        .rename({0: "Brandenburg"})
+    # sum up area and power potential of "Landkreise" and Brandenburg
+    potentials_kreise = add_total_of_brandenburg(
+        potentials.groupby("NUTS")[KEEP_COLS[type]].sum()
     )
-    potentials_kreise = pd.concat([potentials_kreise, potential_bb], axis=0)
 
     # add names of Kreise in Brandenburg
-    potentials_kreise = add_names_of_kreise(
-        df=potentials_kreise, filename_kreise=filename_kreise
+    potentials_kreise = add_names_of_kreise(df=potentials_kreise, kreise=kreise)
+
+    return potentials, potentials_kreise
+
+
+def calculate_power_potential_variants(
+    area_data,
+    type,
+    required_specific_area,
+    degrees_of_agreement,
+    minimum_areas,
+    kreise,
+    reduction_by_wind_overlap=None,
+):
+    r"""
+    Calculates area and power potential of "Landkreise" for each combination of degree of
+    agreement and minimum area in one pass.
+
+    The areas of all minimum areas are summed up per Landkreis at once with a mask of the
+    areas exceeding each minimum area. The power potentials of all degrees of agreement are
+    derived from these sums.
+
+    Parameters
+    ----------
+    area_data: pandas.DataFrame
+        Contains area potentials for energy carrier `type`, as passed to
+        :py:func:`~.calculate_area_potential`
+    type: str
+        Type of area potential "pv" or "wind"
+    required_specific_area: float
+        Specific area required per wind turbine or per installed capacity pv.
+    degrees_of_agreement: list
+        Degrees of agreement
+    minimum_areas: list
+        Minimum required areas
+    kreise: pandas.DataFrame
+        Lookup table for Kreise and NUTS in Brandenburg
+    reduction_by_wind_overlap: float or None
+        Reduction of area if `type` is "pv", see :py:func:`~.calculate_area_potential`
+
+    Returns
+    -------
+    potentials_kreise: pandas.DataFrame
+        Area potential in column 'area', power potential in column 'power_potential' and power
+        potential after reducing by degree of agreement in column 'power_potential_agreed' of
+        "Landkreise" and Brandenburg for each combination of 'minimum_area' and
+        'degree_of_agreement'
+    """
+    check_type(type)
+
+    # area after reduction by wind overlap; areas are excluded by their area before
+    area = area_data["area"]
+    if type == "pv":
+        area = area - area_data["overlap_wind_area"] * reduction_by_wind_overlap
+
+    # area of each single area for each minimum area, zero if the area is excluded
+    mask = area_data["area"].values[:, None] >= np.array(minimum_areas)[None, :]
+    areas = pd.DataFrame(
+        np.where(mask, area.values[:, None], 0),
+        index=area_data.index,
+        columns=minimum_areas,
     )
 
-    # save power potential in MW of NUTS3 (Landkreise)
-    filename_nuts3 = os.path.join(
-        output_dir,
-        f"power_potential_{type}_kreise.csv",
+    areas_kreise = add_total_of_brandenburg(areas.groupby(area_data["NUTS"]).sum())
+    areas_kreise.index.name = "NUTS"
+
+    # one row per Landkreis and minimum area
+    areas_kreise = areas_kreise.stack().rename("area")
+    areas_kreise.index.names = ["NUTS", "minimum_area"]
+    areas_kreise = areas_kreise.reset_index("minimum_area")
+
+    potentials_kreise = []
+    for degree_of_agreement in degrees_of_agreement:
+        potentials = areas_kreise.copy()
+        potentials["degree_of_agreement"] = degree_of_agreement
+        potentials["power_potential"] = potentials["area"] * required_specific_area
+        potentials["power_potential_agreed"] = (
+            potentials["power_potential"] * degree_of_agreement
+        )
+        potentials_kreise.append(
+            potentials[
+                [
+                    "minimum_area",
+                    "degree_of_agreement",
+                    "area",
+                    "power_potential",
+                    "power_potential_agreed",
+                ]
+            ]
+        )
+
+    potentials_kreise = pd.concat(potentials_kreise).sort_values(
+        ["minimum_area", "degree_of_agreement"], kind="stable"
     )
-    potentials_kreise.to_csv(filename_nuts3, sep=";")
 
-    # additionally save power potential of single areas in MW
-    filename_single_areas = os.path.join(
-        output_dir,
-        f"power_potential_single_areas_{type}.csv",
+    return add_names_of_kreise(df=potentials_kreise, kreise=kreise)
+
+
+def calculate_sensitivity(area_data, type, assumptions, kreise, sensitivity):
+    r"""
+    Calculates the potential of "Landkreise" for all combinations of the values of
+    'degree_of_agreement' and 'minimum_area' in `sensitivity`. Parameters without values are
+    taken from `assumptions`.
+
+    Returns
+    -------
+    potentials_kreise: pandas.DataFrame or None
+        See :py:func:`~.calculate_power_potential_variants`. None if `sensitivity` has no
+        values.
+    """
+    parameters = get_assumptions(assumptions, type)
+
+    values = {
+        name: list(sensitivity.get(name) or [])
+        for name in ["degree_of_agreement", "minimum_area"]
+    }
+    if not any(values.values()):
+        return None
+
+    return calculate_power_potential_variants(
+        area_data,
+        type=type,
+        required_specific_area=parameters["required_specific_area"],
+        degrees_of_agreement=values["degree_of_agreement"]
+        or [parameters["degree_of_agreement"]],
+        minimum_areas=values["minimum_area"] or [parameters["minimum_area"]],
+        kreise=kreise,
+        reduction_by_wind_overlap=parameters.get("reduction_by_wind_overlap"),
     )
-    potentials.to_csv(filename_single_areas, sep=";")
+
+
+def save_outputs(outputs, output_dir, jobs=1):
+    r"""
+    Saves data frames to csv files in `output_dir`.
+
+    Parameters
+    ----------
+    outputs: dict
+        Data frames by file name
+    output_dir: str
+        Directory where outputs are saved.
+    jobs: int
+        Number of threads writing files
+    """
+    if not os.path.exists(output_dir):
+        os.mkdir(output_dir)
+
+    def save(item):
+        filename, df = item
+        df.to_csv(os.path.join(output_dir, filename), sep=";")
+
+    if jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(save, outputs.items()))
+    else:
+        for item in outputs.items():
+            save(item)
 
 
 if __name__ == "__main__":
@@ -473,19 +642,61 @@ if __name__ == "__main__":
     filename_assumptions = sys.argv[5]
     output_dir = sys.argv[6]
 
-    # calculate pv potential
-    calculate_potential_pv(
-        filename_agriculture=filename_pv_agriculture,
-        filename_road_railway=filename_pv_road_railway,
-        output_dir=output_dir,
-        filename_kreise=filename_kreise,
-        filename_assumptions=filename_assumptions,
+    profiler = Profiler(
+        "prepare_re_potential", os.path.dirname(os.path.normpath(output_dir))
     )
+    profiler.start()
+
+    with profiler.span("load area potentials"):
+        areas_pv_agriculture = load_area_potential(filename_pv_agriculture)
+        areas_pv_road_railway = load_area_potential(filename_pv_road_railway)
+        areas_wind = load_area_potential(filename_wind)
+        kreise = pd.read_csv(filename_kreise)
+        # read parameters for calculations like minimum required area and degree of agreement
+        assumptions = dp.load_b3_scalars(filename_assumptions)
+
+    outputs = {}
+
+    # calculate pv potential
+    with profiler.span("calculate pv potential"):
+        outputs.update(
+            calculate_potential_pv(
+                areas_agriculture=areas_pv_agriculture,
+                areas_road_railway=areas_pv_road_railway,
+                kreise=kreise,
+                assumptions=assumptions,
+            )
+        )
 
     # calculate wind potential
-    calculate_potential_wind(
-        filename_wind=filename_wind,
-        output_dir=output_dir,
-        filename_kreise=filename_kreise,
-        filename_assumptions=filename_assumptions,
-    )
+    with profiler.span("calculate wind potential"):
+        outputs.update(
+            calculate_potential_wind(
+                areas_wind=areas_wind,
+                kreise=kreise,
+                assumptions=assumptions,
+            )
+        )
+
+    # calculate potentials for combinations of parameters
+    sensitivity = dict(config.settings.prepare_re_potential.sensitivity)
+    with profiler.span("calculate sensitivity"):
+        area_data = {
+            "pv": outputs["area_potential_single_areas_pv_raw.csv"],
+            "wind": areas_wind,
+        }
+        for type, areas in area_data.items():
+            potentials_kreise = calculate_sensitivity(
+                areas, type, assumptions, kreise, sensitivity
+            )
+            if potentials_kreise is not None:
+                outputs[
+                    f"power_potential_{type}_kreise_sensitivity.csv"
+                ] = potentials_kreise
+
+    with profiler.span("save outputs"):
+        save_outputs(
+            outputs, output_dir, config.settings.prepare_re_potential.write_jobs
+        )
+
+    profiler.stop()
@@ -17,71 +17,158 @@ Description
 -------------
 The script performs the following steps to prepare scalar data for parametrization:
 
-* Calculate annualized investment cost from overnight cost, lifetime and wacc.
+* Calculate annualized investment cost from overnight cost, lifetime and wacc. The pairs of
+  overnight cost and fixom cost to annualize are set in
+  ``config.settings.prepare_scalars.annuise_investment_cost``.
 """
 
+import os
 import sys
 
-from oemof.tools.economics import annuity
+import numpy as np
+import pandas as pd
 
 from oemof_b3.tools.data_processing import ScalarProcessor, load_b3_scalars, save_df
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
+
+
+def annuity(capex, n, wacc):
+    r"""
+    Calculates the annuity of an initial investment 'capex', considering the cost of capital
+    'wacc' during a project horizon 'n'. Vectorized version of
+    :func:`oemof.tools.economics.annuity` for the case without replacements.
+
+    Parameters
+    ----------
+    capex : float or array-like
+        Capital expenditure for first investment
+    n : float or array-like
+        Horizon of the analysis (n>=1)
+    wacc : float or array-like
+        Weighted average cost of capital (0<wacc<1)
+
+    Returns
+    -------
+    float or array-like
+        annuity
+    """
+    n = np.asarray(n, dtype=float)
+    wacc = np.asarray(wacc, dtype=float)
+
+    if np.any(n < 1) or np.any((wacc < 0) | (wacc > 1)):
+        raise ValueError("Input arguments for 'annuity' out of bounds!")
+
+    factor = (1 + wacc) ** n
+
+    return capex * (wacc * factor) / (factor - 1)
+
+
+def get_wacc_per_row(sc, index):
+    r"""
+    Assigns the wacc, which is defined per scenario_key, to each row of an index by joining on
+    'scenario_key'.
+
+    Parameters
+    ----------
+    sc : ScalarProcessor
+        Scalars containing var_name 'wacc'
+    index : pd.MultiIndex
+        Index of unstacked scalar data with level 'scenario_key'
+
+    Returns
+    -------
+    wacc : pd.Series
+        wacc for each row of index
+    """
+    # wacc is defined per scenario, ignore other index levels
+    wacc = sc.get_unstacked_var("wacc")["wacc"]
+    wacc.index = wacc.index.get_level_values("scenario_key")
+
+    duplicated = wacc.index[wacc.index.duplicated()].unique()
+    if not duplicated.empty:
+        raise ValueError(
+            f"wacc is defined more than once for scenario_key(s) {list(duplicated)}."
+        )
 
+    scenario_keys = index.to_frame(index=False)[["scenario_key"]]
+    wacc = scenario_keys.join(wacc, on="scenario_key")["wacc"]
 
-def annuise_investment_cost(sc):
+    missing = scenario_keys.loc[wacc.isna().values, "scenario_key"].unique()
+    if missing.size > 0:
+        raise ValueError(f"wacc is missing for scenario_key(s) {list(missing)}.")
 
-    for var_name_cost, var_name_fixom_cost in [
-        ("capacity_cost_overnight", "fixom_cost"),
-        ("storage_capacity_cost_overnight", "storage_fixom_cost"),
-    ]:
+    wacc.index = index
 
-        invest_data = sc.get_unstacked_var(
-            [var_name_cost, "lifetime", var_name_fixom_cost]
-        )
+    return wacc
 
-        # TODO: Currently, (storage)_capacity_overnight_cost, (storage)_fixom_cost and lifetime have
-        # to be given for each tech and each scenario, but wacc may change per scenario, but
-        # is defined for all techs uniformly. Could offer a more general and flexible solution.
 
-        # wacc is defined per scenario, ignore other index levels
-        wacc = sc.get_unstacked_var("wacc")
-        wacc.index = wacc.index.get_level_values("scenario_key")
+def annuise_investment_cost(sc, var_names=None):
+    r"""
+    Annualizes overnight investment cost using lifetime and wacc and adds fixed operation and
+    maintenance cost. All pairs of (cost, fixom_cost) variables are processed in one pass.
 
-        # set wacc per scenario_key
-        scenario_keys = invest_data.index.get_level_values("scenario_key")
-        wacc_array = wacc.loc[scenario_keys].values
-        wacc_list = [value for sublist in wacc_array for value in sublist]
-        invest_data["wacc"] = wacc_list
+    Parameters
+    ----------
+    sc : ScalarProcessor
+        Scalars with overnight cost, fixom cost, lifetime and wacc. The input variables are
+        replaced by the annuised cost, named like the cost variable without '_overnight'.
+    var_names : dict
+        Maps the var_name of each overnight cost to the var_name of its fixom cost. Defaults to
+        ``config.settings.prepare_scalars.annuise_investment_cost``.
 
-        annuised_investment_cost = invest_data.apply(
-            lambda x: annuity(x[var_name_cost], x["lifetime"], x["wacc"])
-            + x[var_name_fixom_cost],
-            1,
-        )
+    Returns
+    -------
+    None
+    """
+    if var_names is None:
+        var_names = config.settings.prepare_scalars.annuise_investment_cost
 
-        sc.append(var_name_cost.replace("_overnight", ""), annuised_investment_cost)
-
-    sc.drop(
-        [
-            "wacc",
-            "lifetime",
-            "capacity_cost_overnight",
-            "storage_capacity_cost_overnight",
-            "fixom_cost",
-            "storage_fixom_cost",
-        ]
+    var_names = dict(var_names)
+
+    # TODO: Currently, (storage)_capacity_overnight_cost, (storage)_fixom_cost and lifetime have
+    # to be given for each tech and each scenario, but wacc may change per scenario, but
+    # is defined for all techs uniformly. Could offer a more general and flexible solution.
+    input_vars = ["lifetime", *var_names.keys(), *var_names.values()]
+
+    invest_data = (
+        sc.get_unstacked_var(input_vars).reindex(columns=input_vars).astype(float)
     )
 
+    wacc = get_wacc_per_row(sc, invest_data.index)
+
+    annuised_investment_cost = pd.DataFrame(
+        {
+            var_name_cost.replace("_overnight", ""): annuity(
+                invest_data[var_name_cost], invest_data["lifetime"], wacc
+            )
+            + invest_data[var_name_fixom_cost]
+            for var_name_cost, var_name_fixom_cost in var_names.items()
+        },
+        index=invest_data.index,
+    )
+
+    for var_name, data in annuised_investment_cost.items():
+        sc.append(var_name, data)
+
+    sc.drop(["wacc", *input_vars])
+
 
 if __name__ == "__main__":
     in_path = sys.argv[1]  # path to raw scalar data
     out_path = sys.argv[2]  # path to destination
 
-    df = load_b3_scalars(in_path)
+    profiler = Profiler("prepare_scalars", os.path.dirname(out_path))
+    profiler.start()
+
+    with profiler.span("load scalars") as span:
+        df = load_b3_scalars(in_path)
+        span.add_shape(df)
 
     sc = ScalarProcessor(df)
 
-    annuise_investment_cost(sc)
+    with profiler.span("annuise investment cost"):
+        annuise_investment_cost(sc)
 
     sc.scalars = sc.scalars.sort_values(
         by=["carrier", "tech", "var_name", "scenario_key"]
@@ -92,3 +179,5 @@ if __name__ == "__main__":
     sc.scalars.index.name = config.settings.general.scal_index_name
 
     save_df(sc.scalars, out_path)
+
+    profiler.stop()
@@ -31,14 +31,20 @@ as "balanced" for the profiles "home" and "work" during specific hours (see glob
 apply this, charging strategy values between [`HOME_START`, `HOME_END`] and
 [`WORK_START`, `WORK_END`] respectively are replaced by the average of all these values. We assume
 that this is a more realistic picture of the future than a charging strategy "greedy".
+
+The files in `input_dir` are read and prepared by *prepare_vehicle_charging_demand.jobs*
+processes.
 """
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import os
 
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config import config
+from oemof_b3.tools.timing import Profiler
 
 # dummy logger for tests
 import logging
@@ -61,7 +67,101 @@ WORK_END = (
 )  # end charging strategy "balanced" for work profile
 
 
-def prepare_vehicle_charging_demand(input_dir, balanced=True, const_share=None):
+def get_region_and_year(path):
+    r"""Gets region and year from the name of a simBEV file, e.g. 'res_SimBEV_Berlin_2015.csv'"""
+    split_filename = os.path.splitext(os.path.basename(path))[0].split("_")
+    region, year = split_filename[2], int(split_filename[3])
+    region = config.settings.prepare_vehicle_charging_demand.region_dict[region]
+    return region, year
+
+
+def read_simbev_file(path, year):
+    r"""
+    Reads the 15-min charging demand profiles of a simBEV file and resamples them to hourly
+    time steps.
+
+    Parameters
+    ----------
+    path : str
+        Path of simBEV file
+    year : int
+        Year of the profiles; time steps of other years are dropped
+
+    Returns
+    -------
+    hourly_ts : pd.DataFrame
+        Hourly charging demand profiles in kW with UTC DatetimeIndex
+    """
+    ts_raw = pd.read_csv(
+        path,
+        index_col=1,
+        sep=";",
+        decimal=".",
+        thousands=",",
+    ).drop(columns=["Unnamed: 0"], axis=1)
+    ts_raw.index = pd.to_datetime(
+        ts_raw.index,
+        format=config.settings.prepare_vehicle_charging_demand.datetime_format,
+        errors="raise",
+        utc=True,
+    )
+    ts = ts_raw[ts_raw.index.year == year]
+
+    # resample (15 min to hourly), unit is kW
+    return ts.resample("H").mean()
+
+
+def prepare_profile(path, balanced=True, const_share=None):
+    r"""
+    Prepares the normalized charging demand profile of one simBEV file, see
+    :py:func:`prepare_vehicle_charging_demand()`.
+
+    Returns
+    -------
+    ts_stacked : pd.DataFrame
+        Stacked profile with 'region' and 'scenario_key'
+    """
+    region, year = get_region_and_year(path)
+
+    hourly_ts = read_simbev_file(path, year)
+
+    if balanced:
+        # smooth work and home profiles as they have high peaks (strategy balanced)
+        hourly_ts = smooth_profiles(df=hourly_ts)
+
+    # only keep column "sum CS power" (sum of power demand at all charging stations)
+    ts_total_demand = pd.DataFrame(hourly_ts["sum CS power"]).rename(
+        columns={"sum CS power": f"ts_{year}"}
+    )
+
+    # divide by total electricity demand of vehicles
+    ts_total_norm = ts_total_demand / ts_total_demand.sum()
+
+    if const_share is not None:
+        # combine car profile and constant profile with `const_share`
+        constant_ts_norm = 1 / len(ts_total_norm)
+        ts_total_norm = (
+            ts_total_norm * (1 - const_share) + constant_ts_norm * const_share
+        )
+
+    # stack time series and add region
+    ts_stacked = dp.stack_timeseries(ts_total_norm)
+
+    # The profile is not varied in different scenarios
+    ts_stacked.loc[:, "scenario_key"] = "ALL"
+
+    ts_stacked.loc[:, "region"] = region
+
+    return ts_stacked
+
+
+def _prepare_profile(args):
+    return prepare_profile(*args)
+
+
+def prepare_vehicle_charging_demand(
+    input_dir, balanced=True, const_share=None, jobs=None
+):
     r"""
     Prepares and formats electric vehicle charging demand profiles for regions 'B' and 'BB'.
 
@@ -88,6 +188,9 @@ def prepare_vehicle_charging_demand(input_dir, balanced=True, const_share=None):
     const_share : float
         If given the passenger car charging profile is mixed with a constant profile.
         Default: None
+    jobs : int
+        Number of processes reading and preparing the files in `input_dir`. Defaults to
+        *prepare_vehicle_charging_demand.jobs*.
 
     Returns
     -------
@@ -97,12 +200,6 @@ def prepare_vehicle_charging_demand(input_dir, balanced=True, const_share=None):
 
     """
 
-    def get_year_region_from_filename():
-        """Gets  region and year from file name"""
-        split_filename = os.path.splitext(os.path.basename(filename))[0].split("_")
-        r, y = split_filename[2], int(split_filename[3])
-        return r, y
-
     if const_share is not None:
         logger.info(
             f"Passenger car charging profile is mixed with constant share of "
@@ -114,67 +211,22 @@ def prepare_vehicle_charging_demand(input_dir, balanced=True, const_share=None):
             f"{HOME_START} and {HOME_END}, 'work' between {WORK_START} and {WORK_END}."
         )
 
-    # initialize data frame
-    df = pd.DataFrame()
-
-    # loop through files in `input_dir`
-    for filename in os.listdir(input_dir):
-        path = os.path.join(input_dir, filename)
-        region, year = get_year_region_from_filename()
-        region = config.settings.prepare_vehicle_charging_demand.region_dict[region]
-
-        # read data from file, copy and superfluous drop last time step
-        ts_raw = pd.read_csv(
-            path,
-            index_col=1,
-            sep=";",
-            decimal=".",
-            parse_dates=True,
-            thousands=",",
-        ).drop(columns=["Unnamed: 0"], axis=1)
-        ts_raw.index = pd.to_datetime(
-            ts_raw.index, infer_datetime_format=True, errors="coerce", utc=True
-        )
-        ts = ts_raw[ts_raw.index.year == year]
-
-        # resample (15 min to hourly), unit is kW
-        hourly_ts = ts.resample("H").mean()
-
-        if balanced:
-            # smooth work and home profiles as they have high peaks (strategy balanced)
-            hourly_ts = smooth_profiles(df=hourly_ts)
-
-        # only keep column "sum CS power" (sum of power demand at all charging stations)
-        ts_total_demand = pd.DataFrame(hourly_ts["sum CS power"]).rename(
-            columns={"sum CS power": f"ts_{year}"}
-        )
-
-        # divide by total electricity demand of vehicles
-        ts_total_norm = ts_total_demand / ts_total_demand.sum()
+    if jobs is None:
+        jobs = config.settings.prepare_vehicle_charging_demand.jobs
 
-        if const_share is not None:
-            # combine car profile and constant profile with `const_share`
-            length = len(ts_total_demand)
-            constant_ts_norm = pd.DataFrame(
-                [1 / length] * length,
-                index=ts_total_demand.index,
-            )
-            array_ts_total_norm = (
-                ts_total_norm.values * (1 - const_share)
-                + constant_ts_norm.values * const_share
-            )
-            ts_total_norm[f"ts_{year}"] = array_ts_total_norm
+    paths = [
+        os.path.join(input_dir, filename) for filename in sorted(os.listdir(input_dir))
+    ]
 
-        # stack time series and add region
-        ts_stacked = dp.stack_timeseries(ts_total_norm)
+    # prepare the profile of each file, in parallel if `jobs` is greater than 1
+    args = [(path, balanced, const_share) for path in paths]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            profiles = list(executor.map(_prepare_profile, args))
+    else:
+        profiles = [_prepare_profile(arg) for arg in args]
 
-        # The profile is not varied in different scenarios
-        ts_stacked.loc[:, "scenario_key"] = "ALL"
-
-        ts_stacked.loc[:, "region"] = region
-
-        # add to `df`
-        df = pd.concat([df, ts_stacked], axis=0)
+    df = pd.concat(profiles, axis=0)
 
     # prepare index
     df.reset_index(inplace=True, drop=True)
@@ -202,6 +254,55 @@ def prepare_vehicle_charging_demand(input_dir, balanced=True, const_share=None):
     return ts_prepared
 
 
+def get_time_of_day_mask(index, start, end):
+    r"""
+    Returns a mask of the time steps of `index` between the times of day `start` and `end`
+    (including), like :py:meth:`pandas.Series.between_time`. If `start` is later than `end`,
+    the time steps after `start` or before `end` are selected.
+    """
+
+    def to_seconds(time):
+        time = pd.Timestamp(time)
+        return time.hour * 3600 + time.minute * 60 + time.second
+
+    seconds = index.hour * 3600 + index.minute * 60 + index.second
+    start, end = to_seconds(start), to_seconds(end)
+
+    if start <= end:
+        return (seconds >= start) & (seconds <= end)
+
+    return (seconds >= start) | (seconds <= end)
+
+
+def balance_between_hours(ts, groups, start, end):
+    r"""
+    Applies charging strategy 'balanced' between two hours of the day: within each group (e.g.
+    day) the values between `start` and `end` are replaced by their average.
+
+    Parameters
+    ----------
+    ts : pd.Series
+        Profile with DatetimeIndex
+    groups : array-like
+        Group of each time step
+    start : str
+        Start time of day, e.g. '06:00'
+    end : str
+        End time of day
+
+    Returns
+    -------
+    ts : pd.Series
+        Balanced profile
+    """
+    mask = get_time_of_day_mask(ts.index, start, end)
+
+    # average of the values between start and end of each group
+    average = ts.where(mask).groupby(groups).transform("mean")
+
+    return ts.where(~mask, average)
+
+
 def smooth_profiles(df):
     r"""
     Smoothes profiles "work" and "home" of `df` between specific hours (see global variables).
@@ -220,36 +321,22 @@ def smooth_profiles(df):
         Vehicle charging profiles with smoothed "home" and "work" profiles and adapted total
         charging demand.
     """
-
-    def balance_between_hours(ts, start, end):
-        """Apply charging strategy 'balanced' between two hours of the day."""
-        # calculate average between start and end
-        average = ts.between_time(start, end).mean()
-        # set average for times between start and end
-        ts.loc[ts.between_time(start, end).index] = average
-        return ts
-
-    df["sum UC work"] = (
-        df.groupby(df.index.date)["sum UC work"]
-        .apply(lambda x: balance_between_hours(ts=x, start=WORK_START, end=WORK_END))
-        .values
-    )
-
-    # for home: determine which hours of the day should belong to next day
-    temp = (
-        pd.DataFrame(df.index)["time"].apply(lambda x: 0 if x.hour < 12 else 1).values
-    )
-    df["temp"] = df.index.dayofyear + temp
     if int(HOME_START.split(":")[0]) < 12:
         raise ValueError(
             f"For smoothing home profile the days should be split at an earlier hour than 12 if "
             f"`HOME_START` is {HOME_START}."
         )
 
-    df["sum UC home"] = (
-        df.groupby(df["temp"])["sum UC home"]
-        .apply(lambda x: balance_between_hours(ts=x, start=HOME_START, end=HOME_END))
-        .values
+    # work: balance within each day
+    df["sum UC work"] = balance_between_hours(
+        df["sum UC work"], df.index.date, start=WORK_START, end=WORK_END
+    )
+
+    # for home: determine which hours of the day should belong to next day
+    df["temp"] = df.index.dayofyear + (df.index.hour >= 12)
+
+    df["sum UC home"] = balance_between_hours(
+        df["sum UC home"], df["temp"], start=HOME_START, end=HOME_END
     )
 
     # get total charging df after balancing
@@ -273,15 +360,22 @@ if __name__ == "__main__":
 
     logger = config.add_snake_logger("prepare_vehicle_charging_demand")
 
+    profiler = Profiler("prepare_vehicle_charging_demand", os.path.dirname(output_file))
+    profiler.start()
+
     # get constant share of electric charging demand
     const_share = get_constant_share_of_vehicle_ts(scalars_file)
 
-    time_series = prepare_vehicle_charging_demand(
-        input_dir=input_dir, const_share=const_share
-    )
+    with profiler.span("prepare charging demand") as span:
+        time_series = prepare_vehicle_charging_demand(
+            input_dir=input_dir, const_share=const_share
+        )
+        span.add_shape(time_series)
 
     # create output directory in case it does not exist, yet and save data to `output_file`
     output_dir = os.path.dirname(output_file)
     if not os.path.exists(output_dir):
         os.mkdir(output_dir)
     dp.save_df(time_series, output_file)
+
+    profiler.stop()
@@ -0,0 +1,49 @@
+# coding: utf-8
+r"""
+Inputs
+-------
+results : str
+    ``results/``: path to the directory containing the results of all scenarios
+out_path : str
+    ``results/_profiling/``: target path for the profiling summary
+
+Outputs
+---------
+.csv
+    ``profiles.csv`` with all recorded spans and ``summary.csv`` with the spans aggregated
+    across scenarios.
+
+Description
+-------------
+The script collects the profiles that the scripts of the pipeline save to
+``results/{scenario}/profiling`` (see *profiling* in ``oemof_b3/config/settings.yaml``) and
+aggregates the wall time, CPU time, peak memory and number of rows of each span across
+scenarios. The spans with the largest total wall time are printed, which shows where the
+pipeline spends its time.
+"""
+import os
+import sys
+
+from oemof_b3.tools.timing import load_profiles, summarize_profiles
+
+N_PRINTED_SPANS = 20
+
+
+if __name__ == "__main__":
+    results = sys.argv[1]
+    out_path = sys.argv[2]
+
+    if not os.path.exists(out_path):
+        os.makedirs(out_path)
+
+    profiles = load_profiles(results)
+
+    if profiles.empty:
+        raise FileNotFoundError(f"Found no profiles in '{results}'.")
+
+    summary = summarize_profiles(profiles)
+
+    profiles.to_csv(os.path.join(out_path, "profiles.csv"), index=False)
+    summary.to_csv(os.path.join(out_path, "summary.csv"))
+
+    print(summary.head(N_PRINTED_SPANS).to_string(float_format="{:.2f}".format))
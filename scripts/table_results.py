@@ -21,10 +21,10 @@ import os
 import sys
 
 import numpy as np
-import pandas as pd
 
 import oemof_b3.tools.data_processing as dp
 from oemof_b3.config import config
+from oemof_b3.tools.results import ResultsStore
 
 
 def create_production_table(scalars, carrier):
@@ -110,12 +110,7 @@ if __name__ == "__main__":
 
     logger = config.add_snake_logger("create_results_table")
 
-    scalars = pd.read_csv(
-        os.path.join(in_path, "scalars.csv"), sep=config.settings.general.separator
-    )
-
-    # Workaround to conform to oemof-b3 format
-    scalars.rename(columns={"scenario": "scenario_key"}, inplace=True)
+    scalars = ResultsStore(in_path).scalars
 
     if not os.path.exists(out_path):
         os.makedirs(out_path)
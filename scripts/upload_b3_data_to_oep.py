@@ -23,7 +23,8 @@ This script performs the following steps:
   (in oemetadata format, using the template in ``oemof-B3/schema/oemetadata.json``)
   for given model results (in oemof-B3-format) and saves them locally as json files.
 * Create tables on the OpenEnergyPlatform (OEP) based on the metadata.
-* Upload data to the OEP tables.
+* Upload data to the OEP tables in chunks (see *upload_results_to_oep* in settings.yaml). With
+  *resume*, an interrupted upload is resumed after the rows that were already written.
 * Validate metadata.
 * Upload metadata to the OEP tables.
 
@@ -141,11 +142,16 @@ if __name__ == "__main__":
 
     # Create the metadata and save it
     for filename, table, title in upload_candidates:
-        data_upload_df = pd.read_csv(
-            os.path.join(filepath, filename), encoding="utf8", sep=";", index_col=0
+        # The metadata only depends on the columns, read the header only
+        header = pd.read_csv(
+            os.path.join(filepath, filename),
+            encoding="utf8",
+            sep=";",
+            index_col=0,
+            nrows=0,
         )
 
-        metadata = get_suitable_metadata_template(data_upload_df)
+        metadata = get_suitable_metadata_template(header)
 
         metadata = write_metadata(
             metadata=metadata,
@@ -194,6 +200,7 @@ if __name__ == "__main__":
             con=db.engine,
             schema=config.settings.upload_results_to_oep.schema,
             logger=logger,
+            resume=config.settings.upload_results_to_oep.resume,
         )
 
         logger.info(f"{filename} writing into table ended")
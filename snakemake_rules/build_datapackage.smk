@@ -1,15 +1,20 @@
-from oemof_b3.config.config import load_yaml
+import re
+
+from oemof_b3.tools.scenarios import scenario_registry
 
 def get_paths_scenario_input(wildcards):
-    scenario_specs = load_yaml(f"scenarios/{wildcards.scenario}.yml")
-    paths_scenario_inputs = list()
-    for key in ["paths_scalars", "paths_timeseries"]:
-        paths = scenario_specs[key]
-        if isinstance(paths, list):
-            paths_scenario_inputs.extend(paths)
-        elif isinstance(paths, str):
-            paths_scenario_inputs.append(paths)
-    return paths_scenario_inputs
+    return get_paths_input_of_scenario(wildcards.scenario)
+
+def get_paths_input_of_scenario(scenario):
+    # Scenario specifications are read once per snakemake run
+    return scenario_registry.get_input_paths(scenario)
+
+# Scenarios whose datapackages are built in one job by build_datapackages, see settings.yaml
+shared_inputs_group = config.settings.build_datapackage.shared_inputs_group
+shared_inputs_scenarios = [
+    scenario for scenario in scenario_groups.get(shared_inputs_group, [])
+    if not scenario.startswith("example_")
+]
 
 rule build_datapackage:
     input:
@@ -19,10 +24,34 @@ rule build_datapackage:
     params:
         logfile="results/{scenario}/{scenario}.log"
     wildcard_constraints:
-        # Do not use this rule for the examples. Use prepare_example instead
-        scenario=r"(?!example_).*"
+        # Do not use this rule for the examples (use prepare_example instead), for variants
+        # of sweeps, named '{sweep}--{number}' (use build_sweep instead) nor for the scenarios
+        # built by build_datapackages
+        scenario=r"(?!example_)(?!.*--)" + "".join(
+            f"(?!{re.escape(scenario)}$)" for scenario in shared_inputs_scenarios
+        ) + ".*"
     shell: "python scripts/build_datapackage.py {input.scenario} {output} {params.logfile}"
 
+if shared_inputs_scenarios:
+    rule build_datapackages:
+        # Builds the datapackages of all scenarios of a group in one job, sharing the loaded
+        # inputs. Each datapackage is an output, so that no other rule builds it.
+        input:
+            list(dict.fromkeys(
+                path for scenario in shared_inputs_scenarios
+                for path in get_paths_input_of_scenario(scenario)
+            )),
+            scenarios=expand("scenarios/{scenario}.yml", scenario=shared_inputs_scenarios)
+        output:
+            [
+                directory(f"results/{scenario}/preprocessed")
+                for scenario in shared_inputs_scenarios
+            ]
+        params:
+            logfile=f"results/joined_scenarios/{shared_inputs_group}/{shared_inputs_group}.log"
+        threads: 4
+        shell: "python scripts/build_datapackages.py {input.scenarios} --logfile {params.logfile} --jobs {threads}"
+
 rule prepare_example:
     input: "examples/{scenario}/preprocessed/"
     output: directory("results/{scenario}/preprocessed")
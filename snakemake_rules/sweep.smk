@@ -0,0 +1,46 @@
+import pandas as pd
+
+from oemof_b3.config.config import load_yaml
+
+def get_paths_sweep_input(wildcards):
+    sweep = load_yaml(f"sweeps/{wildcards.sweep}.yml")
+    base_scenario = os.path.splitext(os.path.basename(sweep["base_scenario"]))[0]
+    return get_paths_input_of_scenario(base_scenario) + [sweep["base_scenario"]]
+
+checkpoint build_sweep:
+    # Builds the datapackages of all variants of a sweep, sharing the inputs of the base scenario
+    input:
+        get_paths_sweep_input,
+        sweep="sweeps/{sweep}.yml"
+    output:
+        index="results/_sweeps/{sweep}/index.csv",
+        variants=directory("results/_sweeps/{sweep}/variants")
+    params:
+        logfile="results/_sweeps/{sweep}/{sweep}.log"
+    threads: 4
+    shell: "python scripts/build_sweep.py {input.sweep} {output.index} {output.variants} --logfile {params.logfile} --jobs {threads}"
+
+def get_sweep_variants(wildcards):
+    return checkpoints.build_sweep.get(sweep=wildcards.sweep).output.variants
+
+rule prepare_sweep_variant:
+    # Copies the datapackage of a variant built by build_sweep to where the following rules
+    # expect it, like prepare_example does for the examples
+    input: get_sweep_variants
+    output: directory("results/{sweep}--{number}/preprocessed")
+    wildcard_constraints:
+        number=r"\d+"
+    run:
+        import shutil
+        variant = f"{wildcards.sweep}--{wildcards.number}"
+        shutil.copytree(src=os.path.join(input[0], variant, "preprocessed"), dst=output[0])
+
+def get_sweep_postprocessed(wildcards):
+    index = checkpoints.build_sweep.get(sweep=wildcards.sweep).output.index
+    variants = pd.read_csv(index)["variant"]
+    return expand("results/{scenario}/postprocessed", scenario=variants)
+
+rule run_sweep:
+    # Optimizes and postprocesses all variants of a sweep, in parallel with '-j<n>'
+    input: get_sweep_postprocessed
+    output: touch("results/_sweeps/{sweep}/postprocessed")
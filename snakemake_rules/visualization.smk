@@ -24,7 +24,8 @@ rule plot_dispatch:
     output: directory("results/{scenario}/plotted/dispatch")
     params:
         logfile="results/{scenario}/{scenario}.log"
-    shell: "python scripts/plot_dispatch.py {input} {output} {params.logfile}"
+    threads: 4
+    shell: "python scripts/plot_dispatch.py {input} {output} {params.logfile} --jobs {threads}"
 
 rule plot_storage_level:
     input: "results/{scenario}/postprocessed/"
@@ -44,14 +45,16 @@ rule plot_scalar_results:
     output: directory("results/{scenario}/plotted/scalars/")
     params:
         logfile="results/{scenario}/{scenario}.log"
-    shell: "python scripts/plot_scalar_results.py {input} {output} {params.logfile}"
+    threads: 4
+    shell: "python scripts/plot_scalar_results.py {input} {output} {params.logfile} --jobs {threads}"
 
 rule plot_joined_scalars:
     input: "results/joined_scenarios/{scenario_group}/joined/"
     output: directory("results/joined_scenarios/{scenario_group}/joined_plotted/")
     params:
         logfile="results/joined_scenarios/{scenario_group}/{scenario_group}.log"
-    shell: "python scripts/plot_scalar_results.py {input} {output} {params.logfile}"
+    threads: 4
+    shell: "python scripts/plot_scalar_results.py {input} {output} {params.logfile} --jobs {threads}"
 
 rule report:
     input:
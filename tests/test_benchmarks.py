@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.data_processing import compare_timings, run_benchmarks
+
+
+def test_data_processing_benchmarks_run():
+    timings = run_benchmarks("tiny", repeat=1)
+
+    assert set(timings["results"]) == {
+        "load_b3_timeseries",
+        "stack_timeseries",
+        "unstack_timeseries",
+        "aggregate_scalars",
+        "aggregate_timeseries",
+        "merge_a_into_b",
+        "update_filtered_df",
+        "expand_regions",
+        "prepare_attr_name",
+        "oemof_results_ts_to_oemof_b3",
+    }
+
+
+def test_compare_timings_flags_regressions():
+    params = {"n_scalars": 1}
+    baseline = {"params": params, "results": {"a": {"min": 1.0}, "b": {"min": 1.0}}}
+    current = {"params": params, "results": {"a": {"min": 1.1}, "b": {"min": 1.5}}}
+
+    comparison = compare_timings(baseline, current, threshold=0.2)
+
+    assert list(comparison["regression"]) == [False, True]
+
+    with pytest.raises(ValueError):
+        compare_timings(baseline, dict(current, params={"n_scalars": 2}))
@@ -0,0 +1,116 @@
+import os
+
+import pandas as pd
+
+from oemof_b3.tools.build_cache import BuildCache, FileStore, hash_frame, remove_file
+from oemof_b3.tools.hashing import hash_file
+
+
+def write_file(directory, rel_path, content):
+    path = os.path.join(directory, rel_path)
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as file:
+        file.write(content)
+
+
+def test_hash_frame():
+    df = pd.DataFrame({"capacity": [1.0, 2.0]}, index=pd.Index(["a", "b"], name="name"))
+
+    assert hash_frame(df) == hash_frame(df.copy())
+
+    changed = df.copy()
+    changed.loc["a", "capacity"] = 3.0
+    assert hash_frame(df) != hash_frame(changed)
+
+    assert hash_frame(df) != hash_frame(df.rename(columns={"capacity": "amount"}))
+
+
+def test_build_cache(tmp_path):
+    destination = os.path.join(tmp_path, "preprocessed")
+    cache_dir = os.path.join(tmp_path, "build_cache")
+    rel_path = "data/elements/ch4-gt.csv"
+
+    # first build
+    write_file(destination, rel_path, "name,capacity\na,1\n")
+
+    cache = BuildCache(cache_dir)
+    assert not cache.is_valid("scalars", "key-1")
+
+    cache.set_key("scalars", "key-1")
+    cache.store(rel_path, destination, columns=["name", "capacity"])
+    cache.save()
+
+    # second build with the same inputs restores the file
+    os.remove(os.path.join(destination, rel_path))
+
+    cache = BuildCache(cache_dir)
+    assert cache.is_valid("scalars", "key-1")
+    assert not cache.is_valid("scalars", "key-2")
+
+    assert cache.restore(rel_path, destination)
+    assert not cache.restore("data/elements/other.csv", destination)
+    assert not cache.schema_changed()
+
+    with open(os.path.join(destination, rel_path)) as file:
+        assert file.read() == "name,capacity\na,1\n"
+
+    # changed columns change the schema
+    cache.store(rel_path, destination, columns=["name", "amount"])
+    assert cache.schema_changed()
+
+    # files that are not part of a build are removed from the cache
+    cache = BuildCache(cache_dir)
+    cache.save()
+    assert not cache.has_file(rel_path)
+    assert not os.path.exists(os.path.join(cache_dir, "files", rel_path))
+
+
+def test_file_store(tmp_path):
+    file_store = FileStore(os.path.join(tmp_path, "file_store"))
+    rel_path = "data/sequences/load_profile.csv"
+    content = "timeindex,B-load-profile\n0,1\n"
+
+    # scenario a writes the sequence and adds it to the store
+    destination_a = os.path.join(tmp_path, "a", "preprocessed")
+    write_file(destination_a, rel_path, content)
+
+    cache_a = BuildCache(os.path.join(tmp_path, "a", "build_cache"), file_store)
+    cache_a.store(rel_path, destination_a, hash="data-hash")
+    cache_a.save()
+
+    # the data hash is kept in the manifest, the store is keyed by the file's content
+    file_hash = hash_file(os.path.join(destination_a, rel_path))
+    assert cache_a.get_hash(rel_path) == "data-hash"
+    assert file_store.has(file_hash)
+    assert not file_store.has("data-hash")
+    assert not os.path.exists(os.path.join(tmp_path, "a", "build_cache", "files"))
+
+    # scenario b writes the same sequence, which is linked to the stored file
+    destination_b = os.path.join(tmp_path, "b", "preprocessed")
+    write_file(destination_b, rel_path, content)
+
+    cache_b = BuildCache(os.path.join(tmp_path, "b", "build_cache"), file_store)
+    cache_b.store(rel_path, destination_b, hash="data-hash")
+    cache_b.save()
+
+    path_a = os.path.join(destination_a, rel_path)
+    path_b = os.path.join(destination_b, rel_path)
+    assert os.path.samefile(path_a, path_b)
+
+    # the next build of scenario b restores the file from the store
+    remove_file(path_b)
+
+    cache_b = BuildCache(os.path.join(tmp_path, "b", "build_cache"), file_store)
+    assert cache_b.restore(rel_path, destination_b)
+    assert os.path.samefile(path_a, path_b)
+
+    with open(path_b) as file:
+        assert file.read() == content
+
+    # files are replaced, not changed in place
+    remove_file(path_b)
+    write_file(destination_b, rel_path, "changed")
+
+    with open(path_a) as file:
+        assert file.read() == content
@@ -0,0 +1,196 @@
+import logging
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from oemof_b3.config import config
+from oemof_b3.tools.build_cache import BuildCache
+from oemof_b3.tools.data_processing import HEADER_B3_SCAL
+
+pytest.importorskip("oemoflex")
+
+from oemof_b3.tools.datapackage import (  # noqa: E402
+    get_component_tables,
+    parametrize_scalars,
+    save_datapackage,
+)
+
+
+def get_edp():
+    r"""
+    Returns a small unstacked EnergyDatapackage with two component tables, a bus table and a
+    sequence. Only the attributes used by parametrize_scalars are set.
+    """
+    gt = pd.DataFrame(
+        {
+            "region": ["B", "BB"],
+            "carrier": ["ch4", "ch4"],
+            "tech": ["gt", "gt"],
+            "type": ["conversion", "conversion"],
+            "capacity": [np.nan, 5.0],
+            "efficiency": [np.nan, np.nan],
+        },
+        index=pd.Index(["B-ch4-gt", "BB-ch4-gt"], name="name"),
+    )
+
+    demand = pd.DataFrame(
+        {
+            "region": ["B"],
+            "carrier": ["electricity"],
+            "tech": ["demand"],
+            "type": ["load"],
+            "amount": [np.nan],
+            "profile": ["B-electricity-demand-profile"],
+        },
+        index=pd.Index(["B-electricity-demand"], name="name"),
+    )
+
+    # The bus table has the same columns as a component table, but is not a component
+    bus = pd.DataFrame(
+        {
+            "region": ["B"],
+            "carrier": ["electricity"],
+            "tech": ["bus"],
+            "type": ["bus"],
+            "balanced": [True],
+        },
+        index=pd.Index(["B-electricity"], name="name"),
+    )
+
+    profile = pd.DataFrame(
+        {"B-electricity-demand-profile": [0.5, 0.5]},
+        index=pd.date_range("2019-01-01", periods=2, freq="h", name="timeindex"),
+    )
+
+    return SimpleNamespace(
+        data={
+            "ch4-gt": gt,
+            "electricity-demand": demand,
+            "bus": bus,
+            "electricity-demand_profile": profile,
+        },
+        components=["ch4-gt", "electricity-demand"],
+    )
+
+
+def get_scalars(rows):
+    scalars = pd.DataFrame(
+        rows, columns=["name", "var_name", "carrier", "region", "tech", "var_value"]
+    )
+    scalars["scenario_key"] = "base"
+    for column in HEADER_B3_SCAL:
+        if column not in scalars.columns:
+            scalars[column] = None
+    scalars.index.name = "id_scal"
+
+    return scalars[HEADER_B3_SCAL]
+
+
+def test_get_component_tables():
+    edp = get_edp()
+
+    tables = get_component_tables(edp)
+
+    assert list(tables) == ["ch4-gt", "electricity-demand"]
+    assert tables["ch4-gt"] is edp.data["ch4-gt"]
+
+
+def test_parametrize_scalars(caplog):
+    edp = get_edp()
+    gt = edp.data["ch4-gt"]
+    bus = edp.data["bus"].copy()
+
+    scalars = get_scalars(
+        [
+            ("B-ch4-gt", "capacity", "ch4", "B", "gt", 10.0),
+            ("B-ch4-gt", "efficiency", "ch4", "B", "gt", 0.4),
+            ("BB-ch4-gt", "capacity", "ch4", "BB", "gt", 20.0),
+            ("B-electricity-demand", "amount", "electricity", "B", "demand", 100.0),
+            ("B-electricity", "balanced", "electricity", "B", "bus", False),
+            ("B-ch4-chp", "capacity", "ch4", "B", "chp", 1.0),
+        ]
+    )
+
+    with caplog.at_level(logging.WARNING, logger="build_datapackage"):
+        parametrize_scalars(edp, scalars, {0: {"scenario_key": ["base"]}})
+
+    # The tables are updated in place
+    assert edp.data["ch4-gt"] is gt
+    assert gt.loc["B-ch4-gt", "capacity"] == 10.0
+    assert gt.loc["B-ch4-gt", "efficiency"] == 0.4
+    assert gt.loc["BB-ch4-gt", "capacity"] == 20.0
+    assert np.isnan(gt.loc["BB-ch4-gt", "efficiency"])
+    assert edp.data["electricity-demand"].loc["B-electricity-demand", "amount"] == 100.0
+
+    # Busses are not components and are not parametrized
+    pd.testing.assert_frame_equal(edp.data["bus"], bus)
+
+    # Missing entries and overwritten values are reported in one warning each
+    messages = [record.getMessage() for record in caplog.records]
+    missing = [message for message in messages if "is not in the index" in message]
+    overwritten = [message for message in messages if "overwrites" in message]
+
+    assert len(missing) == 1
+    assert "('B-ch4-chp', 'capacity')" in missing[0]
+    assert "('B-electricity', 'balanced')" in missing[0]
+
+    assert len(overwritten) == 1
+    assert "('BB-ch4-gt', 'capacity')" in overwritten[0]
+    assert "('B-ch4-gt', 'capacity')" not in overwritten[0]
+
+
+class CsvDataPackage:
+    r"""
+    Holds data and relative paths like an EnergyDatapackage and writes them with the
+    separator in the settings, which build_datapackage passes on to oemoflex.
+    """
+
+    def __init__(self, data, rel_paths):
+        self.data = data
+        self.rel_paths = rel_paths
+
+    def to_csv_dir(self, destination):
+        for name, df in self.data.items():
+            path = os.path.join(destination, self.rel_paths[name])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_csv(path, sep=config.settings.general.separator)
+
+
+@pytest.fixture
+def separator():
+    default = config.settings.general.separator
+    yield lambda value: config.settings.set("general.separator", value)
+    config.settings.set("general.separator", default)
+
+
+def test_save_datapackage_separator(tmp_path, separator):
+    destination = os.path.join(tmp_path, "preprocessed")
+    rel_path = "data/elements/ch4-gt.csv"
+
+    def build(valid=()):
+        edp = CsvDataPackage({"ch4-gt": get_edp().data["ch4-gt"]}, {"ch4-gt": rel_path})
+        cache = BuildCache(os.path.join(tmp_path, "build_cache"))
+        written = save_datapackage(edp, destination, cache, valid)
+        cache.save()
+
+        with open(os.path.join(destination, rel_path)) as file:
+            return written, file.readline()
+
+    separator(";")
+    assert build() == (
+        [rel_path],
+        "name;region;carrier;tech;type;capacity;efficiency\n",
+    )
+
+    # unchanged data is restored from the cache
+    assert build() == ([], "name;region;carrier;tech;type;capacity;efficiency\n")
+
+    # the same data is written again with another separator
+    separator(",")
+    assert build() == (
+        [rel_path],
+        "name,region,carrier,tech,type,capacity,efficiency\n",
+    )
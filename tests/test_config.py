@@ -1,5 +1,46 @@
+import pytest
+import yaml
+
 from oemof_b3.config import config
 
 
 def test_config_with_dynaconf():
     assert config.settings.optimize.solver == "cbc"
+
+
+def test_labels_and_colors_are_loaded_once():
+    from oemof_b3.config.config import COLORS, LABELS
+
+    assert config.LABELS is LABELS
+    assert config.COLORS is COLORS
+
+    label = next(iter(LABELS.values()))
+    if label in COLORS:
+        assert COLORS[f"{label} in"] == COLORS[label]
+
+
+def test_model_structures_are_loaded_on_access():
+    from oemof_b3.model import model_structures
+
+    assert "model_structure_full" in model_structures
+    assert (
+        model_structures["model_structure_full"]
+        is model_structures["model_structure_full"]
+    )
+
+
+def test_model_structure_from_file(tmp_path):
+    from oemof_b3.model import get_model_structure
+
+    model_structure = dict(
+        get_model_structure("model_structure_el_only"), regions=["R0", "R1"]
+    )
+
+    path = tmp_path / "model_structure.yml"
+    with open(path, "w") as file:
+        yaml.dump(model_structure, file)
+
+    assert get_model_structure(str(path)) == model_structure
+
+    with pytest.raises(KeyError):
+        get_model_structure(str(tmp_path / "missing.yml"))
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from oemof_b3.config import config
+from oemof_b3.tools.data_processing import HEADER_B3_TS, stack_timeseries
+
+pytest.importorskip("oemoflex")
+
+from scripts.create_empty_ts import (  # noqa: E402
+    get_date_range,
+    get_df_of_all_empty_ts,
+    get_empty_stacked_ts,
+    save_ts,
+)
+
+SCENARIO_SPECS = {
+    "datetimeindex": {"start": "2019-01-01", "freq": "H", "periods": 48},
+    "filter_timeseries": {"timeindex_start": "2017-01-01 00:00:00"},
+}
+
+PROFILE_NAMES = ["electricity-demand-profile", "heat_central-demand-profile"]
+
+REGIONS = ["B", "BB"]
+
+
+def stack_empty_ts_per_profile(profile_names, regions, _scenario_specs):
+    r"""
+    Creates the empty time series profile by profile with stack_timeseries, as done before
+    get_empty_stacked_ts.
+    """
+    date_rng = get_date_range(_scenario_specs)
+    periods = len(date_rng)
+
+    ts_df = pd.DataFrame(columns=HEADER_B3_TS)
+    for region in regions:
+        for name in profile_names:
+            if config.settings.create_empty_ts.ts_values == "zeros":
+                df = pd.DataFrame(
+                    np.zeros((periods, 1)), index=date_rng, columns=[name]
+                )
+            else:
+                df = pd.DataFrame(
+                    np.empty((periods, 1)) * np.nan, index=date_rng, columns=[name]
+                )
+
+            stacked_df = stack_timeseries(df).reindex(columns=HEADER_B3_TS)
+            stacked_df["region"] = region
+            stacked_df["scenario_key"] = config.settings.create_empty_ts.filter_ts
+
+            ts_df = pd.concat([ts_df, stacked_df], ignore_index=True)
+
+    return ts_df
+
+
+@pytest.fixture
+def ts_values():
+    default = config.settings.create_empty_ts.ts_values
+    yield lambda value: config.settings.set("create_empty_ts.ts_values", value)
+    config.settings.set("create_empty_ts.ts_values", default)
+
+
+@pytest.mark.parametrize("value", ["zeros", "empty"])
+def test_get_empty_stacked_ts(tmp_path, ts_values, value):
+    ts_values(value)
+
+    date_rng = get_date_range(SCENARIO_SPECS)
+    assert date_rng[0] == pd.Timestamp("2017-01-01 00:00:00")
+    assert len(date_rng) == 48
+
+    ts = get_empty_stacked_ts(PROFILE_NAMES, REGIONS, date_rng)
+    expected = stack_empty_ts_per_profile(PROFILE_NAMES, REGIONS, SCENARIO_SPECS)
+
+    assert ts.columns.equals(pd.Index(HEADER_B3_TS))
+    assert list(ts["region"]) == ["B", "B", "BB", "BB"]
+    assert list(ts["var_name"]) == PROFILE_NAMES * 2
+
+    # The saved files are the same as before
+    path = os.path.join(tmp_path, "empty_ts.csv")
+    path_expected = os.path.join(tmp_path, "empty_ts_expected.csv")
+    save_ts(ts, path)
+    save_ts(expected, path_expected)
+
+    with open(path) as file, open(path_expected) as file_expected:
+        assert file.read() == file_expected.read()
+
+
+def test_get_df_of_all_empty_ts():
+    date_rng = get_date_range(SCENARIO_SPECS)
+
+    ts = get_df_of_all_empty_ts(PROFILE_NAMES, "B", date_rng)
+
+    pd.testing.assert_frame_equal(
+        ts, get_empty_stacked_ts(PROFILE_NAMES, ["B"], date_rng)
+    )
@@ -23,6 +23,8 @@ from oemof_b3.tools.data_processing import (
     check_consistency_timeindex,
     merge_a_into_b,
     oemof_results_ts_to_oemof_b3,
+    prepare_attr_name,
+    StackedTimeseries,
 )
 
 # Paths
@@ -388,6 +390,38 @@ def test_df_agg_ts():
     pd.testing.assert_frame_equal(df_agg_by_region, df_agg_expected, check_dtype=False)
 
 
+def test_stacked_timeseries():
+    """
+    This test checks whether StackedTimeseries converts stacked time series losslessly and
+    filters, aggregates and unstacks them like the functions on DataFrames
+    """
+    df = load_b3_timeseries(path_file_ts_stacked)
+
+    stacked = StackedTimeseries.from_frame(df)
+
+    pd.testing.assert_frame_equal(stacked.to_frame(), df)
+
+    pd.testing.assert_frame_equal(
+        stacked.filter("region", "BE").to_frame(), filter_df(df, "region", "BE")
+    )
+
+    df_agg = stacked.aggregate("region").to_frame()
+    df_agg_expected = aggregate_timeseries(df, "region")
+
+    pd.testing.assert_frame_equal(
+        df_agg,
+        df_agg_expected[df_agg.columns],
+        check_dtype=False,
+        check_index_type=False,
+        check_names=False,
+    )
+
+    pd.testing.assert_frame_equal(
+        stacked.filter("region", "BE").unstack(),
+        unstack_timeseries(filter_df(df, "region", "BE")),
+    )
+
+
 def test_check_consistency():
     """
     This test checks whether
@@ -572,6 +606,48 @@ def test_merge_a_into_b():
     assert c.equals(expected_result)
 
 
+def test_prepare_attr_name():
+    r"""
+    Tests that empty names are set by convention and given names are kept.
+    """
+    sc = pd.DataFrame(
+        {
+            "name": [np.nan, "B-ch4-gt", "my-gt", np.nan],
+            "region": ["B", "B", "BB", "BB"],
+            "carrier": ["ch4", "ch4", "ch4", "electricity"],
+            "tech": ["gt", "gt", "gt", "demand"],
+        }
+    )
+
+    with patch("oemof_b3.tools.data_processing.logger.warning") as mock_warning:
+        result = prepare_attr_name(sc, overwrite=False)
+
+    # Rows with given names come first
+    assert list(result.index) == [1, 2, 0, 3]
+    assert list(result["name"]) == [
+        "B-ch4-gt",
+        "my-gt",
+        "B-ch4-gt",
+        "BB-electricity-demand",
+    ]
+
+    # The conflicting name is reported
+    mock_warning.assert_called_once()
+    assert "BB-ch4-gt" in mock_warning.call_args[0][0]
+
+    result = prepare_attr_name(sc, overwrite=True)
+
+    assert list(result["name"]) == [
+        "B-ch4-gt",
+        "BB-ch4-gt",
+        "B-ch4-gt",
+        "BB-electricity-demand",
+    ]
+
+    with pytest.raises(KeyError):
+        prepare_attr_name(sc.drop(columns="tech"), overwrite=False)
+
+
 def test_oemof_results_flows_to_b3_ts():
     df = load_tabular_results_ts(path_oemof_results_flows)
 
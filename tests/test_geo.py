@@ -0,0 +1,112 @@
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+gpd = pytest.importorskip("geopandas")
+
+from geopandas.testing import assert_geodataframe_equal  # noqa: E402
+from shapely.geometry import box  # noqa: E402
+
+from oemof_b3.tools import geo  # noqa: E402
+
+
+def get_regions(crs=4326):
+    regions = gpd.GeoDataFrame(
+        {
+            "name": ["Berlin", "Brandenburg", "Sachsen"],
+            "nuts": ["DE3", "DE4", "DED"],
+        },
+        geometry=[
+            box(13.0, 52.0, 14.0, 53.0),
+            box(12.0, 51.0, 13.0, 52.0),
+            box(12, 50, 13, 51),
+        ],
+        crs=4326,
+    )
+    return regions.to_crs(crs)
+
+
+def get_register():
+    return pd.DataFrame(
+        {
+            "lat": [52.5, 51.5, 49.5, 52.2, 50.5],
+            "lon": [13.4, 12.5, 10.0, 13.9, 12.1],
+            "capacity": [10.0, 20.0, 30.0, 40.0, 50.0],
+        },
+        index=[13, 11, 12, 10, 14],
+    )
+
+
+def sjoin_register(register, regions):
+    r"""Adds the regions to the register with a spatial join, as done before the RegionIndex"""
+    register = register.copy()
+    register["coordinates"] = gpd.points_from_xy(register.lon, register.lat)
+    register_gdf = gpd.GeoDataFrame(register, geometry="coordinates", crs=4326)
+    return pd.DataFrame(gpd.sjoin(register_gdf, regions, predicate="within"))
+
+
+def test_get_points():
+    register = get_register()
+
+    points = geo.get_points(register)
+
+    assert points.crs.equals(4326)
+    assert points.index.equals(register.index)
+    assert list(points.x) == list(register.lon)
+    assert list(points.y) == list(register.lat)
+
+    projected = geo.get_points(register, crs=25833)
+
+    assert projected.crs.equals(25833)
+    assert projected.geom_equals_exact(points.to_crs(25833), tolerance=1e-6).all()
+
+
+@pytest.mark.parametrize("crs", [4326, 25833])
+def test_add_region_to_register(crs):
+    register = get_register()
+    regions = get_regions(crs)
+
+    region_index = geo.RegionIndex(regions)
+
+    # The index is reused for several registers
+    for _ in range(2):
+        new_register = region_index.add_region_to_register(register)
+
+        # Points outside all regions are dropped, the points stay in EPSG:4326
+        expected = sjoin_register(register, get_regions())
+
+        assert new_register["coordinates"].values.crs.equals(4326)
+        assert_frame_equal(new_register.sort_index(), expected.sort_index())
+
+    assert list(register.columns) == ["lat", "lon", "capacity"]
+    assert_frame_equal(geo.add_region_to_register(register, regions), new_register)
+
+
+def test_load_regions(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    file_path = os.path.join(tmp_path, "regions.gpkg")
+    get_regions().to_file(file_path, driver="GPKG")
+
+    cache_dir = os.path.join(tmp_path, "cache")
+
+    expected = geo.filter_regions_file(
+        geo.load_regions_file(file_path), ["Berlin", "Sachsen"]
+    )
+
+    regions = geo.load_regions(file_path, ["Berlin", "Sachsen"], cache_dir=cache_dir)
+    assert_geodataframe_equal(regions, expected)
+
+    # The second call reads the regions from the GeoParquet cache
+    (cache_file,) = os.listdir(cache_dir)
+    assert cache_file.endswith(".parquet")
+
+    cached = geo.load_regions(file_path, ["Berlin", "Sachsen"], cache_dir=cache_dir)
+    assert_geodataframe_equal(cached, expected)
+
+    # Other regions are cached separately
+    regions = geo.load_regions(file_path, ["Brandenburg"], cache_dir=cache_dir)
+    assert list(regions["name"]) == ["Brandenburg"]
+    assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,113 @@
+import logging
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from oemof_b3.tools.oep import get_n_rows, upload_df_to_oep_table
+
+# Paths
+this_path = os.path.abspath(os.path.dirname(__file__))
+
+path_scalars = os.path.join(this_path, "_files", "oemof_b3_resources_scalars.csv")
+
+logger = logging.getLogger("test_oep")
+
+
+@pytest.fixture
+def scalars():
+    scalars = pd.read_csv(path_scalars, sep=";")
+    return scalars.rename_axis("id_scal").reset_index()
+
+
+@pytest.fixture
+def con(tmp_path):
+    con = sqlite3.connect(os.path.join(tmp_path, "test.db"))
+    yield con
+    con.close()
+
+
+def test_upload_df_to_oep_table(scalars, con):
+    n_uploaded = upload_df_to_oep_table(
+        scalars, "scalars", con, schema=None, logger=logger, chunksize=3
+    )
+
+    assert n_uploaded == len(scalars)
+    assert get_n_rows("scalars", con) == len(scalars)
+
+    uploaded = pd.read_sql("SELECT * FROM scalars", con)
+    assert_frame_equal(uploaded, scalars, check_dtype=False)
+
+
+def test_upload_df_to_oep_table_resume(scalars, con):
+    # An interrupted upload wrote the first rows
+    upload_df_to_oep_table(
+        scalars.iloc[:4], "scalars", con, schema=None, logger=logger, chunksize=3
+    )
+
+    n_uploaded = upload_df_to_oep_table(
+        scalars, "scalars", con, schema=None, logger=logger, chunksize=3, resume=True
+    )
+
+    assert n_uploaded == len(scalars)
+
+    uploaded = pd.read_sql("SELECT * FROM scalars", con)
+    assert_frame_equal(uploaded, scalars, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "uploaded",
+    [
+        lambda scalars: pd.concat([scalars, scalars.iloc[:1]]),
+        lambda scalars: scalars.iloc[2:5],
+    ],
+    ids=["more_rows", "other_rows"],
+)
+def test_upload_df_to_oep_table_resume_mismatch(scalars, con, caplog, uploaded):
+    # The table holds rows that are not the first rows of the data
+    uploaded(scalars).to_sql("scalars", con, index=False)
+    expected = pd.read_sql("SELECT * FROM scalars", con)
+
+    with caplog.at_level(logging.ERROR, logger="test_oep"):
+        n_uploaded = upload_df_to_oep_table(
+            scalars, "scalars", con, schema=None, logger=logger, resume=True
+        )
+
+    assert n_uploaded == 0
+    assert "Cannot resume upload to scalars" in caplog.text
+
+    assert_frame_equal(pd.read_sql("SELECT * FROM scalars", con), expected)
+
+
+def test_upload_df_to_oep_table_retry(scalars, con, monkeypatch):
+    to_sql = pd.DataFrame.to_sql
+    calls = []
+
+    def fail_second_chunk_once(df, *args, **kwargs):
+        calls.append(len(df))
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("database is locked")
+        return to_sql(df, *args, **kwargs)
+
+    monkeypatch.setattr(pd.DataFrame, "to_sql", fail_second_chunk_once)
+
+    n_uploaded = upload_df_to_oep_table(
+        scalars, "scalars", con, None, logger, chunksize=3, retries=1, retry_wait=0
+    )
+
+    assert n_uploaded == len(scalars)
+    assert get_n_rows("scalars", con) == len(scalars)
+
+    # Without retries, the upload stops after the committed chunks
+    con.execute("DELETE FROM scalars")
+    con.commit()
+    calls.clear()
+
+    n_uploaded = upload_df_to_oep_table(
+        scalars, "scalars", con, None, logger, chunksize=3, retries=0
+    )
+
+    assert n_uploaded == 3
+    assert get_n_rows("scalars", con) == 3
@@ -0,0 +1,47 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("oemoflex")
+
+from oemof_b3.tools.plots import PlotScheduler  # noqa: E402
+
+CALLS = []
+
+
+def write_plot(df, path):
+    CALLS.append(path)
+    df.to_csv(path)
+    return path
+
+
+def run_scheduler(target, hash_dir, df):
+    os.makedirs(target, exist_ok=True)
+    scheduler = PlotScheduler(target, hash_dir, n_jobs=1)
+    scheduler.add("plot", write_plot, df, os.path.join(target, "plot.csv"))
+    scheduler.run()
+
+
+def test_plot_scheduler_restores_unchanged_plots(tmp_path):
+    CALLS.clear()
+    target = os.path.join(tmp_path, "plots", "scalars")
+    df = pd.DataFrame({"var_value": [1.0, 2.0]})
+
+    run_scheduler(target, tmp_path, df)
+    assert len(CALLS) == 1
+
+    # Snakemake removes the target before running the rule again
+    shutil.rmtree(target)
+    run_scheduler(target, tmp_path, df)
+
+    assert len(CALLS) == 1
+    assert pd.read_csv(os.path.join(target, "plot.csv"), index_col=0).equals(df)
+
+    # Changed data is rendered again
+    shutil.rmtree(target)
+    run_scheduler(target, tmp_path, df * 2)
+
+    assert len(CALLS) == 2
+    assert pd.read_csv(os.path.join(target, "plot.csv"), index_col=0).equals(df * 2)
@@ -0,0 +1,218 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from oemof_b3.tools.data_processing import HEADER_B3_SCAL, load_b3_scalars
+from scripts.prepare_re_potential import (
+    CARRIERS,
+    DROP_COLS,
+    KEEP_COLS,
+    calculate_area_potential,
+    calculate_potential_pv,
+    calculate_potential_wind,
+    calculate_power_potential,
+    calculate_sensitivity,
+    load_area_potential,
+    save_outputs,
+)
+
+NUTS = ["DE401", "DE402", "DE403"]
+
+KREISE = pd.DataFrame(
+    {"NUTS": NUTS + ["Brandenburg"], "Kreis": ["Kreis A", "Kreis B", "Kreis C", "BB"]}
+)
+
+ASSUMPTIONS = {
+    # carrier: (minimum_area, degree_of_agreement, required_specific_area)
+    "solar": (1000.0, 0.5, 10000.0),
+    "wind": (2000.0, 0.8, 200000.0),
+}
+
+
+def write_areas(path, n, seed):
+    r"""Writes a raw area potential file with `n` synthetic areas"""
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(0, 5000, n)
+    areas = pd.DataFrame(
+        {
+            "fid": range(seed * 100, seed * 100 + n),
+            "NUTS": rng.choice(NUTS, n),
+            "area": area,
+            "overlap_pv_agriculture_area": area * rng.uniform(0, 0.2, n),
+            "overlap_pv_road_railway_area": area * rng.uniform(0, 0.2, n),
+            "overlap_wind_area": area * rng.uniform(0, 0.2, n),
+        }
+    )
+    for column in DROP_COLS:
+        areas[column] = "x"
+
+    areas.to_csv(path, index=False)
+
+
+def write_assumptions(path):
+    rows = []
+    for carrier, values in ASSUMPTIONS.items():
+        names = ["minimum_area", "degree_of_agreement", "required_specific_area"]
+        rows.extend(
+            {"carrier": carrier, "var_name": name, "var_value": value}
+            for name, value in zip(names, values)
+        )
+    rows.append(
+        {
+            "carrier": "solar",
+            "var_name": "reduction_by_wind_overlap",
+            "var_value": 0.1,
+        }
+    )
+
+    assumptions = pd.DataFrame(rows).reindex(columns=HEADER_B3_SCAL)
+    assumptions["scenario_key"] = "ALL"
+    assumptions.index.name = "id_scal"
+    assumptions.to_csv(path, sep=";")
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    paths = {
+        name: os.path.join(tmp_path, f"{name}.csv")
+        for name in ["pv_agriculture", "pv_road_railway", "wind", "assumptions"]
+    }
+    write_areas(paths["pv_agriculture"], 30, seed=1)
+    write_areas(paths["pv_road_railway"], 20, seed=2)
+    write_areas(paths["wind"], 40, seed=3)
+    write_assumptions(paths["assumptions"])
+
+    return paths
+
+
+def calculate_kreise_single_run(area_data, type, assumptions, output_dir):
+    r"""
+    Calculates the potential of "Landkreise" like the script did before all potentials were
+    calculated in memory: the area potential of single areas is saved and read again.
+    """
+    values = assumptions.loc[assumptions["carrier"] == CARRIERS[type]]
+    values = values.set_index("var_name")
+    values = values["var_value"]
+
+    areas = area_data.loc[area_data["area"] >= values["minimum_area"]].copy()
+    if type == "pv":
+        areas["area_before_reduction_by_overlap"] = areas["area"]
+        areas["area"] = areas["area"] - (
+            areas["overlap_wind_area"] * values["reduction_by_wind_overlap"]
+        )
+
+    filename = os.path.join(output_dir, f"single_run_{type}.csv")
+    areas.to_csv(filename, sep=";")
+    potentials = pd.read_csv(filename, header=0, sep=";")
+
+    potentials["power_potential"] = (
+        potentials["area"] * values["required_specific_area"] / 1e6
+    )
+    potentials["power_potential_agreed"] = (
+        potentials["power_potential"] * values["degree_of_agreement"]
+    )
+
+    potentials_kreise = potentials.groupby("NUTS")[KEEP_COLS[type]].sum()
+    potential_bb = (
+        pd.DataFrame(potentials_kreise.sum(axis=0))
+        .transpose()
+        .rename({0: "Brandenburg"})
+    )
+    potentials_kreise = pd.concat([potentials_kreise, potential_bb], axis=0)
+    potentials_kreise.index.name = "NUTS"
+
+    return pd.merge(left=potentials_kreise, right=KREISE, on="NUTS").set_index("NUTS")
+
+
+def read_output(output_dir, filename):
+    return pd.read_csv(os.path.join(output_dir, filename), sep=";", index_col=0)
+
+
+def test_potential_kreise(inputs, tmp_path):
+    assumptions = load_b3_scalars(inputs["assumptions"])
+    output_dir = os.path.join(tmp_path, "RE_potential")
+
+    outputs = calculate_potential_pv(
+        areas_agriculture=load_area_potential(inputs["pv_agriculture"]),
+        areas_road_railway=load_area_potential(inputs["pv_road_railway"]),
+        kreise=KREISE,
+        assumptions=assumptions,
+    )
+    outputs.update(
+        calculate_potential_wind(
+            areas_wind=load_area_potential(inputs["wind"]),
+            kreise=KREISE,
+            assumptions=assumptions,
+        )
+    )
+    save_outputs(outputs, output_dir, jobs=2)
+
+    area_data = {
+        "pv": read_output(output_dir, "area_potential_single_areas_pv_raw.csv"),
+        "wind": load_area_potential(inputs["wind"]),
+    }
+
+    for type, areas in area_data.items():
+        expected = calculate_kreise_single_run(areas, type, assumptions, tmp_path)
+        expected.to_csv(os.path.join(tmp_path, "expected.csv"), sep=";")
+
+        result = read_output(output_dir, f"power_potential_{type}_kreise.csv")
+
+        assert list(result.index) == NUTS + ["Brandenburg"]
+        assert_frame_equal(result, read_output(tmp_path, "expected.csv"))
+
+
+@pytest.mark.parametrize("type", ["pv", "wind"])
+def test_calculate_sensitivity(inputs, type):
+    assumptions = load_b3_scalars(inputs["assumptions"])
+    areas = load_area_potential(inputs["wind"])
+    minimum_areas = [0.0, 1500.0, 3000.0]
+    degrees_of_agreement = [0.3, 1.0]
+
+    potentials_kreise = calculate_sensitivity(
+        areas,
+        type,
+        assumptions,
+        KREISE,
+        {"minimum_area": minimum_areas, "degree_of_agreement": degrees_of_agreement},
+    )
+
+    assert len(potentials_kreise) == len(minimum_areas) * len(degrees_of_agreement) * (
+        len(NUTS) + 1
+    )
+
+    required_specific_area = ASSUMPTIONS[CARRIERS[type]][2] / 1e6
+    columns = ["area", "power_potential", "power_potential_agreed", "Kreis"]
+
+    # Each combination equals a separate calculation of area and power potential
+    for minimum_area in minimum_areas:
+        for degree_of_agreement in degrees_of_agreement:
+            result = potentials_kreise.loc[
+                (potentials_kreise["minimum_area"] == minimum_area)
+                & (potentials_kreise["degree_of_agreement"] == degree_of_agreement)
+            ]
+
+            _, expected = calculate_power_potential(
+                type=type,
+                potentials=calculate_area_potential(
+                    areas,
+                    type=type,
+                    minimum_area=minimum_area,
+                    reduction_by_wind_overlap=0.1 if type == "pv" else None,
+                ),
+                required_specific_area=required_specific_area,
+                degree_of_agreement=degree_of_agreement,
+                kreise=KREISE,
+            )
+
+            assert_frame_equal(result[columns], expected[columns])
+
+
+def test_calculate_sensitivity_without_values(inputs):
+    assumptions = load_b3_scalars(inputs["assumptions"])
+    areas = load_area_potential(inputs["wind"])
+
+    assert calculate_sensitivity(areas, "wind", assumptions, KREISE, {}) is None
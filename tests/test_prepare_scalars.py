@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.tools.economics import annuity as oemof_annuity
+
+from scripts.prepare_scalars import annuise_investment_cost, annuity
+from oemof_b3.tools.data_processing import HEADER_B3_SCAL, ScalarProcessor
+
+
+def get_scalars(wacc):
+    rows = []
+    for scenario_key, _wacc in wacc.items():
+        for tech, storage in [("gt", False), ("battery", True)]:
+            values = {
+                "capacity_cost_overnight": 100.0,
+                "fixom_cost": 2.0,
+                "lifetime": 20,
+            }
+            if storage:
+                values.update(
+                    {
+                        "storage_capacity_cost_overnight": 50.0,
+                        "storage_fixom_cost": 1.0,
+                    }
+                )
+            for var_name, var_value in values.items():
+                rows.append(
+                    {
+                        "scenario_key": scenario_key,
+                        "carrier": "electricity",
+                        "region": "ALL",
+                        "tech": tech,
+                        "type": "storage" if storage else "conversion",
+                        "var_name": var_name,
+                        "var_value": var_value,
+                    }
+                )
+        rows.append(
+            {
+                "scenario_key": scenario_key,
+                "carrier": "ALL",
+                "region": "ALL",
+                "tech": "ALL",
+                "type": "ALL",
+                "var_name": "wacc",
+                "var_value": _wacc,
+            }
+        )
+
+    return pd.DataFrame(rows).reindex(columns=HEADER_B3_SCAL)
+
+
+def test_annuity_equals_oemof_annuity():
+    capex = np.array([100.0, 2000.0, 5.0])
+    n = np.array([20, 40, 1])
+    wacc = np.array([0.05, 0.02, 0.1])
+
+    expected = [oemof_annuity(*args) for args in zip(capex, n, wacc)]
+
+    np.testing.assert_allclose(annuity(capex, n, wacc), expected)
+
+
+def test_annuity_out_of_bounds():
+    with pytest.raises(ValueError):
+        annuity(np.array([100.0]), np.array([0]), np.array([0.05]))
+
+
+def test_annuise_investment_cost():
+    wacc = {"base": 0.05, "high": 0.1}
+    sc = ScalarProcessor(get_scalars(wacc))
+
+    annuise_investment_cost(sc)
+
+    assert set(sc.scalars["var_name"]) == {"capacity_cost", "storage_capacity_cost"}
+
+    for scenario_key, _wacc in wacc.items():
+        result = sc.scalars.loc[sc.scalars["scenario_key"] == scenario_key]
+        result = result.set_index(["tech", "var_name"])["var_value"]
+
+        capacity_cost = oemof_annuity(100.0, 20, _wacc) + 2.0
+        storage_capacity_cost = oemof_annuity(50.0, 20, _wacc) + 1.0
+
+        assert result[("gt", "capacity_cost")] == pytest.approx(capacity_cost)
+        assert result[("battery", "capacity_cost")] == pytest.approx(capacity_cost)
+        assert result[("battery", "storage_capacity_cost")] == pytest.approx(
+            storage_capacity_cost
+        )
+        assert ("gt", "storage_capacity_cost") not in result.index
+
+
+def test_annuise_investment_cost_missing_wacc():
+    scalars = get_scalars({"base": 0.05, "high": 0.1})
+    scalars = scalars.loc[
+        ~((scalars["var_name"] == "wacc") & (scalars["scenario_key"] == "high"))
+    ]
+
+    with pytest.raises(ValueError, match="high"):
+        annuise_investment_cost(ScalarProcessor(scalars))
@@ -1,8 +1,19 @@
 import os
+
+import numpy as np
+import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal, assert_series_equal
 
-from scripts.prepare_vehicle_charging_demand import prepare_vehicle_charging_demand
+from scripts.prepare_vehicle_charging_demand import (
+    HOME_END,
+    HOME_START,
+    WORK_END,
+    WORK_START,
+    get_time_of_day_mask,
+    prepare_vehicle_charging_demand,
+    smooth_profiles,
+)
 from oemof_b3.tools.data_processing import load_b3_timeseries, save_df
 
 # Paths
@@ -54,5 +65,84 @@ def test_prepare_vehicle_charging_demand_smoothing():
     assert pytest.approx(sum(df["series"].iloc[0]), 0.000000001) == float(1)
 
 
+@pytest.mark.parametrize(
+    "start, end", [("06:00", "14:00"), ("15:00", "05:00"), ("23:30", "00:30")]
+)
+def test_get_time_of_day_mask(start, end):
+    index = pd.date_range("2019-01-01", periods=96, freq="30min", tz="UTC")
+    ts = pd.Series(range(len(index)), index=index)
+
+    mask = get_time_of_day_mask(index, start, end)
+
+    assert ts[mask].index.equals(ts.between_time(start, end).index)
+
+
+def get_charging_profiles():
+    index = pd.date_range("2019-01-01", periods=24 * 5, freq="H", tz="UTC")
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        rng.random((len(index), 3)),
+        index=index,
+        columns=["sum UC home", "sum UC work", "sum UC public"],
+    )
+    df["sum CS power"] = df.sum(axis=1)
+
+    return df
+
+
+def smooth_profiles_between_time(df):
+    r"""Smoothes the profiles with pandas.Series.between_time, as done before"""
+
+    def balance_between_hours(ts, start, end):
+        ts.loc[ts.between_time(start, end).index] = ts.between_time(start, end).mean()
+        return ts
+
+    df["sum UC work"] = (
+        df.groupby(df.index.date)["sum UC work"]
+        .apply(lambda x: balance_between_hours(ts=x, start=WORK_START, end=WORK_END))
+        .values
+    )
+    df["temp"] = df.index.dayofyear + (df.index.hour >= 12)
+    df["sum UC home"] = (
+        df.groupby(df["temp"])["sum UC home"]
+        .apply(lambda x: balance_between_hours(ts=x, start=HOME_START, end=HOME_END))
+        .values
+    )
+    df["sum CS power"] = df.drop("sum CS power", axis=1).sum(axis=1)
+
+    return df
+
+
+def test_smooth_profiles():
+    # the home profile is balanced over midnight
+    assert HOME_START > HOME_END
+
+    df = get_charging_profiles()
+    smoothed = smooth_profiles(df.copy())
+
+    assert_frame_equal(smoothed, smooth_profiles_between_time(df.copy()))
+    assert_series_equal(smoothed["sum UC public"], df["sum UC public"])
+
+    # work: values between WORK_START and WORK_END are replaced by their daily average
+    work = get_time_of_day_mask(df.index, WORK_START, WORK_END)
+    assert_series_equal(
+        smoothed.loc[~work, "sum UC work"], df.loc[~work, "sum UC work"]
+    )
+    for _, day in smoothed.loc[work, "sum UC work"].groupby(df.index[work].date):
+        assert np.allclose(day, day.iloc[0])
+    assert np.isclose(smoothed["sum UC work"].sum(), df["sum UC work"].sum())
+
+    # home: values from HOME_START until HOME_END of the next day share one average
+    home = get_time_of_day_mask(df.index, HOME_START, HOME_END)
+    assert_series_equal(
+        smoothed.loc[~home, "sum UC home"], df.loc[~home, "sum UC home"]
+    )
+    assert np.isclose(smoothed["sum UC home"].sum(), df["sum UC home"].sum())
+
+    night = df.loc["2019-01-01 " + HOME_START : "2019-01-02 " + HOME_END, "sum UC home"]
+    assert np.allclose(smoothed.loc[night.index, "sum UC home"], night.mean())
+
+
 def teardown_function():
-    os.remove(temp_filename)
+    if os.path.exists(temp_filename):
+        os.remove(temp_filename)
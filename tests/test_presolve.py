@@ -0,0 +1,269 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+solph = pytest.importorskip("oemof.solph")
+
+from oemof.solph import Bus, EnergySystem, Flow, Investment  # noqa: E402
+from oemof.solph.components import (  # noqa: E402
+    Converter,
+    ExtractionTurbineCHP,
+    GenericStorage,
+    Link,
+    Sink,
+    Source,
+)
+
+from oemof_b3.tools import presolve  # noqa: E402
+
+N_TIMESTEPS = 4
+
+PROFILE = [0.1, 0.5, 0.0, 0.2]
+
+
+def get_nodes(es):
+    return {str(node): node for node in es.nodes}
+
+
+def get_graph(es):
+    r"""Returns the flows of all nodes by the labels of their input and output"""
+    return {(str(i), str(o)): flow for (i, o), flow in es.flows().items()}
+
+
+def build_energysystem():
+    r"""
+    Builds an energy system with active and inactive components. The names of the inactive
+    components end with '-off'.
+    """
+    es = EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=N_TIMESTEPS + 1, freq="H"),
+        infer_last_interval=False,
+    )
+
+    el = Bus(label="B-electricity")
+    el_off = Bus(label="BB-electricity-off")
+    ch4 = Bus(label="B-ch4")
+    heat = Bus(label="B-heat")
+
+    es.add(
+        el,
+        el_off,
+        ch4,
+        heat,
+        Source(label="B-ch4-import", outputs={ch4: Flow(variable_costs=30)}),
+        Source(label="B-solar-pv", outputs={el: Flow(nominal_value=10, fix=PROFILE)}),
+        Source(
+            label="B-wind-off",
+            outputs={el: Flow(nominal_value=10, max=[0] * N_TIMESTEPS)},
+        ),
+        Source(label="BB-solar-pv-off", outputs={el_off: Flow(nominal_value=0)}),
+        # One output with zero capacity forces the input and the other output to zero
+        Converter(
+            label="B-ch4-bpchp-off",
+            inputs={ch4: Flow()},
+            outputs={el: Flow(nominal_value=0), heat: Flow()},
+            conversion_factors={el: 0.3, heat: 0.5},
+        ),
+        Converter(
+            label="B-ch4-gt",
+            inputs={ch4: Flow()},
+            outputs={el: Flow(nominal_value=100)},
+            conversion_factors={el: 0.4},
+        ),
+        # The extraction turbine is never removed
+        ExtractionTurbineCHP(
+            label="B-ch4-extchp",
+            inputs={ch4: Flow()},
+            outputs={el: Flow(nominal_value=0), heat: Flow(nominal_value=0)},
+            conversion_factors={el: 0.3, heat: 0.5},
+            conversion_factor_full_condensation={el: 0.5},
+        ),
+        # Zero output capacity in both directions forces the inputs to zero
+        Link(
+            label="B-BB-link-off",
+            inputs={el: Flow(), el_off: Flow()},
+            outputs={el_off: Flow(nominal_value=0), el: Flow(nominal_value=0)},
+            conversion_factors={(el, el_off): 0.95, (el_off, el): 0.95},
+        ),
+        GenericStorage(
+            label="B-electricity-liion-off",
+            inputs={el: Flow(nominal_value=0)},
+            outputs={el: Flow(nominal_value=0)},
+            nominal_storage_capacity=0,
+        ),
+        # A storage with storage capacity is kept, even if its flows are zero
+        GenericStorage(
+            label="B-electricity-phs",
+            inputs={el: Flow(nominal_value=0)},
+            outputs={el: Flow(nominal_value=0)},
+            nominal_storage_capacity=10,
+        ),
+        GenericStorage(
+            label="B-electricity-inv",
+            inputs={el: Flow(nominal_value=0)},
+            outputs={el: Flow(nominal_value=0)},
+            investment=Investment(ep_costs=1),
+        ),
+        Sink(
+            label="B-electricity-demand",
+            inputs={el: Flow(nominal_value=5, fix=[1] * N_TIMESTEPS)},
+        ),
+        Sink(label="B-heat-demand", inputs={heat: Flow()}),
+    )
+
+    return es
+
+
+@pytest.mark.parametrize(
+    "flow, expected",
+    [
+        (Flow(), False),
+        (Flow(nominal_value=0), True),
+        (Flow(nominal_value=10), False),
+        (Flow(nominal_value=10, max=[0] * N_TIMESTEPS), True),
+        (Flow(nominal_value=10, max=[0, 0, 0, 1]), False),
+        (Flow(nominal_value=10, fix=[0] * N_TIMESTEPS), True),
+        (Flow(nominal_value=10, fix=PROFILE), False),
+        (Flow(nominal_value=Investment(ep_costs=1), max=[0] * N_TIMESTEPS), False),
+    ],
+)
+def test_is_zero_flow(flow, expected):
+    assert presolve.is_zero_flow(flow, N_TIMESTEPS) is expected
+
+
+def test_is_inactive():
+    es = build_energysystem()
+    nodes = get_nodes(es)
+
+    zero_flows = {
+        flow
+        for flow, values in es.flows().items()
+        if presolve.is_zero_flow(values, N_TIMESTEPS)
+    }
+
+    inactive = {
+        label
+        for label, node in nodes.items()
+        if presolve.is_inactive(node, zero_flows, N_TIMESTEPS)
+    }
+
+    assert inactive == {
+        "B-wind-off",
+        "BB-solar-pv-off",
+        "B-ch4-bpchp-off",
+        "B-BB-link-off",
+        "B-electricity-liion-off",
+    }
+
+    # The zero flows are propagated through the converter, but not to other nodes
+    bpchp = nodes["B-ch4-bpchp-off"]
+    assert (nodes["B-ch4"], bpchp) not in zero_flows
+    assert not presolve.is_inactive(nodes["B-heat-demand"], zero_flows, N_TIMESTEPS)
+
+    # All flows of the extraction turbine are zero, but it is kept
+    extchp = nodes["B-ch4-extchp"]
+    assert all((extchp, o) in zero_flows for o in extchp.outputs)
+    assert not presolve.is_inactive(extchp, zero_flows, N_TIMESTEPS)
+
+    # Buses only connected to inactive components are removed as well
+    assert {str(node) for node in presolve.get_inactive_nodes(es)} == inactive | {
+        "BB-electricity-off"
+    }
+
+
+def test_prune_and_restore_energysystem():
+    es = build_energysystem()
+    graph = get_graph(es)
+    nodes = list(es.nodes)
+
+    pruned, removed_nodes, removed_flows = presolve.prune_energysystem(es)
+
+    removed = {str(node) for node in removed_nodes}
+    labels = {str(node) for node in nodes}
+    assert {str(node) for node in pruned.nodes} == labels - removed
+    assert pruned.timeindex.equals(es.timeindex)
+
+    # The active nodes are disconnected from the removed nodes
+    pruned_graph = get_graph(pruned)
+    assert set(pruned_graph) == {
+        (i, o) for i, o in graph if i not in removed and o not in removed
+    }
+    removed_graph = {(str(i), str(o)) for i, o in removed_flows}
+    assert removed_graph == set(graph) - set(pruned_graph)
+
+    presolve.restore_energysystem(removed_flows)
+
+    # The graph is the same as before, with the same flows
+    assert list(es.nodes) == nodes
+    restored_graph = get_graph(es)
+    assert restored_graph.keys() == graph.keys()
+    assert all(restored_graph[key] is flow for key, flow in graph.items())
+
+
+def get_results(es, flow):
+    r"""Returns results like processing.results with one flow and one storage content"""
+    nodes = get_nodes(es)
+    index = es.timeindex
+    columns = pd.Index(["flow"], name="variable_name")
+
+    return {
+        (nodes["B-electricity"], nodes["B-electricity-demand"]): {
+            "scalars": pd.Series(dtype=float),
+            "sequences": pd.DataFrame(flow, index=index, columns=columns),
+        },
+        (nodes["B-electricity-phs"], None): {
+            "scalars": pd.Series(dtype=float),
+            "sequences": pd.DataFrame(
+                [5.0] * len(index),
+                index=index,
+                columns=pd.Index(["storage_content"], name="variable_name"),
+            ),
+        },
+    }
+
+
+def test_add_zero_results():
+    es = build_energysystem()
+    results = get_results(es, [5.0, 5.0, 5.0, 5.0, np.nan])
+
+    _, removed_nodes, removed_flows = presolve.prune_energysystem(es)
+    presolve.restore_energysystem(removed_flows)
+
+    results = presolve.add_zero_results(
+        results, removed_nodes, removed_flows, es.timeindex
+    )
+
+    storage = get_nodes(es)["B-electricity-liion-off"]
+    assert set(results) == set(get_results(es, 5.0)) | set(removed_flows) | {
+        (storage, None)
+    }
+
+    for key in removed_flows:
+        sequences = results[key]["sequences"]
+
+        assert results[key]["scalars"].empty
+        assert list(sequences.columns) == ["flow"]
+        assert sequences.columns.name == "variable_name"
+        assert sequences.index.equals(es.timeindex)
+
+        # Like the flows in the results, the last timestep has no value
+        assert list(sequences["flow"].iloc[:-1]) == [0.0] * N_TIMESTEPS
+        assert np.isnan(sequences["flow"].iloc[-1])
+
+    # The storage content has a value in the last timestep as well
+    storage_content = results[(storage, None)]["sequences"]
+    assert list(storage_content.columns) == ["storage_content"]
+    assert list(storage_content["storage_content"]) == [0.0] * (N_TIMESTEPS + 1)
+
+
+def test_add_zero_results_without_flows():
+    es = build_energysystem()
+    _, removed_nodes, removed_flows = presolve.prune_energysystem(es)
+
+    results = presolve.add_zero_results({}, removed_nodes, removed_flows, es.timeindex)
+
+    for key in removed_flows:
+        sequences = results[key]["sequences"]
+        assert list(sequences.columns) == ["flow"]
+        assert sequences.index.equals(es.timeindex)
+        assert (sequences["flow"] == 0).all()
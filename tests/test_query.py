@@ -0,0 +1,156 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from oemof_b3.tools.data_processing import (
+    aggregate_scalars,
+    filter_df,
+    load_b3_scalars,
+    load_b3_timeseries,
+    multi_filter_df,
+    unstack_var_name,
+)
+
+pytest.importorskip("duckdb")
+
+from oemof_b3.tools.query import QueryEngine, get_where  # noqa: E402
+
+# Paths
+this_path = os.path.abspath(os.path.dirname(__file__))
+
+path_scalars = os.path.join(this_path, "_files", "oemof_b3_resources_scalars.csv")
+
+path_timeseries = os.path.join(
+    this_path, "_files", "oemof_b3_resources_timeseries_stacked.csv"
+)
+
+
+@pytest.fixture
+def engine():
+    with QueryEngine() as engine:
+        engine.register("scalars", path_scalars)
+        engine.register("timeseries", path_timeseries, kind="timeseries")
+        yield engine
+
+
+def assert_frame_equal(result, expected):
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_filter(engine):
+    scalars = load_b3_scalars(path_scalars)
+
+    assert_frame_equal(
+        engine.filter_df("scalars", "region", "BE"),
+        filter_df(scalars, "region", "BE"),
+    )
+
+    assert_frame_equal(
+        engine.filter_df("scalars", "region", ["BE"], inverse=True),
+        filter_df(scalars, "region", ["BE"], inverse=True),
+    )
+
+    assert_frame_equal(
+        engine.multi_filter_df("scalars", region="BB", var_name="capacity"),
+        multi_filter_df(scalars, region="BB", var_name="capacity"),
+    )
+
+    timeseries = load_b3_timeseries(path_timeseries)
+
+    assert_frame_equal(
+        engine.filter_df("timeseries", "region", "BE"),
+        filter_df(timeseries, "region", "BE"),
+    )
+
+
+@pytest.mark.parametrize("value", [0, 0.0, [0, 400000]])
+def test_filter_numbers(engine, value):
+    scalars = load_b3_scalars(path_scalars)
+
+    # Numbers match the values regardless of their format in the file, e.g. 0 and '0.0'
+    expected = filter_df(scalars, "var_value", value)
+    assert len(expected) > 2
+
+    assert_frame_equal(engine.filter_df("scalars", "var_value", value), expected)
+
+    assert_frame_equal(
+        engine.filter_df("scalars", "var_value", value, inverse=True),
+        filter_df(scalars, "var_value", value, inverse=True),
+    )
+
+
+def test_aggregate_scalars(engine):
+    expected = aggregate_scalars(load_b3_scalars(path_scalars), "region")
+    expected = expected.sort_values(["carrier", "tech", "type", "var_name"])
+    expected["name"] = np.nan
+
+    assert_frame_equal(engine.aggregate_scalars("scalars", "region"), expected)
+
+
+def test_get_where_inverse(engine):
+    scalars = load_b3_scalars(path_scalars)
+
+    # Rows matching any of the filters are dropped
+    where, parameters = get_where({"region": "BB", "tech": "gt"}, inverse=True)
+    result = engine._format(
+        engine.sql(f"SELECT * FROM scalars {where}", parameters), "scalars"
+    )
+
+    expected = filter_df(
+        filter_df(scalars, "region", "BB", inverse=True), "tech", "gt", inverse=True
+    )
+    assert len(expected) < len(filter_df(scalars, "region", "BB", inverse=True))
+
+    assert_frame_equal(result, expected)
+
+
+def write_scalars(tmp_path, var_values):
+    scalars = load_b3_scalars(path_scalars).iloc[: len(var_values)].copy()
+    scalars["var_value"] = var_values
+
+    path = os.path.join(tmp_path, "scalars.csv")
+    scalars.to_csv(path, sep=";")
+
+    return path
+
+
+def test_aggregate_scalars_missing_values(engine, tmp_path):
+    # Missing values are skipped, a group without values sums up to zero
+    path = write_scalars(tmp_path, [1.0, np.nan, np.nan, np.nan])
+    engine.register("missing", path)
+
+    expected = aggregate_scalars(load_b3_scalars(path), "region")
+    expected = expected.sort_values(["carrier", "tech", "type", "var_name"])
+    expected["name"] = np.nan
+
+    result = engine.aggregate_scalars("missing", "region")
+
+    assert list(result["var_value"]) == [1.0, 0.0]
+    assert_frame_equal(result, expected)
+
+
+def test_aggregate_scalars_not_numeric(engine, tmp_path):
+    path = write_scalars(tmp_path, [1.0, "a", 2.0, 3.0])
+    engine.register("not_numeric", path)
+
+    with pytest.raises(TypeError):
+        aggregate_scalars(load_b3_scalars(path), "region")
+
+    with pytest.raises(TypeError, match="not numeric"):
+        engine.aggregate_scalars("not_numeric", "region")
+
+
+def test_unstack_var_name(engine):
+    scalars = load_b3_scalars(path_scalars)
+
+    pd.testing.assert_frame_equal(
+        engine.unstack_var_name("scalars", region="BB"),
+        unstack_var_name(filter_df(scalars, "region", "BB")),
+        check_dtype=False,
+    )
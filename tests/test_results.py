@@ -0,0 +1,102 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from oemof_b3.tools.data_processing import HEADER_B3_SCAL
+from oemof_b3.tools.results import ResultsStore
+
+# Paths
+this_path = os.path.abspath(os.path.dirname(__file__))
+
+path_oemof_results_flows = os.path.join(this_path, "_files", "oemof_results_flows.csv")
+
+scalar_results = pd.DataFrame(
+    {
+        "scenario": ["base", "base", "base"],
+        "name": ["B-ch4-gt", "BB-ch4-gt", "B-electricity-demand"],
+        "var_name": ["capacity", "capacity", "flow_in_electricity"],
+        "carrier": ["ch4", "ch4", "electricity"],
+        "region": ["B", "BB", "B"],
+        "tech": ["gt", "gt", "demand"],
+        "type": ["conversion", "conversion", "load"],
+        "var_value": [10.0, 20.0, 100.0],
+        "var_unit": ["MW", "MW", "MWh"],
+    }
+)
+
+
+def create_postprocessed(base_dir, scenario):
+    postprocessed = os.path.join(base_dir, scenario, "postprocessed")
+    by_variable = os.path.join(postprocessed, "sequences", "by_variable")
+    os.makedirs(by_variable)
+
+    scalars = scalar_results.copy()
+    scalars["scenario"] = scenario
+    scalars.to_csv(os.path.join(postprocessed, "scalars.csv"), sep=";", index=False)
+
+    shutil.copy(path_oemof_results_flows, os.path.join(by_variable, "flow.csv"))
+
+    return postprocessed
+
+
+@pytest.fixture
+def postprocessed(tmp_path):
+    return [create_postprocessed(str(tmp_path), scenario) for scenario in ["a", "b"]]
+
+
+def test_scalars(postprocessed):
+    store = ResultsStore(postprocessed)
+
+    scalars = store.scalars
+
+    assert list(scalars.columns) == list(HEADER_B3_SCAL)
+    assert store.scenarios == ["a", "b"]
+    assert list(scalars["scenario_key"].unique()) == ["a", "b"]
+    assert len(scalars) == 2 * len(scalar_results)
+
+
+def test_scalars_filtered(postprocessed):
+    store = ResultsStore(postprocessed)
+
+    scalars = store.get_scalars(scenario_key="b", region=["B"])
+
+    assert set(scalars["scenario_key"]) == {"b"}
+    assert set(scalars["region"]) == {"B"}
+    assert len(scalars) == 2
+
+
+@pytest.mark.parametrize("cache_format", ["pickle", "parquet"])
+def test_binary_cache(postprocessed, tmp_path, cache_format):
+    if cache_format == "parquet":
+        pytest.importorskip("pyarrow")
+
+    cache_dir = str(tmp_path / "cache")
+
+    expected = ResultsStore(postprocessed).get_scalars(var_name="capacity")
+
+    # first store writes the cache, second one reads from it
+    ResultsStore(postprocessed, cache_format=cache_format, cache_dir=cache_dir).scalars
+
+    assert len(os.listdir(cache_dir)) == 2
+
+    store = ResultsStore(postprocessed, cache_format=cache_format, cache_dir=cache_dir)
+    scalars = store.get_scalars(var_name="capacity")
+
+    assert_frame_equal(scalars, expected)
+
+
+def test_b3_sequences(postprocessed):
+    store = ResultsStore(postprocessed)
+
+    assert store.list_sequences() == ["flow"]
+
+    with pytest.raises(ValueError):
+        store.get_sequences("flow")
+
+    flows = store.get_b3_sequences("flow", scenario_key="a", var_name="flow_out")
+
+    assert set(flows["scenario_key"]) == {"a"}
+    assert set(flows["var_name"]) == {"flow_out"}
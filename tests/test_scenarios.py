@@ -0,0 +1,59 @@
+import os
+
+import pytest
+import yaml
+
+from oemof_b3.tools.scenarios import ScenarioRegistry
+
+scenario_specs = {
+    "name": "base",
+    "label": "Base",
+    "model_structure": "model_structure_full",
+    "paths_scalars": ["raw/scalars/capacities.csv", "raw/scalars/demands.csv"],
+    "paths_timeseries": "results/_resources/ts_feedin.csv",
+    "filter_scalars": {1: {"scenario_key": ["ALL"]}},
+}
+
+
+def write_specs(directory, name, specs):
+    path = os.path.join(directory, f"{name}.yml")
+    with open(path, "w") as file:
+        yaml.dump(specs, file)
+    return path
+
+
+def test_scenario_registry(tmp_path):
+    directory = str(tmp_path)
+    path = write_specs(directory, "base", scenario_specs)
+
+    registry = ScenarioRegistry(directory)
+
+    assert registry.names() == ["base"]
+    assert "base" in registry
+    assert registry["base"] is registry.load(path)
+
+    assert registry.get_label("base") == "Base"
+    assert registry.get_label("other") == "other"
+    assert registry.get_input_paths("base") == [
+        "raw/scalars/capacities.csv",
+        "raw/scalars/demands.csv",
+        "results/_resources/ts_feedin.csv",
+    ]
+    assert registry.get_filters("base") == {
+        "filter_scalars": {1: {"scenario_key": ["ALL"]}},
+        "filter_timeseries": None,
+    }
+
+    with pytest.raises(KeyError):
+        registry["other"]
+
+    # changed files are read again
+    write_specs(directory, "base", dict(scenario_specs, label="Changed"))
+    os.utime(path, ns=(0, 10**9))
+    assert registry.get_label("base") == "Changed"
+
+    # invalid specifications are rejected
+    write_specs(directory, "invalid", {"name": "invalid"})
+    assert registry.names() == ["base", "invalid"]
+    with pytest.raises(ValueError):
+        registry["invalid"]
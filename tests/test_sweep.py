@@ -0,0 +1,131 @@
+import os
+
+import pandas as pd
+import pytest
+import yaml
+
+from oemof_b3.tools.sweep import (
+    apply_scalar_overrides,
+    count_variants,
+    iter_variants,
+    load_sweep,
+    load_sweep_scalars,
+    save_index,
+)
+
+base_specs = {
+    "name": "base",
+    "label": "Base",
+    "paths_scalars": ["scalars.csv"],
+    "filter_scalars": {1: {"scenario_key": ["ALL"]}},
+}
+
+sweep_definition = {
+    "base_scenario": "scenarios/base.yml",
+    "axes": {
+        "ch4_cost": {
+            "select": {"carrier": "ch4", "var_name": "carrier_cost"},
+            "operation": "multiply",
+            "values": [0.5, 2.0],
+        },
+        "reduction": {
+            "select": {"var_name": "emission_reduction_factor"},
+            "values": [0.9, 0.95, 1.0],
+        },
+    },
+}
+
+scalars = pd.DataFrame(
+    {
+        "scenario_key": ["ALL", "ALL", "ALL"],
+        "name": ["B-ch4-import", "B-biomass-import", None],
+        "var_name": ["carrier_cost", "carrier_cost", "emission_reduction_factor"],
+        "carrier": ["ch4", "biomass", None],
+        "var_value": [20.0, 30.0, 0.8],
+    }
+)
+
+
+@pytest.fixture
+def sweep_path(tmp_path):
+    path = os.path.join(tmp_path, "test_sweep.yml")
+    with open(path, "w") as file:
+        yaml.dump(sweep_definition, file)
+    return path
+
+
+def test_iter_variants(sweep_path):
+    sweep = load_sweep(sweep_path)
+
+    assert sweep["name"] == "test_sweep"
+    assert count_variants(sweep) == 6
+
+    variants = list(iter_variants(sweep, base_specs))
+
+    assert len(variants) == 6
+
+    name, values, specs = variants[1]
+    assert name == "test_sweep--0001"
+    assert values == {"ch4_cost": 0.5, "reduction": 0.95}
+    assert specs["name"] == name
+    assert specs["paths_scalars"] == base_specs["paths_scalars"]
+    assert "scalar_overrides" not in base_specs
+
+    sweep["combination"] = "zip"
+    sweep["axes"]["reduction"]["values"] = [0.9, 0.95]
+    assert count_variants(sweep) == 2
+    assert [v for _, v, _ in iter_variants(sweep, base_specs)] == [
+        {"ch4_cost": 0.5, "reduction": 0.9},
+        {"ch4_cost": 2.0, "reduction": 0.95},
+    ]
+
+
+def test_apply_scalar_overrides(sweep_path):
+    sweep = load_sweep(sweep_path)
+
+    _, _, specs = next(iter_variants(sweep, base_specs))
+
+    overridden = apply_scalar_overrides(scalars, specs["scalar_overrides"])
+
+    assert list(overridden["var_value"]) == [10.0, 30.0, 0.9]
+    assert list(scalars["var_value"]) == [20.0, 30.0, 0.8]
+
+    with pytest.raises(ValueError):
+        apply_scalar_overrides(
+            scalars, [{"select": {"carrier": "h2"}, "operation": "set", "value": 1}]
+        )
+
+
+def test_load_sweep_scalars(tmp_path):
+    index_path = os.path.join(tmp_path, "_sweeps", "test_sweep", "index.csv")
+
+    variants = ["test_sweep--0000", "test_sweep--0001"]
+    save_index(
+        [
+            {"variant": variant, "ch4_cost": value}
+            for variant, value in zip(variants, [0.5, 2.0])
+        ],
+        index_path,
+    )
+
+    for variant in variants:
+        postprocessed = os.path.join(tmp_path, variant, "postprocessed")
+        os.makedirs(postprocessed)
+        pd.DataFrame(
+            {
+                "scenario": [variant],
+                "name": ["B-ch4-gt"],
+                "var_name": ["capacity"],
+                "carrier": ["ch4"],
+                "region": ["B"],
+                "tech": ["gt"],
+                "type": ["conversion"],
+                "var_value": [10.0],
+                "var_unit": ["MW"],
+            }
+        ).to_csv(os.path.join(postprocessed, "scalars.csv"), sep=";", index=False)
+
+    results = load_sweep_scalars(index_path, results_dir=str(tmp_path))
+
+    assert list(results["scenario_key"]) == variants
+    assert list(results["ch4_cost"]) == [0.5, 2.0]
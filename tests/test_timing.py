@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+
+from oemof_b3.tools.timing import (
+    Profiler,
+    Timer,
+    load_profiles,
+    summarize_profiles,
+)
+
+
+def test_timer_logs_elapsed_time():
+    messages = []
+
+    with Timer(text="Did something.", logger=messages.append):
+        pass
+
+    assert len(messages) == 1
+    assert messages[0].startswith("Did something. Elapsed time:")
+
+
+def test_profiler_records_nested_spans(tmp_path):
+    df = pd.DataFrame({"a": range(5), "b": range(5)})
+
+    with Profiler("script", str(tmp_path)) as profiler:
+        with profiler.span("load") as span:
+            span.add_shape(df)
+        with profiler.span("process"):
+            with profiler.span("step"):
+                pass
+
+    spans = profiler.to_frame()
+
+    assert list(spans["span"]) == [
+        "script",
+        "script/load",
+        "script/process",
+        "script/process/step",
+    ]
+    assert list(spans["depth"]) == [0, 1, 1, 2]
+    assert spans.loc[1, "rows"] == 5
+    assert spans.loc[1, "columns"] == 2
+    assert (spans["wall_time"] >= 0).all()
+    assert spans.loc[0, "wall_time"] >= spans.loc[2, "wall_time"]
+
+    for extension in [".csv", ".json"]:
+        assert os.path.exists(os.path.join(tmp_path, "profiling", "script" + extension))
+
+
+def test_summarize_profiles(tmp_path):
+    for scenario in ["base", "high"]:
+        with Profiler("script", os.path.join(tmp_path, scenario)) as profiler:
+            with profiler.span("load"):
+                pass
+
+    profiles = load_profiles(str(tmp_path))
+
+    assert set(profiles["scenario"]) == {"base", "high"}
+    assert len(profiles) == 4
+
+    summary = summarize_profiles(profiles)
+
+    assert summary.loc[("script", "script/load"), "scenarios"] == 2